@@ -1,6 +1,10 @@
+from pynetbox.core.aio import AsyncApi
 from pynetbox.core.api import Api
+from pynetbox.core.batch import batch_details
 from pynetbox.core.extension import Extension
+from pynetbox.core.identity import identity_map
 from pynetbox.core.query import (
+    AdaptivePageSize,
     AllocationError,
     ContentError,
     RequestError,
@@ -14,7 +18,9 @@ __version__ = "7.8.0"
 api = Api
 
 __all__ = (
+    "AdaptivePageSize",
     "Api",
+    "AsyncApi",
     "AllocationError",
     "ContentError",
     "Extension",
@@ -22,5 +28,7 @@ __all__ = (
     "RequestError",
     "ParameterValidationError",
     "api",
+    "batch_details",
+    "identity_map",
     "__version__",
 )
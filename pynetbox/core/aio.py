@@ -0,0 +1,883 @@
+"""
+(c) 2017 DigitalOcean
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+asyncio mirror of the pynetbox client.
+
+`AsyncApi`, `AsyncApp`, `AsyncEndpoint`, `AsyncDetailEndpoint` and
+`AsyncRecordSet` follow the shape of their blocking counterparts, but every
+network call is awaitable and list results are consumed with ``async for``.
+Requests are sent with `httpx.AsyncClient`, which is an optional dependency
+(``pip install pynetbox[async]``). Results are the same `Record` models the
+blocking client returns.
+"""
+
+import asyncio
+import collections
+import contextlib
+import inspect
+import itertools
+import json
+
+from packaging import version
+from packaging.version import InvalidVersion
+
+from pynetbox.core.api import Api
+from pynetbox.core.app import App, PluginsApp, Registry, _app
+from pynetbox.core.endpoint import Endpoint
+from pynetbox.core.query import (
+    AllocationError,
+    ContentError,
+    Request,
+    RequestError,
+    TOKEN_PREFIX,
+    _extract_files,
+    calc_pages,
+)
+from pynetbox.core.response import Record
+
+
+class _ResponseView:
+    """Expose an `httpx.Response` through the `requests.Response` attributes
+    read by pynetbox's exceptions (``ok``, ``reason``, ``request.body``...).
+
+    Only used when raising, so ``RequestError.req`` and friends keep working
+    the same way for both clients.
+    """
+
+    class _RequestView:
+        def __init__(self, request):
+            try:
+                self.body = request.content
+            except Exception:
+                # Streaming request bodies cannot be read back.
+                self.body = None
+
+    def __init__(self, resp):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.ok = resp.status_code < 400
+        self.reason = resp.reason_phrase
+        self.url = str(resp.url)
+        self.headers = resp.headers
+        self.request = self._RequestView(resp.request)
+
+    @property
+    def text(self):
+        return self._resp.text
+
+    @property
+    def content(self):
+        return self._resp.content
+
+    def json(self):
+        return self._resp.json()
+
+
+class AsyncRequest(Request):
+    """Awaitable counterpart of `Request`.
+
+    Accepts the same arguments, except that ``http_session`` is an
+    `httpx.AsyncClient` and the thread pool options are replaced by
+    ``max_concurrency``: the number of list pages kept in flight at once
+    after the first page has told us the total count. With the default of
+    1, pages are fetched sequentially by following ``next`` links.
+    """
+
+    def __init__(self, base, http_session, max_concurrency=1, **kwargs):
+        super().__init__(base, http_session, **kwargs)
+        self.max_concurrency = max_concurrency
+
+    async def get_openapi(self):
+        """Gets the OpenAPI Spec."""
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+
+        current_version = version.parse(await self.get_version())
+        if current_version >= version.parse("3.5"):
+            url = "{}schema/".format(self.normalize_url(self.base))
+        else:
+            url = "{}docs/?format=openapi".format(self.normalize_url(self.base))
+        req = await self.http_session.get(url, headers=headers)
+
+        if req.status_code < 400:
+            return req.json()
+        else:
+            raise RequestError(_ResponseView(req))
+
+    async def get_version(self):
+        """Gets the API version of NetBox.
+
+        ## Returns
+        Version number as a string. Empty string if version is not
+        present in the headers.
+
+        ## Raises
+        RequestError if the request is not successful.
+        """
+        headers = {"Content-Type": "application/json"}
+        self._add_auth_header(headers)
+        req = await self.http_session.get(
+            self.normalize_url(self.base),
+            headers=headers,
+        )
+        if req.status_code < 400 or req.status_code == 403:
+            return req.headers.get("API-Version", "")
+        else:
+            raise RequestError(_ResponseView(req))
+
+    async def get_status(self):
+        """Gets the status from /api/status/ endpoint in NetBox.
+
+        ## Returns
+        Dictionary as returned by NetBox.
+
+        ## Raises
+        RequestError if request is not successful.
+        """
+        headers = {"Content-Type": "application/json"}
+        self._add_auth_header(headers)
+        req = await self.http_session.get(
+            "{}status/".format(self.normalize_url(self.base)),
+            headers=headers,
+        )
+        if req.status_code < 400:
+            return req.json()
+        else:
+            raise RequestError(_ResponseView(req))
+
+    async def _make_call(
+        self, verb="get", url_override=None, add_params=None, data=None
+    ):
+        files = None
+        body_verbs = ("post", "put", "patch")
+
+        if self.expect_json:
+            headers = {"accept": "application/json"}
+        else:
+            headers = {"accept": "*/*"}
+
+        if data is not None and verb in body_verbs:
+            data, files = _extract_files(data)
+
+        should_be_json_body = not files and (
+            verb in body_verbs or (verb == "delete" and data)
+        )
+
+        if should_be_json_body:
+            headers["Content-Type"] = "application/json"
+
+        self._add_auth_header(headers)
+
+        params = {}
+        if not url_override:
+            if self.filters:
+                params.update(self.filters)
+            if add_params:
+                params.update(add_params)
+
+        # httpx.AsyncClient.delete() takes no body, so every verb goes
+        # through request(). An empty params dict is passed as None so the
+        # query string of a server-provided next link is left untouched.
+        if files:
+            req = await self.http_session.request(
+                verb.upper(),
+                url_override or self.url,
+                headers=headers,
+                params=params or None,
+                data=data,
+                files=files,
+            )
+        else:
+            req = await self.http_session.request(
+                verb.upper(),
+                url_override or self.url,
+                headers=headers,
+                params=params or None,
+                json=data,
+            )
+
+        ok = req.status_code < 400
+        if req.status_code == 409 and verb == "post":
+            raise AllocationError(_ResponseView(req))
+        if verb == "delete":
+            if ok:
+                return True
+            else:
+                raise RequestError(_ResponseView(req))
+        elif ok:
+            if self.expect_json:
+                try:
+                    return req.json()
+                except json.JSONDecodeError:
+                    raise ContentError(_ResponseView(req))
+            else:
+                return req.text
+        else:
+            raise RequestError(_ResponseView(req))
+
+    async def _resolve_pagination(self):
+        """Resolve ``pagination``, awaiting it if the callable is async."""
+        pagination = self.pagination
+        if callable(pagination):
+            pagination = pagination()
+        if inspect.isawaitable(pagination):
+            pagination = await pagination
+        return pagination
+
+    async def _iter_pages(self, page_size, page_offsets):
+        """Fetch offset pages with at most ``max_concurrency`` in flight.
+
+        Pages are yielded in offset order as soon as the next one in line
+        has arrived; a new fetch is scheduled each time one is handed out,
+        so only the window of outstanding pages is ever held in memory.
+        """
+        offsets = iter(page_offsets)
+        pending = collections.deque()
+
+        def schedule(count):
+            for offset in itertools.islice(offsets, count):
+                pending.append(
+                    asyncio.ensure_future(
+                        self._make_call(
+                            add_params={"offset": offset, "limit": page_size}
+                        )
+                    )
+                )
+
+        schedule(self.max_concurrency)
+        try:
+            while pending:
+                page = await pending.popleft()
+                schedule(1)
+                yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get(self, add_params=None):
+        """Makes a GET request.
+
+        Async generator counterpart of `Request.get`: yields each result of
+        a list view (following pagination), or the single object returned
+        by a detail view.
+
+        ## Raises
+        * RequestError if the request is not successful.
+        * ContentError if response is not json.
+        """
+        use_cursor = (
+            await self._resolve_pagination() == "cursor"
+            and self.offset is None
+            and add_params is None
+        )
+
+        if not add_params and self.limit is not None:
+            add_params = {"limit": self.limit}
+            if use_cursor:
+                add_params["start"] = 0
+            elif self.limit and self.offset is not None:
+                add_params["offset"] = self.offset
+        req = await self._make_call(add_params=add_params)
+        if isinstance(req, dict) and req.get("results") is not None:
+            self.count = req["count"]
+            for i in req["results"]:
+                yield i
+            if use_cursor:
+                while req.get("next"):
+                    req = await self._make_call(url_override=req["next"])
+                    for i in req["results"]:
+                        yield i
+            elif self.offset is not None:
+                return
+            elif self.max_concurrency > 1 and req.get("next"):
+                page_size = len(req["results"])
+                pages = calc_pages(page_size, req["count"])
+                page_offsets = [increment * page_size for increment in range(1, pages)]
+                async for page in self._iter_pages(page_size, page_offsets):
+                    for i in page["results"]:
+                        yield i
+            else:
+                first_run = True
+                while req["next"]:
+                    if first_run:
+                        req = await self._make_call(
+                            add_params={
+                                "limit": self.limit or req["count"],
+                                "offset": len(req["results"]),
+                            }
+                        )
+                    else:
+                        req = await self._make_call(url_override=req["next"])
+                    first_run = False
+                    for i in req["results"]:
+                        yield i
+        elif isinstance(req, list):
+            self.count = len(req)
+            for i in req:
+                yield i
+        else:
+            self.count = len(req)
+            yield req
+
+    async def put(self, data):
+        """Makes PUT request. See `Request.put`."""
+        return await self._make_call(verb="put", data=data)
+
+    async def post(self, data):
+        """Makes POST request. See `Request.post`."""
+        return await self._make_call(verb="post", data=data)
+
+    async def delete(self, data=None):
+        """Makes DELETE request. See `Request.delete`."""
+        return await self._make_call(verb="delete", data=data)
+
+    async def patch(self, data):
+        """Makes PATCH request. See `Request.patch`."""
+        return await self._make_call(verb="patch", data=data)
+
+    async def options(self):
+        """Makes an OPTIONS request. See `Request.options`."""
+        return await self._make_call(verb="options")
+
+    async def get_count(self, *args, **kwargs):
+        """Returns object count for query. See `Request.get_count`."""
+        if getattr(self, "count", None) is None:
+            self.count = (await self._make_call(add_params={"limit": 1, "brief": 1}))[
+                "count"
+            ]
+        return self.count
+
+
+class AsyncRecordSet:
+    """Async iterator containing Record objects.
+
+    Returned by `AsyncEndpoint.all()` and `AsyncEndpoint.filter()`. Pages
+    are requested as the set is consumed with ``async for``.
+
+    ## Examples
+
+    ```python
+    async for device in nb.dcim.devices.filter(site="site-1"):
+        print(device.name)
+
+    await nb.dcim.devices.all().count()
+    # 123
+    ```
+    """
+
+    def __init__(self, endpoint, request, validate=None, partial=None):
+        self.endpoint = endpoint
+        self.request = request
+        self.response = self.request.get()
+        self._partial = partial
+        # Awaited before the first page is requested; used to run strict
+        # filter validation, which needs the (awaitable) OpenAPI spec.
+        self._validate = validate
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._validate is not None:
+            validate, self._validate = self._validate, None
+            await validate()
+        record = self.endpoint.return_obj(
+            await self.response.__anext__(), self.endpoint.api, self.endpoint
+        )
+        if self._partial is not None:
+            record._partial = self._partial
+        return record
+
+    async def count(self):
+        """Returns the number of objects in the set.
+
+        Uses the count from the first page when iteration has started,
+        otherwise makes a single ``limit=1`` count request.
+        """
+        return await self.request.get_count()
+
+    async def update(self, **kwargs):
+        """Updates kwargs onto all Records in the set and saves these.
+
+        ## Returns
+        The updated Records, or None if no update was required.
+        """
+        updates = []
+        async for record in self:
+            for k, v in kwargs.items():
+                setattr(record, k, v)
+            record_updates = record.updates()
+            if record_updates:
+                record_updates["id"] = record.id
+                updates.append(record_updates)
+        if updates:
+            return await self.endpoint.update(updates)
+        return None
+
+    async def delete(self):
+        """Bulk deletes objects in the set.
+
+        ## Returns
+        True if bulk DELETE operation was successful.
+        """
+        return await self.endpoint.delete(self)
+
+
+class AsyncEndpoint(Endpoint):
+    """Awaitable counterpart of `Endpoint`.
+
+    `all()` and `filter()` return an `AsyncRecordSet` without making a
+    request; every other method is a coroutine.
+
+    ## Examples
+
+    ```python
+    device = await nb.dcim.devices.get(name="test1-leaf1")
+    devices = [d async for d in nb.dcim.devices.filter(role="leaf-switch")]
+    await nb.dcim.devices.count(site="site-1")
+    ```
+    """
+
+    def _request(self, **kwargs):
+        return AsyncRequest(
+            token=self.token,
+            http_session=self.api.http_client,
+            **kwargs,
+        )
+
+    async def _validate_openapi_parameters(self, method, parameters):
+        if method.lower() != "get":
+            raise RuntimeError(f"Unsupported method '{method}'.")
+        self._check_openapi_parameters(await self.api.openapi(), method, parameters)
+
+    def all(self, limit=0, offset=None, fields=None, omit=None):
+        """Queries the 'ListView' of a given endpoint. See `Endpoint.all`.
+
+        ## Returns
+        An AsyncRecordSet object.
+        """
+        if limit == 0 and offset is not None:
+            raise ValueError("offset requires a positive limit value")
+        filters = self._projection(fields, omit)
+        req = self._request(
+            filters=filters,
+            base="{}/".format(self.url),
+            max_concurrency=self.api.max_concurrency,
+            limit=limit,
+            offset=offset,
+            pagination=self.api._effective_pagination,
+        )
+        return AsyncRecordSet(self, req, partial=self._partial_policy(filters))
+
+    async def get(self, *args, **kwargs):
+        """Queries the DetailsView of a given endpoint. See `Endpoint.get`.
+
+        ## Returns
+        A single Record object or None
+        """
+        try:
+            key = args[0]
+        except IndexError:
+            key = None
+
+        if not key:
+            resp = self.filter(**kwargs)
+            ret = await anext(resp, None)
+            if not ret:
+                return ret
+            if await anext(resp, None) is not None:
+                raise ValueError(
+                    "get() returned more than one result. "
+                    "Check that the kwarg(s) passed are valid for this "
+                    "endpoint or use filter() or all() instead."
+                )
+            return ret
+
+        filters = self._projection(kwargs.get("fields"), kwargs.get("omit"))
+        req = self._request(key=key, filters=filters, base=self.url)
+        try:
+            return await anext(
+                AsyncRecordSet(self, req, partial=self._partial_policy(filters)),
+                None,
+            )
+        except RequestError as e:
+            if e.req.status_code == 404:
+                return None
+            else:
+                raise e
+
+    def filter(self, *args, **kwargs):
+        """Queries the 'ListView' of a given endpoint. See `Endpoint.filter`.
+
+        When strict filter validation is enabled it runs before the first
+        page is requested, since fetching the OpenAPI spec is awaitable.
+
+        ## Returns
+        An AsyncRecordSet object.
+        """
+        filters, limit, offset, strict_filters = self._parse_filter_args(args, kwargs)
+
+        req = self._request(
+            filters=filters,
+            base=self.url,
+            max_concurrency=self.api.max_concurrency,
+            limit=limit,
+            offset=offset,
+            pagination=self.api._effective_pagination,
+        )
+
+        validate = None
+        if strict_filters:
+
+            async def validate():
+                await self._validate_openapi_parameters("get", filters)
+
+        return AsyncRecordSet(
+            self, req, validate=validate, partial=self._partial_policy(filters)
+        )
+
+    async def create(self, *args, **kwargs):
+        """Creates an object on an endpoint. See `Endpoint.create`."""
+        req = await self._request(base=self.url).post(args[0] if args else kwargs)
+
+        if isinstance(req, list):
+            return [self.return_obj(i, self.api, self) for i in req]
+        return self.return_obj(req, self.api, self)
+
+    async def update(self, objects):
+        """Updates objects in NetBox. See `Endpoint.update`."""
+        series = self._build_update_series(objects)
+        req = await self._request(base=self.url).patch(series)
+
+        if isinstance(req, list):
+            return [self.return_obj(i, self.api, self) for i in req]
+        return self.return_obj(req, self.api, self)
+
+    async def delete(self, objects):
+        """Deletes objects from NetBox. See `Endpoint.delete`.
+
+        ``objects`` may also be an `AsyncRecordSet`, which is consumed.
+        """
+        if isinstance(objects, AsyncRecordSet):
+            objects = [record async for record in objects]
+        if not isinstance(objects, list):
+            raise ValueError(
+                "objects must be list[str|int|Record]"
+                "|AsyncRecordSet - was " + str(type(objects))
+            )
+        cleaned_ids = self._build_delete_ids(objects)
+        req = self._request(base=self.url)
+        return bool(await req.delete(data=[{"id": i} for i in cleaned_ids]))
+
+    async def choices(self):
+        """Returns all choices from the endpoint. See `Endpoint.choices`."""
+        if self._choices:
+            return self._choices
+
+        req = await self._request(base=self.url).options()
+        self._choices = self._parse_choices(req)
+        return self._choices
+
+    async def count(self, *args, **kwargs):
+        """Returns the count of objects in a query. See `Endpoint.count`."""
+        if args:
+            kwargs.update({"q": args[0]})
+
+        return await self._request(filters=kwargs, base=self.url).get_count()
+
+
+class AsyncDetailEndpoint:
+    """Awaitable counterpart of `DetailEndpoint`.
+
+    Model properties such as `Prefixes.available_ips` return the blocking
+    `DetailEndpoint`; with the asyncio client build the detail endpoint
+    explicitly instead.
+
+    ## Examples
+
+    ```python
+    prefix = await nb.ipam.prefixes.get(123)
+    available = AsyncDetailEndpoint(prefix, "available-ips", IpAddresses)
+    ip = await available.create()
+    ```
+    """
+
+    def __init__(self, parent_obj, name, custom_return=None):
+        self.parent_obj = parent_obj
+        self.custom_return = custom_return
+        self.url = "{}/{}/{}/".format(parent_obj.endpoint.url, parent_obj.id, name)
+        self.request_kwargs = dict(
+            base=self.url,
+            token=parent_obj.api.token,
+            http_session=parent_obj.api.http_client,
+        )
+
+    def _wrap(self, item):
+        return self.custom_return(
+            item, self.parent_obj.endpoint.api, self.parent_obj.endpoint
+        )
+
+    async def list(self, **kwargs):
+        """The view operation for a detail endpoint. See `DetailEndpoint.list`."""
+        req = [
+            i async for i in AsyncRequest(**self.request_kwargs).get(add_params=kwargs)
+        ]
+
+        if self.custom_return:
+            return [self._wrap(i) for i in req]
+        return req
+
+    async def create(self, data=None, **kwargs):
+        """The write operation for a detail endpoint. See `DetailEndpoint.create`."""
+        if data is not None and kwargs:
+            raise ValueError("Cannot pass both data and keyword arguments")
+        payload = data if data is not None else kwargs
+        req = await AsyncRequest(**self.request_kwargs).post(payload)
+        if self.custom_return:
+            if isinstance(req, list):
+                return [self._wrap(i) for i in req]
+            return self._wrap(req)
+        return req
+
+
+class AsyncApp(App):
+    """Awaitable counterpart of `App`; attributes return `AsyncEndpoint`s."""
+
+    def _new_endpoint(self, name, literal_name=False):
+        return AsyncEndpoint(
+            self.api, self, name, model=self.model, literal_name=literal_name
+        )
+
+    async def config(self):
+        """Returns config response from app. See `App.config`."""
+        return await anext(
+            AsyncRequest(
+                base="{}/{}/config/".format(self.api.base_url, self.name),
+                token=self.api.token,
+                http_session=self.api.http_client,
+            ).get()
+        )
+
+
+class AsyncPluginsApp(PluginsApp):
+    """Awaitable counterpart of `PluginsApp`."""
+
+    def __getattr__(self, name):
+        return _app(self.api, "plugins/{}".format(name.replace("_", "-")), AsyncApp)
+
+    async def installed_plugins(self):
+        """Returns raw response with installed plugins."""
+        return [
+            i
+            async for i in AsyncRequest(
+                base="{}/plugins/installed-plugins".format(self.api.base_url),
+                token=self.api.token,
+                http_session=self.api.http_client,
+            ).get()
+        ]
+
+
+class AsyncApi:
+    """asyncio entry point of pynetbox.
+
+    Mirrors `Api`: apps are attributes, endpoints are attributes of apps,
+    and the returned objects are the usual `Record` models. All requests are
+    sent through a shared `httpx.AsyncClient`, so a single event loop can
+    keep many NetBox calls in flight at once without a thread per request.
+
+    Records returned by this client do not lazily fetch missing fields
+    (`Record.full_details()`) and cannot `save()` or `delete()`
+    themselves, since those are blocking calls. Use `AsyncEndpoint.get()`,
+    `AsyncEndpoint.update()` and `AsyncEndpoint.delete()` instead.
+
+    ## Parameters
+
+    * **url** (str): The base URL to the instance of NetBox you wish to connect to.
+    * **token** (str, optional): Your NetBox token.
+    * **strict_filters** (bool, optional): Validate filters against the
+      OpenAPI specification, see `Api`.
+    * **extensions** (list, optional): Plugin extensions, see `Api`.
+    * **pagination** (str, optional): ``"offset"`` (default) or ``"cursor"``,
+      see `Api`.
+    * **max_concurrency** (int, optional): Number of list pages requested
+      concurrently by `all()`/`filter()` once the first page has been
+      received. Defaults to 1 (sequential paging).
+    * **http_client** (httpx.AsyncClient, optional): Client used for all
+      requests. Defaults to a new client without a request timeout, matching
+      the blocking client's `requests.Session`.
+
+    ## Examples
+
+    ```python
+    import asyncio
+    import pynetbox
+
+    async def main():
+        async with pynetbox.AsyncApi(
+            "http://localhost:8000", token="d6f4e314a5b5fefd164995169f28ae32d987704f"
+        ) as nb:
+            async for device in nb.dcim.devices.all():
+                print(device.name)
+
+    asyncio.run(main())
+    ```
+    """
+
+    _register_extensions = Api._register_extensions
+
+    def __init__(
+        self,
+        url,
+        token=None,
+        strict_filters=False,
+        extensions=None,
+        pagination="offset",
+        max_concurrency=1,
+        http_client=None,
+    ):
+        if pagination not in ("offset", "cursor"):
+            raise ValueError(
+                "pagination must be 'offset' or 'cursor', got {!r}".format(pagination)
+            )
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
+        if http_client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError(
+                    "AsyncApi requires httpx; install it with "
+                    "'pip install pynetbox[async]'"
+                ) from None
+            http_client = httpx.AsyncClient(timeout=None)
+
+        self.token = token
+        self.base_url = "{}/api".format(url if url[-1] != "/" else url[:-1])
+        self.http_client = http_client
+        self.strict_filters = strict_filters
+        self.pagination = pagination
+        self.max_concurrency = max_concurrency
+        # Records can't load missing fields from NetBox (see `http_session`).
+        self.partial_records = "raise"
+        self._cursor_supported = None
+
+        self._register_extensions(extensions or [])
+
+        self._registry = Registry(self, AsyncApp)
+        self.circuits = self._registry.app("circuits")
+        self.core = self._registry.app("core")
+        self.dcim = self._registry.app("dcim")
+        self.extras = self._registry.app("extras")
+        self.ipam = self._registry.app("ipam")
+        self.tenancy = self._registry.app("tenancy")
+        self.users = self._registry.app("users")
+        self.virtualization = self._registry.app("virtualization")
+        self.vpn = self._registry.app("vpn")
+        self.wireless = self._registry.app("wireless")
+        self.plugins = AsyncPluginsApp(self)
+
+    @property
+    def http_session(self):
+        # Record.full_details(), save() and delete() build a blocking
+        # Request from api.http_session. Raising AttributeError here turns a
+        # lazy field lookup into a plain missing attribute instead of an
+        # attempt to drive the async client synchronously.
+        raise AttributeError(
+            "Records returned by AsyncApi cannot make blocking requests; use "
+            "the awaitable AsyncEndpoint methods instead."
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying `httpx.AsyncClient`."""
+        await self.http_client.aclose()
+
+    def _request(self, base):
+        return AsyncRequest(base=base, token=self.token, http_session=self.http_client)
+
+    async def version(self):
+        """Gets the API version of NetBox. See `Api.version`."""
+        return await self._request(self.base_url).get_version()
+
+    async def _effective_pagination(self):
+        """Resolve the pagination strategy, see `Api._effective_pagination`."""
+        if self.pagination != "cursor":
+            return "offset"
+        if self._cursor_supported is None:
+            try:
+                self._cursor_supported = version.parse(
+                    await self.version()
+                ) >= version.parse("4.6")
+            except (RequestError, InvalidVersion, OSError):
+                self._cursor_supported = False
+            except Exception as exc:
+                # httpx transport errors (ConnectError, TimeoutException...)
+                # share httpx.TransportError as a base; fall back to offset
+                # and let the list request itself surface them.
+                if type(exc).__module__.split(".")[0] != "httpx":
+                    raise
+                self._cursor_supported = False
+        return "cursor" if self._cursor_supported else "offset"
+
+    async def openapi(self):
+        """Returns the OpenAPI spec, cached after the first call."""
+        if not (openapi := getattr(self, "_openapi", None)):
+            openapi = self._openapi = await AsyncRequest(
+                base=self.base_url,
+                http_session=self.http_client,
+            ).get_openapi()
+        return openapi
+
+    async def status(self):
+        """Gets the status information from NetBox. See `Api.status`."""
+        return await self._request(self.base_url).get_status()
+
+    async def create_token(self, username, password):
+        """Creates an API token and stores it on the client. See `Api.create_token`."""
+        resp = await AsyncRequest(
+            base="{}/users/tokens/provision/".format(self.base_url),
+            http_session=self.http_client,
+        ).post(data={"username": username, "password": password})
+        if resp.get("version") == 2:
+            self.token = "{}{}.{}".format(TOKEN_PREFIX, resp["key"], resp["token"])
+        else:
+            self.token = resp.get("token") or resp["key"]
+        return Record(resp, self, None)
+
+    @contextlib.contextmanager
+    def activate_branch(self, branch):
+        """Activate a NetBox branch for requests made inside the block.
+
+        See `Api.activate_branch`. The header is set on the shared client,
+        so it applies to every task using this `AsyncApi` meanwhile.
+        """
+        if not isinstance(branch, Record) or "schema_id" not in dict(branch):
+            raise ValueError(
+                f"The specified branch is not a valid NetBox branch: {branch}."
+            )
+
+        self.http_client.headers["X-NetBox-Branch"] = branch.schema_id
+
+        try:
+            yield
+        finally:
+            self.http_client.headers.pop("X-NetBox-Branch", None)
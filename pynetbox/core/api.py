@@ -18,12 +18,19 @@ import contextlib
 import warnings
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE
+from urllib3.util import Retry
 from packaging import version
 from packaging.version import InvalidVersion
 
-from pynetbox.core.app import App, PluginsApp
-from pynetbox.core.query import Request, RequestError, TOKEN_PREFIX
+from pynetbox.core.app import PluginsApp, Registry
+from pynetbox.core.cache import MemoryCache
+from pynetbox.core.codec import get_codec
+from pynetbox.core.identity import IdentityMap
+from pynetbox.core.query import AdaptivePageSize, Request, RequestError, TOKEN_PREFIX
+from pynetbox.core.ratelimit import RateLimiter
 from pynetbox.core.response import Record
+from pynetbox.core.transport import PynetboxAdapter, RetryPolicy, SingleFlight
 from pynetbox.models.mapper import CONTENT_TYPE_MAPPER
 
 
@@ -95,6 +102,22 @@ class Api:
         pagination="offset",
         thread_pool_executor=None,
         max_workers=4,
+        read_ahead=0,
+        cursor_shards=0,
+        cursor_shards_ordered=False,
+        adaptive_page_size=False,
+        json_codec=None,
+        streaming=False,
+        pool_maxsize=None,
+        pool_block=False,
+        tcp_keepalive=False,
+        retries=0,
+        rate_limit=None,
+        http_cache=None,
+        single_flight=False,
+        partial_records="raise",
+        lazy_records=False,
+        identity_map=False,
     ):
         """Initialize the API client.
 
@@ -107,6 +130,22 @@ class Api:
             pagination (str, optional): Pagination strategy for `.all()` and `.filter()`, either `"offset"` (default) or `"cursor"`. Cursor pagination (NetBox 4.6+) offers better performance on very large result sets but omits the total count and cannot be combined with threading or `ordering`. On NetBox versions older than 4.6 it transparently falls back to offset pagination.
             thread_pool_executor (callable, optional): A `concurrent.futures.ThreadPoolExecutor` class, or any callable matching its `(max_workers=...)` signature and context-manager protocol, used to build the pool for threaded requests. Defaults to `concurrent.futures.ThreadPoolExecutor`.
             max_workers (int, optional): Maximum number of worker threads used for threaded requests, defaults to 4.
+            read_ahead (int, optional): Number of pages `.all()` and `.filter()` request in the background while the current page is being iterated, when threading is disabled. Results are still returned in order and at most this many pages are buffered. Defaults to 0 (no read-ahead); can be overridden per query.
+            cursor_shards (int, optional): With cursor pagination, split each `.all()`/`.filter()` into this many `id` ranges whose cursor chains are walked concurrently. Values below 2 (the default is 0) page sequentially. Queries that already filter on `id` are not sharded.
+            cursor_shards_ordered (bool, optional): Return sharded cursor results in `id` order rather than as pages arrive. Ordered output limits how far later shards can run ahead. Defaults to False.
+            adaptive_page_size (bool or AdaptivePageSize, optional): Let pynetbox size the pages of sequential `.all()`/`.filter()` requests that do not pass an explicit `limit`, based on the latency and payload size of earlier pages of the same endpoint. Pass True for the defaults or an `AdaptivePageSize` instance to configure its bounds. Defaults to False.
+            json_codec (str or object, optional): JSON library used to encode request bodies and decode responses: `"json"`, `"orjson"`, `"ujson"`, `"msgspec"`, `"auto"` (the fastest one installed) or a codec object, see `pynetbox.core.codec`. Defaults to None, which leaves JSON handling to `requests`.
+            streaming (bool, optional): Decode the pages of sequential `.all()`/`.filter()` requests incrementally while they are being received, yielding each record as soon as it is parsed instead of after the whole page has been loaded. Does not apply to threaded, read-ahead, sharded or adaptively sized queries. Defaults to False.
+            pool_maxsize (int, optional): Number of connections to NetBox kept open for reuse. Defaults to enough for every concurrent worker (`max_workers`, `cursor_shards`, `read_ahead`), and at least 10.
+            pool_block (bool, optional): When all pooled connections are busy, wait for one to be released instead of opening an extra connection that is closed after use. Defaults to False.
+            tcp_keepalive (bool, optional): Enable TCP keep-alive probes on connections to NetBox, so idle pooled connections are not silently dropped by firewalls or load balancers. Defaults to False.
+            retries (int or RetryPolicy, optional): Retry requests that fail to connect or get a 429, 502, 503 or 504 response, waiting with jittered exponential backoff or as long as the `Retry-After` header asks. An integer is the maximum number of retries per request with the default `pynetbox.core.transport.RetryPolicy`; pass a `RetryPolicy` to tune it. Only idempotent verbs are retried on a response. Applied by the default `http_session`; a replacement session needs a `PynetboxAdapter` configured with it. Defaults to 0 (no retries).
+            rate_limit (float or RateLimiter, optional): Limit the rate of requests sent to NetBox, across all threads and endpoints of this client. A number is the maximum requests per second; pass a `pynetbox.core.ratelimit.RateLimiter` for per-endpoint or per-verb budgets. Applied by the default `http_session`; a replacement session needs a `PynetboxAdapter` configured with it. Defaults to None (no limit).
+            http_cache (bool or cache, optional): Cache GET responses that carry an `ETag` or `Last-Modified` header and revalidate them with conditional requests, so unchanged objects are not downloaded again. Pass True for an in-memory cache, or a `pynetbox.core.cache.MemoryCache` or `DiskCache` instance. Only effective if NetBox, or a proxy in front of it, sends these headers. Applied by the default `http_session`; a replacement session needs a `PynetboxAdapter` configured with it. Defaults to None (no cache).
+            single_flight (bool, optional): Merge identical GET requests made concurrently, e.g. by threads loading the same nested object with `full_details()`, into a single request whose response is shared by all callers. Applied by the default `http_session`; a replacement session needs a `PynetboxAdapter` configured with it. Defaults to False.
+            partial_records (str, optional): What happens when a field that was not fetched is accessed on a record requested with `fields` or `omit`: `"raise"` raises AttributeError, `"fetch"` loads the full object from NetBox. Defaults to `"raise"`.
+            lazy_records (bool, optional): Parse the nested objects, lists and JSON fields of records only when they are first accessed, instead of when the record is created. Speeds up iterating over large result sets when only some fields are read. Defaults to False.
+            identity_map (bool or IdentityMap, optional): Share the records of nested objects that appear in several records, e.g. the site of every device of that site, as a single read-only record. Pass True for a new `pynetbox.core.identity.IdentityMap`, or a map to share. See also `pynetbox.identity_map()` and `RecordSet.share_nested()`. Defaults to False.
         """
         if pagination not in ("offset", "cursor"):
             raise ValueError(
@@ -114,11 +153,59 @@ class Api:
             )
         if max_workers <= 0:
             raise ValueError("max_workers must be a positive integer")
+        if read_ahead < 0:
+            raise ValueError("read_ahead must be zero or a positive integer")
+        if cursor_shards < 0:
+            raise ValueError("cursor_shards must be zero or a positive integer")
+        if partial_records not in ("raise", "fetch"):
+            raise ValueError(
+                "partial_records must be 'raise' or 'fetch', got {!r}".format(
+                    partial_records
+                )
+            )
+        if not retries:
+            retries = 0
+        elif isinstance(retries, int):
+            if retries < 0:
+                raise ValueError("retries must be zero or a positive integer")
+            retries = RetryPolicy(total=retries)
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate=rate_limit)
+        if identity_map is True:
+            identity_map = IdentityMap()
+        elif identity_map is False:
+            identity_map = None
+        if http_cache is True:
+            http_cache = MemoryCache()
+        elif http_cache is False:
+            http_cache = None
 
         base_url = "{}/api".format(url if url[-1] != "/" else url[:-1])
         self.token = token
         self.base_url = base_url
-        self.http_session = requests.Session()
+        self._http_session = requests.Session()
+        if pool_maxsize is None:
+            pool_maxsize = max(
+                DEFAULT_POOLSIZE, max_workers, cursor_shards, read_ahead + 1
+            )
+        adapter = PynetboxAdapter(
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_keepalive=tcp_keepalive,
+            max_retries=retries,
+            rate_limiter=rate_limit,
+            cache=http_cache,
+            single_flight=SingleFlight() if single_flight else None,
+        )
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
+        self.rate_limiter = rate_limit
+        self.http_cache = http_cache
+        self.single_flight = adapter.single_flight
+        self._retry_policy = retries or None
+        self.partial_records = partial_records
+        self.lazy_records = lazy_records
+        self.identity_map = identity_map
         self.threading = threading
         # Stored as ``None`` (the sentinel) when the caller did not supply a
         # custom executor, so ``None`` distinguishes "use the default" from an
@@ -127,6 +214,16 @@ class Api:
         # value here is not necessarily the executor actually used.
         self.thread_pool_executor = thread_pool_executor
         self.max_workers = max_workers
+        self.read_ahead = read_ahead
+        self.cursor_shards = cursor_shards
+        self.cursor_shards_ordered = cursor_shards_ordered
+        self.page_size_controller = (
+            AdaptivePageSize()
+            if adaptive_page_size is True
+            else adaptive_page_size or None
+        )
+        self.json_codec = get_codec(json_codec)
+        self.streaming = streaming
         self.strict_filters = strict_filters
         self.pagination = pagination
         self._cursor_supported = None
@@ -134,16 +231,17 @@ class Api:
         self._register_extensions(extensions or [])
 
         # Initialize NetBox apps
-        self.circuits = App(self, "circuits")
-        self.core = App(self, "core")
-        self.dcim = App(self, "dcim")
-        self.extras = App(self, "extras")
-        self.ipam = App(self, "ipam")
-        self.tenancy = App(self, "tenancy")
-        self.users = App(self, "users")
-        self.virtualization = App(self, "virtualization")
-        self.vpn = App(self, "vpn")
-        self.wireless = App(self, "wireless")
+        self._registry = Registry(self)
+        self.circuits = self._registry.app("circuits")
+        self.core = self._registry.app("core")
+        self.dcim = self._registry.app("dcim")
+        self.extras = self._registry.app("extras")
+        self.ipam = self._registry.app("ipam")
+        self.tenancy = self._registry.app("tenancy")
+        self.users = self._registry.app("users")
+        self.virtualization = self._registry.app("virtualization")
+        self.vpn = self._registry.app("vpn")
+        self.wireless = self._registry.app("wireless")
         self.plugins = PluginsApp(self)
 
     def _register_extensions(self, extensions):
@@ -197,6 +295,99 @@ class Api:
             v: k for k, v in content_types.items() if v is not None
         }
 
+    @property
+    def http_session(self):
+        """The ``requests.Session`` requests to NetBox are sent with.
+
+        ``rate_limit``, ``retries``, ``http_cache`` and ``single_flight`` are
+        applied by the `pynetbox.core.transport.PynetboxAdapter` mounted on
+        the default session. Assigning a session whose adapter for
+        ``base_url`` doesn't apply them warns that they are lost; mount an
+        adapter configured with them on the new session to keep them.
+        """
+        return self._http_session
+
+    @http_session.setter
+    def http_session(self, session):
+        self._http_session = session
+        lost = self._lost_transport_options(session)
+        if lost:
+            warnings.warn(
+                "The new http_session doesn't apply {}; mount a "
+                "pynetbox.core.transport.PynetboxAdapter configured with "
+                "them on it to keep them.".format(", ".join(lost)),
+                stacklevel=2,
+            )
+
+    def _lost_transport_options(self, session):
+        """Return the transport options ``session`` doesn't apply."""
+        try:
+            adapter = session.get_adapter(self.base_url)
+        except requests.exceptions.InvalidSchema:
+            adapter = None
+        lost = []
+        policy = getattr(adapter, "max_retries", None)
+        if self._retry_policy is not None and not (
+            isinstance(policy, Retry) and policy.total != 0
+        ):
+            lost.append("retries")
+        for name, configured, attr in (
+            ("rate_limit", self.rate_limiter, "rate_limiter"),
+            ("http_cache", self.http_cache, "cache"),
+            ("single_flight", self.single_flight, "single_flight"),
+        ):
+            if configured is not None and getattr(adapter, attr, None) is None:
+                lost.append(name)
+        return lost
+
+    @property
+    def pool_stats(self):
+        """Connection pool statistics for this client.
+
+        Counts connections created, reused and discarded by the connection
+        pool to NetBox; see `pynetbox.core.transport.PoolStats`. A high
+        ``reused`` to ``created`` ratio confirms connections are kept alive
+        across requests.
+
+        ## Returns
+        A `PoolStats` object, or None if `http_session` was replaced by a
+        session that doesn't use pynetbox's transport adapter.
+
+        ## Example
+
+        ```python
+        nb.pool_stats.as_dict()
+        # {'created': 4, 'reused': 1210, 'discarded': 0}
+        ```
+        """
+        adapter = self.http_session.get_adapter(self.base_url)
+        return getattr(adapter, "stats", None)
+
+    @property
+    def retry_stats(self):
+        """Retry statistics for this client.
+
+        Counts the requests retried, per status code and for connection
+        errors, and those that failed after exhausting their retries; see
+        `pynetbox.core.transport.RetryStats`.
+
+        ## Returns
+        A `RetryStats` object, or None if retries are disabled or
+        `http_session` was replaced by a session that doesn't use
+        pynetbox's transport adapter.
+
+        ## Example
+
+        ```python
+        nb = pynetbox.api(url, token=token, retries=5)
+        nb.retry_stats.as_dict()
+        # {'retries': 3, 'by_status': {503: 2, 429: 1}, 'connect_errors': 0,
+        #  'read_errors': 0, 'exhausted': 0}
+        ```
+        """
+        adapter = self.http_session.get_adapter(self.base_url)
+        return getattr(getattr(adapter, "max_retries", None), "stats", None)
+
     @property
     def version(self):
         """Gets the API version of NetBox.
@@ -223,6 +414,7 @@ class Api:
             base=self.base_url,
             token=self.token,
             http_session=self.http_session,
+            json_codec=self.json_codec,
         ).get_version()
         return version
 
@@ -250,9 +442,10 @@ class Api:
                 # docstring promises, and let the real list request surface any
                 # underlying connectivity error.
                 self._cursor_supported = False
-            if self._cursor_supported and self.threading:
+            if self._cursor_supported and self.threading and self.cursor_shards < 2:
                 # Cursor pagination follows next links sequentially and cannot
-                # be parallelised; the cursor path ignores self.threading.
+                # be parallelised; the cursor path ignores self.threading
+                # (cursor_shards is the parallel alternative).
                 # Warn so the no-op threading configuration is not a silent
                 # performance surprise.
                 # stacklevel=5 attributes the warning to the caller's list
@@ -263,7 +456,8 @@ class Api:
                 #   -> Request.get -> RecordSet.__next__/__len__ -> caller.
                 warnings.warn(
                     "threading=True has no effect with cursor pagination; "
-                    "cursor pages are fetched sequentially.",
+                    "cursor pages are fetched sequentially. Use cursor_shards "
+                    "to walk id ranges concurrently.",
                     stacklevel=5,
                 )
         return "cursor" if self._cursor_supported else "offset"
@@ -293,6 +487,7 @@ class Api:
             openapi = self._openapi = Request(
                 base=self.base_url,
                 http_session=self.http_session,
+                json_codec=self.json_codec,
             ).get_openapi()
 
         return openapi
@@ -337,6 +532,7 @@ class Api:
             base=self.base_url,
             token=self.token,
             http_session=self.http_session,
+            json_codec=self.json_codec,
         ).get_status()
         return status
 
@@ -382,6 +578,7 @@ class Api:
         resp = Request(
             base="{}/users/tokens/provision/".format(self.base_url),
             http_session=self.http_session,
+            json_codec=self.json_codec,
         ).post(data={"username": username, "password": password})
         # v2 tokens (NetBox 4.5+): construct auth value as nbt_<key>.<token>
         if resp.get("version") == 2:
@@ -14,6 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from urllib.parse import urlsplit
+
+from pynetbox.core.codec import api_codec
 from pynetbox.core.endpoint import Endpoint
 from pynetbox.core.query import Request
 from pynetbox.models import (
@@ -80,7 +83,18 @@ class App:
         self._setmodel()
 
     def __getattr__(self, name):
-        return Endpoint(self.api, self, name, model=self.model)
+        return self._endpoint(name)
+
+    def _endpoint(self, name, literal_name=False):
+        registry = _registry(self.api)
+        if registry is None:
+            return self._new_endpoint(name, literal_name)
+        return registry.endpoint(self, name, literal_name)
+
+    def _new_endpoint(self, name, literal_name=False):
+        return Endpoint(
+            self.api, self, name, model=self.model, literal_name=literal_name
+        )
 
     def endpoint(self, name):
         """Return an Endpoint using ``name`` as the literal URL slug.
@@ -103,7 +117,7 @@ class App:
         nb.plugins.custom_objects.endpoint("my_custom_object").all()
         ```
         """
-        return Endpoint(self.api, self, name, model=self.model, literal_name=True)
+        return self._endpoint(name, literal_name=True)
 
     def config(self):
         """Returns config response from app.
@@ -142,6 +156,7 @@ class App:
             ),
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).get()
         return config
 
@@ -164,7 +179,7 @@ class PluginsApp:
         self.__dict__.update(d)
 
     def __getattr__(self, name):
-        return App(self.api, "plugins/{}".format(name.replace("_", "-")))
+        return _app(self.api, "plugins/{}".format(name.replace("_", "-")), App)
 
     def installed_plugins(self):
         """Returns raw response with installed plugins.
@@ -193,5 +208,122 @@ class PluginsApp:
             ),
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).get()
         return installed_plugins
+
+
+class Registry:
+    """Interned `App` and `Endpoint` objects of an `Api`.
+
+    Endpoints are looked up on every ``nb.dcim.devices`` access and for every
+    nested object of a record (through its ``url``). The registry builds each
+    `App` and `Endpoint` once, so that those lookups don't allocate new
+    objects, and endpoint state such as the choices cache is kept. URLs of
+    nested objects are resolved once per endpoint.
+
+    Endpoints copy the API token when they are built, so they are rebuilt
+    after ``Api.token`` or ``Api.base_url`` change.
+
+    ## Parameters
+
+    * **api** (Api): The API the objects belong to.
+    * **app_class** (type, optional): Class of the apps built. Defaults to
+        `App`.
+    """
+
+    def __init__(self, api, app_class=App):
+        self.api = api
+        self.app_class = app_class
+        self._apps = {}
+        self._endpoints = {}
+        self._urls = {}
+        self._state = None
+        self._base_path = None
+
+    def __getstate__(self):
+        return {"api": self.api, "app_class": self.app_class}
+
+    def __setstate__(self, d):
+        self.__init__(**d)
+
+    def _check(self):
+        state = (self.api.token, self.api.base_url)
+        if state != self._state:
+            self._endpoints.clear()
+            self._urls.clear()
+            self._state = state
+            self._base_path = urlsplit(self.api.base_url).path
+
+    def app(self, name):
+        """Return the app ``name`` (e.g. ``"dcim"`` or ``"plugins/foo"``)."""
+        app = self._apps.get(name)
+        if app is None:
+            app = self._apps.setdefault(name, self.app_class(self.api, name))
+        return app
+
+    def endpoint(self, app, name, literal_name=False):
+        """Return the endpoint ``name`` of ``app``."""
+        self._check()
+        key = (app.name, name, literal_name)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints.setdefault(
+                key, app._new_endpoint(name, literal_name)
+            )
+        return endpoint
+
+    def endpoint_from_url(self, url):
+        """Return the endpoint of an object URL returned by NetBox."""
+        self._check()
+        # Object URLs end with the object ID, which doesn't select the
+        # endpoint, so it's left out of the key.
+        head, _, tail = url.rstrip("/").rpartition("/")
+        key = head if tail.isdigit() else url
+        endpoint = self._urls.get(key)
+        if endpoint is None:
+            app, name = _split_url(url, self._base_path)
+            # Resolve to the endpoint attribute access builds, keyed by the
+            # attribute name (``device_types`` for ``device-types``), so the
+            # two are the same object. Slugs with underscores can only be
+            # reached with App.endpoint().
+            if "_" in name:
+                found = self.endpoint(self.app(app), name, literal_name=True)
+            else:
+                found = self.app(app)._endpoint(name.replace("-", "_"))
+            endpoint = self._urls.setdefault(key, found)
+        return endpoint
+
+
+def _split_url(url, base_path):
+    """Return the app and endpoint names in an object URL.
+
+    ``base_path`` is the path of ``Api.base_url``, e.g. ``/api`` or
+    ``/netbox/api`` when NetBox is served below a directory.
+    """
+    url_path = urlsplit(url).path
+    base_url_path_parts = base_path.split("/")
+    if len(base_url_path_parts) > 2:
+        # There are some extra directories in the path, remove them from url
+        extra_path = "/".join(base_url_path_parts[:-1])
+        url_path = url_path[len(extra_path) :]
+    split_url_path = url_path.split("/")
+    if split_url_path[2] == "plugins":
+        app = "plugins/{}".format(split_url_path[3])
+        name = split_url_path[4]
+    else:
+        app, name = split_url_path[2:4]
+    return app, name
+
+
+def _registry(api):
+    registry = getattr(api, "_registry", None)
+    return registry if isinstance(registry, Registry) else None
+
+
+def _app(api, name, app_class):
+    """Return the app ``name`` of ``api``, interned if it has a registry."""
+    registry = _registry(api)
+    if registry is None:
+        return app_class(api, name)
+    return registry.app(name)
@@ -0,0 +1,360 @@
+"""
+Batched loading of objects by ID.
+
+Accessing a field a record doesn't hold makes it load its detail view, one
+request per record. The helpers here load many objects with a few list
+requests filtered on ``id`` instead, sent concurrently on the `Api`'s thread
+pool.
+
+The same splitting keeps filters with many values, which would otherwise
+make request URLs too long for the server, within `MAX_URL_LENGTH`.
+"""
+
+import concurrent.futures as cf
+import copy
+import urllib.parse
+
+from pynetbox.core.query import map_ordered
+
+# IDs per list request when loading details. Smaller chunks spread the load
+# over more concurrent requests.
+CHUNK_SIZE = 100
+
+# Longest request URL sent when splitting values over several requests.
+# Leaves room for the request line within common server limits (gunicorn
+# accepts 4094 bytes, nginx and most proxies more).
+MAX_URL_LENGTH = 4000
+
+
+def split_values(name, values, budget, max_count=None):
+    """Split the values of multi-value query parameter ``name``.
+
+    ## Parameters
+
+    * **name** (str): Parameter name.
+    * **values** (list): Parameter values.
+    * **budget** (int): Characters available for the parameter in the
+        query string of each request.
+    * **max_count** (int, optional): Maximum values per request.
+
+    ## Returns
+    A list of lists of values, each of which fits in ``budget`` as
+    ``name=value&name=value...``. A value too long on its own gets a list
+    of its own.
+    """
+    chunks = []
+    chunk = []
+    size = 0
+    for value in values:
+        # "&name=value", URL encoded.
+        length = len(name) + len(urllib.parse.quote_plus(str(value))) + 2
+        if chunk and (size + length > budget or len(chunk) == max_count):
+            chunks.append(chunk)
+            chunk = []
+            size = 0
+        chunk.append(value)
+        size += length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def url_budget(url, filters=None):
+    """Return the characters left for more parameters in a request URL.
+
+    Accounts for ``url``, the encoded ``filters`` and a ``limit`` parameter.
+    """
+    query = urllib.parse.urlencode(filters or {}, doseq=True)
+    return MAX_URL_LENGTH - len(url) - len(query) - len("/?&limit=10000")
+
+
+def _fetch(endpoint, ids, filters):
+    return list(
+        endpoint.filter(
+            id=ids, limit=len(ids), strict_filters=False, **(filters or {})
+        ).raw()
+    )
+
+
+def fetch_many(groups, chunk_size=CHUNK_SIZE, max_workers=None, filters=None):
+    """Fetch objects of several endpoints by ID, concurrently.
+
+    ## Parameters
+
+    * **groups** (list): ``(endpoint, ids)`` tuples. Duplicate IDs are
+        fetched once.
+    * **chunk_size** (int, optional): Maximum IDs per request. Defaults to
+        100; None sends as many as fit in `MAX_URL_LENGTH`. Requests are
+        also split to stay within `MAX_URL_LENGTH` when a number is given.
+    * **max_workers** (int, optional): Requests sent concurrently. Defaults
+        to the `Api`'s ``max_workers``.
+    * **filters** (dict, optional): Other parameters of every request,
+        e.g. ``fields``.
+
+    ## Returns
+    A list with, for each group, a dict of ID to the object as decoded from
+    the response. IDs that don't exist are left out.
+    """
+    tasks = []
+    for n, (endpoint, ids) in enumerate(groups):
+        chunks = split_values(
+            "id",
+            list(dict.fromkeys(ids)),
+            url_budget(endpoint.url, filters),
+            chunk_size,
+        )
+        for chunk in chunks:
+            tasks.append((n, endpoint, chunk))
+    found = [{} for _ in groups]
+    if not tasks:
+        return found
+    if len(tasks) == 1:
+        pages = [_fetch(tasks[0][1], tasks[0][2], filters)]
+    else:
+        api = tasks[0][1].api
+        executor = api.thread_pool_executor or cf.ThreadPoolExecutor
+        workers = min(max_workers or api.max_workers, len(tasks))
+        with executor(max_workers=workers) as pool:
+            pages = list(
+                pool.map(lambda task: _fetch(task[1], task[2], filters), tasks)
+            )
+    for (n, _, _), page in zip(tasks, pages):
+        found[n].update((values["id"], values) for values in page)
+    return found
+
+
+def fetch_by_id(endpoint, ids, chunk_size=CHUNK_SIZE, max_workers=None, filters=None):
+    """Fetch the objects of ``endpoint`` with the given IDs.
+
+    See `fetch_many`.
+
+    ## Returns
+    A dict of ID to the object as decoded from the response.
+    """
+    return fetch_many([(endpoint, ids)], chunk_size, max_workers, filters)[0]
+
+
+def batch_details(records, chunk_size=CHUNK_SIZE, max_workers=None):
+    """Load the full details of many records with a few requests.
+
+    Records that haven't loaded their details yet are grouped by endpoint,
+    and the groups are fetched with list requests filtered on ``id`` (see
+    `fetch_many`). The records are updated in place and marked as having
+    their details, as if `Record.full_details()` had been called on each.
+
+    ## Parameters
+
+    * **records** (iterable): Records to load. Records without a ``url``,
+        records that already have their details, and read-only
+        `CompactRecord`s are skipped.
+    * **chunk_size** (int, optional): IDs per request. Defaults to 100.
+    * **max_workers** (int, optional): Requests sent concurrently.
+        Defaults to the `Api`'s ``max_workers``.
+
+    ## Returns
+    The number of records loaded.
+
+    ## Examples
+
+    ```python
+    interfaces = list(nb.dcim.interfaces.filter(site="site-1"))
+    pynetbox.batch_details(i.device for i in interfaces)
+    serials = [i.device.serial for i in interfaces]
+    ```
+    """
+    from pynetbox.core.response import Record
+
+    groups = {}
+    for record in records:
+        if not isinstance(record, Record):
+            continue
+        # Read through __dict__: a missing id must not trigger a lazy load.
+        if record.has_details or not record.url or "id" not in record.__dict__:
+            continue
+        endpoint = record.endpoint
+        group = groups.setdefault(endpoint.url, (endpoint, {}))[1]
+        # The same object may appear several times, e.g. as nested record.
+        group.setdefault(record.id, []).append(record)
+
+    groups = list(groups.values())
+    found = fetch_many(
+        [(endpoint, list(group)) for endpoint, group in groups],
+        chunk_size,
+        max_workers,
+    )
+    loaded = 0
+    for (_, group), objects in zip(groups, found):
+        for key, same in group.items():
+            values = objects.get(key)
+            if values is None:
+                continue
+            for record in same:
+                if not record.has_details:
+                    record._load_details(values)
+                    loaded += 1
+    return loaded
+
+
+def _related(record, name):
+    """Return the records held by field ``name`` of ``record``."""
+    from pynetbox.core.response import Record
+
+    if name in record.__dict__:
+        value = record.__dict__[name]
+    elif name in (record.__dict__.get("_lazy") or ()):
+        value = getattr(record, name)
+    else:
+        # Not fetched; reading it would load the record.
+        return []
+    if isinstance(value, Record):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, Record)]
+    return []
+
+
+def prefetch(records, *relations, chunk_size=CHUNK_SIZE, max_workers=None):
+    """Load the nested objects ``relations`` of ``records`` in bulk.
+
+    The nested records of each relation are collected across ``records``
+    and loaded with `batch_details`, so each related object costs a share
+    of a list request instead of a request of its own. Relations of nested
+    objects are given as dotted paths, e.g. ``"device_type.manufacturer"``,
+    and are loaded once their parent is.
+
+    ## Parameters
+
+    * **records** (list): Records whose relations to load.
+    * **relations** (str): Names of the nested object (or list) fields.
+    * **chunk_size** (int, optional): IDs per request. Defaults to 100.
+    * **max_workers** (int, optional): Requests sent concurrently.
+        Defaults to the `Api`'s ``max_workers``.
+
+    ## Returns
+    The number of nested records loaded.
+    """
+    from pynetbox.core.response import Record
+
+    paths = {tuple(relation.split(".")) for relation in relations}
+    # Records reached by each path prefix, starting from ``records``.
+    # Compact records are read-only and can't be loaded.
+    reached = {(): [r for r in records if isinstance(r, Record)]}
+    loaded = 0
+    depth = 0
+    while True:
+        depth += 1
+        level = sorted({path[:depth] for path in paths if len(path) >= depth})
+        if not level:
+            return loaded
+        targets = []
+        for path in level:
+            found = []
+            for record in reached[path[:-1]]:
+                found.extend(_related(record, path[-1]))
+            reached[path] = found
+            targets.extend(found)
+        loaded += batch_details(targets, chunk_size, max_workers)
+
+
+# Filters whose values are ANDed by NetBox: an object must match all of them,
+# so they can't be split over several requests. Negated lookups (``__n``)
+# are ANDed as well.
+CONJOINED_FILTERS = frozenset(("tag", "tag_id"))
+
+
+def split_filter(url, filters):
+    """Split an oversized multi-value filter of a list request.
+
+    The longest multi-value filter that NetBox ORs together is split so that
+    each request URL stays within `MAX_URL_LENGTH`. Filters that are ANDed
+    together (`CONJOINED_FILTERS`, ``__n`` lookups) are never split.
+
+    ## Returns
+    A ``(name, chunks)`` tuple, where ``chunks`` is a list of lists of
+    values of filter ``name``, or None if the request fits or can't be
+    split.
+    """
+    multi = {
+        name: list(values)
+        for name, values in filters.items()
+        if isinstance(values, (list, tuple, set, frozenset))
+        and len(values) > 1
+        and name not in CONJOINED_FILTERS
+        and not name.endswith("__n")
+    }
+    if not multi or url_budget(url, filters) >= 0:
+        return None
+    name = max(
+        multi, key=lambda k: len(urllib.parse.urlencode({k: multi[k]}, doseq=True))
+    )
+    rest = {k: v for k, v in filters.items() if k != name}
+    chunks = split_values(name, multi[name], url_budget(url, rest))
+    return (name, chunks) if len(chunks) > 1 else None
+
+
+class SplitRequest:
+    """Several list requests, read as one.
+
+    Returned in place of a `Request` by `Endpoint.filter()` when a filter
+    is split with `split_filter`. The requests run concurrently on the
+    `Api`'s thread pool and their results are merged in request order;
+    objects matched by more than one request are returned once. At most
+    ``max_workers`` requests are in flight or waiting to be read at a time,
+    so the results held in memory are bounded however many requests the
+    filter was split into.
+
+    ``count`` is None until all results were read, and `get_count()`
+    fetches the IDs of the matching objects to count them without
+    duplicates.
+    """
+
+    def __init__(self, requests, max_workers=None, thread_pool_executor=None):
+        self.requests = requests
+        self.max_workers = max_workers
+        self.thread_pool_executor = thread_pool_executor
+        self.limit = requests[0].limit
+        self.count = None
+
+    def _map(self, func):
+        """Yield ``func(request)`` for each request, in order.
+
+        At most ``max_workers`` requests are outstanding, see `map_ordered`.
+        """
+        executor = self.thread_pool_executor or cf.ThreadPoolExecutor
+        window = min(self.max_workers or len(self.requests), len(self.requests))
+        return map_ordered(executor, func, self.requests, window)
+
+    def get(self):
+        seen = set()
+        for page in self._map(lambda req: list(req.get())):
+            for values in page:
+                key = values.get("id") if isinstance(values, dict) else None
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                yield values
+        self.count = len(seen)
+
+    def get_count(self):
+        """Count the objects matched by the requests.
+
+        Reads the brief representation of the matching objects, as the
+        counts of the requests can't tell the objects matched more than
+        once.
+        """
+        if self.count is None:
+
+            def ids(req):
+                filters = {
+                    k: v for k, v in req.filters.items() if k not in ("fields", "omit")
+                }
+                brief = copy.copy(req)
+                brief.filters = dict(filters, brief=1)
+                return [values["id"] for values in brief.get()]
+
+            seen = set()
+            for page in self._map(ids):
+                seen.update(page)
+            self.count = len(seen)
+        return self.count
@@ -0,0 +1,269 @@
+"""
+Chunked bulk writes.
+
+`Endpoint.create()`, `Endpoint.update()` and `Endpoint.delete()` send a list
+of objects as a single request by default. Given ``chunk_size``,
+``max_workers`` or ``bisect``, they split the list into chunks sent
+concurrently on the `Api`'s thread pool instead, and report the outcome of
+every chunk in a `BulkResult` rather than failing the whole list on the
+first error. `Endpoint.upsert()` writes its creates and updates the same
+way.
+
+NetBox applies each bulk request in a single transaction, so a failed chunk
+leaves none of its objects written, and retrying parts of it is safe.
+"""
+
+import concurrent.futures as cf
+import time
+
+import requests
+
+from pynetbox.core.query import RequestError
+from pynetbox.core.response import Record, get_return
+
+# Objects per request of chunked bulk writes.
+CHUNK_SIZE = 500
+
+
+class BulkChunk:
+    """A request sent by a chunked bulk write.
+
+    * **offset** (int): Position of its first object in the list.
+    * **size** (int): Number of objects sent.
+    * **elapsed** (float): Duration of the request, in seconds.
+    * **error** (Exception): Why the request failed, or None.
+    """
+
+    def __init__(self, offset, size, elapsed, error=None):
+        self.offset = offset
+        self.size = size
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self):
+        return "<BulkChunk offset={} size={} elapsed={:.3f}s{}>".format(
+            self.offset, self.size, self.elapsed, " failed" if self.error else ""
+        )
+
+
+class BulkFailure:
+    """Objects that couldn't be written.
+
+    * **offset** (int): Position of the first object in the list.
+    * **items** (list): The objects, as sent: dicts, or IDs for deletes.
+    * **error** (Exception): The error of the request: a `RequestError`,
+        or a ``requests.RequestException`` such as a connection error.
+    """
+
+    def __init__(self, offset, items, error):
+        self.offset = offset
+        self.items = items
+        self.error = error
+
+    def __repr__(self):
+        return "<BulkFailure offset={} items={}: {}>".format(
+            self.offset, len(self.items), self.error
+        )
+
+
+class BulkResult:
+    """Outcome of a chunked bulk write.
+
+    * **records** (list): The objects written, in list order: `Record`s
+        for creates and updates, IDs for deletes.
+    * **failures** (list): A `BulkFailure` for each chunk (or, with
+        ``bisect``, each object) that couldn't be written.
+    * **chunks** (list): A `BulkChunk` for each request sent, including
+        the retries of ``bisect``, with its timing.
+
+    ## Examples
+
+    ```python
+    result = nb.dcim.devices.create(rows, chunk_size=500, bisect=True)
+    for failure in result.failures:
+        print(failure.items, failure.error.error)
+    ```
+    """
+
+    def __init__(self):
+        self.records = []
+        self.failures = []
+        self.chunks = []
+
+    @property
+    def ok(self):
+        """True if every object was written."""
+        return not self.failures
+
+    def __repr__(self):
+        return "<BulkResult {} written, {} failed in {} requests>".format(
+            len(self.records),
+            sum(len(f.items) for f in self.failures),
+            len(self.chunks),
+        )
+
+
+class UpsertResult:
+    """Outcome of `Endpoint.upsert()`.
+
+    * **created** (list): Records created, in the order of the rows.
+    * **updated** (list): Records updated, as returned by NetBox.
+    * **unchanged** (list): Existing records the rows didn't change.
+    * **failures** (list): A `BulkFailure` for each chunk (or row, with
+        ``bisect``) that couldn't be written. Its ``items`` are the rows
+        to create, or the changes to apply (with ``id``), and its
+        ``offset`` the position of the first one in the rows.
+    * **chunks** (list): A `BulkChunk` for each write request sent, with
+        offsets into the rows too.
+    """
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.failures = []
+        self.chunks = []
+
+    @property
+    def ok(self):
+        """True if every row was written."""
+        return not self.failures
+
+    @property
+    def counts(self):
+        """Number of rows created, updated, unchanged and failed."""
+        return {
+            "created": len(self.created),
+            "updated": len(self.updated),
+            "unchanged": len(self.unchanged),
+            "failed": sum(len(f.items) for f in self.failures),
+        }
+
+    def __repr__(self):
+        return (
+            "<UpsertResult {created} created, {updated} updated, "
+            "{unchanged} unchanged, {failed} failed>".format(**self.counts)
+        )
+
+    def add(self, written, result, positions):
+        """Add the `BulkResult` of creates or updates to the result.
+
+        ``positions`` maps the items written to their position in the rows.
+        """
+        written.extend(result.records)
+        for failure in result.failures:
+            failure.offset = positions[failure.offset]
+            self.failures.append(failure)
+        for chunk in result.chunks:
+            chunk.offset = positions[chunk.offset]
+            self.chunks.append(chunk)
+
+
+def key_value(value, by_slug=False):
+    """Return the comparable form of a natural key field value.
+
+    Related objects compare by ``id``, or by ``slug`` if ``by_slug`` is
+    true, and choices by ``value``, whether given as a `Record` or a dict.
+
+    ## Raises
+    ValueError: if the value can't be compared.
+    """
+    if isinstance(value, dict) and by_slug and "id" in value:
+        if "slug" not in value:
+            raise ValueError(
+                "Can't match by slug, the object has none - was {}".format(value)
+            )
+        value = value["slug"]
+    elif isinstance(value, dict):
+        value = value.get("id", value.get("value", value))
+    elif isinstance(value, Record):
+        value = get_return(value)
+    if isinstance(value, (dict, list, Record)):
+        raise ValueError(
+            "Natural key values must be scalars, or objects with an id or "
+            "value - was {}".format(value)
+        )
+    return value
+
+
+def _send(send, offset, items, bisect, result):
+    """Send ``items``, bisecting them on client errors if asked to.
+
+    Fills ``result`` with the outcome of this part of the list only, so
+    parts can run on different threads.
+    """
+    started = time.perf_counter()
+    try:
+        written = send(items)
+    except RequestError as exc:
+        result.chunks.append(
+            BulkChunk(offset, len(items), time.perf_counter() - started, exc)
+        )
+        # Server errors aren't caused by the data; retrying halves of the
+        # chunk would only fail again.
+        if bisect and len(items) > 1 and exc.req.status_code < 500:
+            half = len(items) // 2
+            _send(send, offset, items[:half], bisect, result)
+            _send(send, offset + half, items[half:], bisect, result)
+        else:
+            result.failures.append(BulkFailure(offset, items, exc))
+        return result
+    except requests.RequestException as exc:
+        # Connection errors and timeouts. Anything else is a bug, raised
+        # rather than reported as a failed chunk.
+        result.chunks.append(
+            BulkChunk(offset, len(items), time.perf_counter() - started, exc)
+        )
+        result.failures.append(BulkFailure(offset, items, exc))
+        return result
+    result.chunks.append(BulkChunk(offset, len(items), time.perf_counter() - started))
+    result.records.extend(written)
+    return result
+
+
+def write(api, send, items, chunk_size=None, max_workers=None, bisect=False):
+    """Write ``items`` in chunks, concurrently.
+
+    ## Parameters
+
+    * **api** (Api): Provides the thread pool and its default size.
+    * **send** (callable): Writes a list of items with one request and
+        returns what was written, as a list. Raises on failure.
+    * **items** (list): Objects to write.
+    * **chunk_size** (int, optional): Objects per request. Defaults to 500.
+    * **max_workers** (int, optional): Requests sent concurrently.
+        Defaults to the `Api`'s ``max_workers``.
+    * **bisect** (bool, optional): Split failed chunks in halves and retry
+        them, down to single objects, to find the objects at fault.
+        Only done for client errors (HTTP 4xx).
+
+    ## Returns
+    A `BulkResult`.
+
+    ## Raises
+    ValueError: if ``chunk_size`` isn't positive.
+    """
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    tasks = [
+        (offset, items[offset : offset + chunk_size])
+        for offset in range(0, len(items), chunk_size)
+    ]
+    parts = []
+    if len(tasks) == 1:
+        parts = [_send(send, *tasks[0], bisect, BulkResult())]
+    elif tasks:
+        executor = api.thread_pool_executor or cf.ThreadPoolExecutor
+        workers = min(max_workers or api.max_workers, len(tasks))
+        with executor(max_workers=workers) as pool:
+            parts = list(
+                pool.map(lambda task: _send(send, *task, bisect, BulkResult()), tasks)
+            )
+    result = BulkResult()
+    for part in parts:
+        result.records.extend(part.records)
+        result.failures.extend(part.failures)
+        result.chunks.extend(part.chunks)
+    return result
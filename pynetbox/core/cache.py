@@ -0,0 +1,317 @@
+"""
+Conditional GET cache.
+
+A cache stores the body of GET responses that carry an ``ETag`` or
+``Last-Modified`` validator. Later requests for the same URL are sent with
+``If-None-Match`` / ``If-Modified-Since``, and when NetBox answers
+``304 Not Modified`` the stored body is returned instead of being downloaded
+again. Every request still reaches the server, so cached bodies are never
+stale.
+
+`PynetboxAdapter` applies the cache to all GET requests made through
+``Api.http_session``. Two backends are provided, `MemoryCache` and
+`DiskCache`; other backends subclass `BaseCache`.
+"""
+
+import abc
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Headers that change the body NetBox returns for the same URL.
+_VARY_HEADERS = ("Authorization", "Accept", "X-NetBox-Branch")
+
+
+def cache_key(request):
+    """Return the cache key of a prepared GET request."""
+    parts = [request.url] + [request.headers.get(h, "") for h in _VARY_HEADERS]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class CacheEntry:
+    """A stored response body and the headers it was served with."""
+
+    __slots__ = ("url", "status", "headers", "content")
+
+    def __init__(self, url, status, headers, content):
+        self.url = url
+        self.status = status
+        self.headers = dict(headers)
+        self.content = content
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    def validators(self):
+        """Return the conditional request headers for this entry."""
+        headers = {}
+        headers_ci = CaseInsensitiveDict(self.headers)
+        if "ETag" in headers_ci:
+            headers["If-None-Match"] = headers_ci["ETag"]
+        if "Last-Modified" in headers_ci:
+            headers["If-Modified-Since"] = headers_ci["Last-Modified"]
+        return headers
+
+
+class BaseCache(abc.ABC):
+    """Base class of the cache backends, which implement the storage methods.
+
+    Backends count:
+
+    * **hits**: requests answered with 304 and served from the cache.
+    * **misses**: responses downloaded in full and stored.
+    """
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_lock", "_stats_lock"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._stats_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _count(self, field):
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Return the `CacheEntry` stored under ``key``, or None."""
+
+    @abc.abstractmethod
+    def set(self, key, entry):
+        """Store ``entry`` under ``key``, replacing any previous entry."""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """Remove the entry stored under ``key``, if any."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove all entries."""
+
+
+def prepare(cache, request):
+    """Add validators of a cached response to ``request``.
+
+    ## Returns
+    The cache key and the cached entry (or None), for `update`.
+    """
+    key = cache_key(request)
+    entry = cache.get(key)
+    if entry is not None:
+        request.headers.update(entry.validators())
+    return key, entry
+
+
+def update(cache, key, entry, response, stream=False):
+    """Serve a 304 from ``entry`` or store a new response.
+
+    Streamed responses are served from the cache on a 304 but are not
+    stored, since that would require reading their body up front.
+
+    ## Returns
+    The response to hand to the caller.
+    """
+    if response.status_code == 304 and entry is not None:
+        cache._count("hits")
+        response.close()
+        headers = CaseInsensitiveDict(entry.headers)
+        # The 304 carries the current validators.
+        for name in ("ETag", "Last-Modified", "Date"):
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        response.status_code = entry.status
+        response.reason = "OK"
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response._content = entry.content
+        response._content_consumed = True
+        return response
+    if response.status_code != 200 or stream:
+        return response
+    if "ETag" in response.headers or "Last-Modified" in response.headers:
+        cache._count("misses")
+        cache.set(
+            key,
+            CacheEntry(
+                response.url, response.status_code, response.headers, response.content
+            ),
+        )
+    elif entry is not None:
+        cache.delete(key)
+    return response
+
+
+class MemoryCache(BaseCache):
+    """In-memory cache, shared by the threads of a process.
+
+    The least recently used entries are evicted once the stored bodies
+    exceed ``max_bytes``.
+
+    ## Parameters
+
+    * **max_bytes** (int, optional): Maximum total size of the stored
+        bodies. Defaults to 64 MiB.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class DiskCache(BaseCache):
+    """On-disk cache, which survives restarts and can be shared by processes.
+
+    Each entry is a file in ``directory``. The least recently used files are
+    removed once their total size exceeds ``max_bytes``.
+
+    ## Parameters
+
+    * **directory** (str or path): Directory holding the cache. Created if
+        it doesn't exist.
+    * **max_bytes** (int, optional): Maximum total size of the cache files.
+        Defaults to 256 MiB.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        super().__init__()
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.size = sum(size for _, _, size in self._files())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _files(self):
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(meta["url"], meta["status"], meta["headers"], content)
+
+    def set(self, key, entry):
+        meta = json.dumps(
+            {"url": entry.url, "status": entry.status, "headers": entry.headers}
+        ).encode("utf-8")
+        data = meta + b"\n" + entry.content
+        if len(data) > self.max_bytes:
+            self.delete(key)
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                self.size -= self._file_size(key)
+                os.replace(tmp, self._path(key))
+                self.size += len(data)
+                if self.size > self.max_bytes:
+                    self._evict()
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _file_size(self, key):
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            return 0
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda f: f[1])
+        # Recount, as other processes may share the directory.
+        self.size = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self.size -= size
+
+    def delete(self, key):
+        with self._lock:
+            size = self._file_size(key)
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                return
+            self.size -= size
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._files()):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self.size = 0
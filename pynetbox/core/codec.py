@@ -0,0 +1,142 @@
+"""
+JSON codecs for request and response bodies.
+
+By default pynetbox lets ``requests`` encode bodies (``json=``) and decode
+responses (``Response.json()``) with the standard library. Passing
+``json_codec`` to `Api` routes both through one of the codecs below
+instead, which decode straight from the response bytes rather than from a
+decoded text copy.
+
+A codec is any object with:
+
+* ``loads(data)``: parse ``bytes`` into Python objects, raising
+  ``ValueError`` on invalid input.
+* ``dumps(obj)``: serialize Python objects to ``bytes``.
+"""
+
+import importlib
+import json
+
+
+class StdlibCodec:
+    """Codec using the standard library ``json`` module."""
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec:
+    """Codec using `orjson <https://github.com/ijl/orjson>`_."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = importlib.import_module("orjson")
+
+    def loads(self, data):
+        # orjson.JSONDecodeError subclasses ValueError.
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+
+class UjsonCodec:
+    """Codec using `ujson <https://github.com/ultrajson/ultrajson>`_."""
+
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = importlib.import_module("ujson")
+
+    def loads(self, data):
+        # ujson.JSONDecodeError subclasses ValueError.
+        return self._ujson.loads(data)
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+class MsgspecCodec:
+    """Codec using `msgspec <https://jcristharif.com/msgspec/>`_."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        msgspec = importlib.import_module("msgspec")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            # msgspec errors don't derive from ValueError; normalize them so
+            # callers only have to handle one exception type.
+            raise ValueError(str(exc)) from exc
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+
+CODECS = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+# Preference order for "auto", fastest first.
+_AUTO_ORDER = ("orjson", "msgspec", "ujson", "json")
+
+
+def get_codec(codec):
+    """Resolve the ``json_codec`` argument of `Api` to a codec object.
+
+    ## Parameters
+
+    * **codec** (str, object or None): ``None`` keeps the default
+        ``requests`` handling. A name from `CODECS` selects that codec,
+        ``"auto"`` picks the fastest one installed, and any other object is
+        used as a codec as-is.
+
+    ## Returns
+    A codec object, or None.
+
+    ## Raises
+    * ImportError if the named codec's library is not installed.
+    * ValueError if the name is unknown.
+    """
+    if codec is None or not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        for name in _AUTO_ORDER:
+            try:
+                return CODECS[name]()
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise ValueError(
+            "json_codec must be one of {}, 'auto' or a codec object, got {!r}".format(
+                ", ".join(repr(name) for name in CODECS), codec
+            )
+        )
+    try:
+        return CODECS[codec]()
+    except ImportError as exc:
+        raise ImportError(
+            "json_codec={!r} requires the {} package to be installed".format(
+                codec, codec
+            )
+        ) from exc
+
+
+def api_codec(api):
+    """Return the codec ``api`` was created with, or None."""
+    return getattr(api, "json_codec", None)
@@ -0,0 +1,165 @@
+"""
+Columnar export of result sets.
+
+`Columns` builds one list per column straight from the decoded pages of a
+query, flattening nested objects into dotted column names (``site.id``,
+``site.name``). The rows are consumed a page at a time, so the page dicts
+are released as the columns grow. `to_arrow`, `to_pandas` and `to_numpy`
+turn the columns into the respective library's structures; those libraries
+are optional and only imported when used.
+"""
+
+import importlib
+import itertools
+
+# Rows taken from the result set at a time when the page size is unknown.
+CHUNK_ROWS = 1000
+
+# Dict fields that hold user data rather than a nested object. They are
+# flattened too, but never treated as choice fields.
+_JSON_FIELDS = ("custom_fields", "local_context_data", "config_context")
+
+
+def _is_choice(value):
+    """Return True for a NetBox choice field value (``{"value", "label"}``)."""
+    return "value" in value and "label" in value and len(value) <= 3
+
+
+class Columns:
+    """Column lists built from NetBox response dicts.
+
+    ## Parameters
+
+    * **columns** (list, optional): Columns to keep, as dotted names. A
+        name of a nested object (``"site"``) keeps all of its columns.
+        Defaults to all columns.
+    """
+
+    def __init__(self, columns=None):
+        self.data = {}
+        self.choices = set()
+        self.rows = 0
+        self._wanted = tuple(columns) if columns else None
+
+    def _keep(self, name):
+        if self._wanted is None:
+            return True
+        return any(name == w or name.startswith(w + ".") for w in self._wanted)
+
+    def _descend(self, prefix):
+        """Return True if columns under ``prefix`` may be kept."""
+        if self._wanted is None:
+            return True
+        return any(
+            w == prefix or w.startswith(prefix + ".") or prefix.startswith(w + ".")
+            for w in self._wanted
+        )
+
+    def _flatten(self, values, prefix, row, json_field=False):
+        for k, v in values.items():
+            name = prefix + k
+            if isinstance(v, dict) and v:
+                if not self._descend(name):
+                    continue
+                if not json_field and _is_choice(v):
+                    self.choices.add(name + ".value")
+                self._flatten(v, name + ".", row, json_field or k in _JSON_FIELDS)
+            elif self._keep(name):
+                row[name] = v
+
+    def extend(self, rows):
+        """Append ``rows`` (response dicts) to the columns."""
+        data = self.data
+        for values in rows:
+            row = {}
+            self._flatten(values, "", row)
+            for name, v in row.items():
+                column = data.get(name)
+                if column is None:
+                    # A column first seen now is None for the earlier rows.
+                    column = data[name] = [None] * self.rows
+                column.append(v)
+            self.rows += 1
+            for column in data.values():
+                if len(column) < self.rows:
+                    column.append(None)
+
+    def fill(self, iterable, chunk_rows=CHUNK_ROWS):
+        """Append all rows of ``iterable``, ``chunk_rows`` at a time."""
+        iterator = iter(iterable)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_rows))
+            if not chunk:
+                break
+            self.extend(chunk)
+        self._drop_null_objects()
+        return self
+
+    def _drop_null_objects(self):
+        """Drop the column of a nested object that was null in some rows.
+
+        ``{"site": None}`` yields a ``site`` column while ``{"site": {...}}``
+        yields ``site.id``, ``site.name``, ...; the latter are None for the
+        null rows already.
+        """
+        for name in list(self.data):
+            if all(v is None for v in self.data[name]) and any(
+                other.startswith(name + ".") for other in self.data
+            ):
+                del self.data[name]
+
+
+def _import(module, method):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            "RecordSet.{}() requires {} to be installed".format(
+                method, module.split(".")[0]
+            )
+        ) from None
+
+
+def to_arrow(columns):
+    """Return a ``pyarrow.Table`` of `Columns`.
+
+    Choice fields' ``.value`` columns are dictionary encoded.
+    """
+    pa = _import("pyarrow", "to_arrow")
+    arrays = {}
+    for name, column in columns.data.items():
+        array = pa.array(column)
+        if name in columns.choices:
+            array = array.dictionary_encode()
+        arrays[name] = array
+    return pa.table(arrays)
+
+
+def to_pandas(columns):
+    """Return a ``pandas.DataFrame`` of `Columns`.
+
+    Choice fields' ``.value`` columns are categorical.
+    """
+    pd = _import("pandas", "to_pandas")
+    frame = pd.DataFrame(columns.data)
+    for name in columns.choices:
+        if name in frame:
+            frame[name] = frame[name].astype("category")
+    return frame
+
+
+def to_numpy(columns):
+    """Return a dict of column name to ``numpy.ndarray`` of `Columns`.
+
+    Columns NumPy can't type (e.g. with missing values) are object arrays.
+    """
+    np = _import("numpy", "to_numpy")
+    arrays = {}
+    for name, column in columns.data.items():
+        if any(v is None or isinstance(v, (list, dict)) for v in column):
+            array = np.empty(len(column), dtype=object)
+            array[:] = column
+        else:
+            array = np.asarray(column)
+        arrays[name] = array
+    return arrays
@@ -14,8 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from pynetbox.core import batch, bulk
+from pynetbox.core.codec import api_codec
 from pynetbox.core.query import Request, RequestError, ParameterValidationError
-from pynetbox.core.response import Record, RecordSet
+from pynetbox.core.response import FieldTable, Record, RecordMap, RecordSet
 
 RESERVED_KWARGS = ()
 
@@ -64,6 +66,15 @@ class Endpoint:
             endpoint=self.name,
         )
         self._choices = None
+        # Return CompactRecords from all() and filter(), see RecordSet.compact().
+        self.compact_records = False
+        self._compact_table = None
+
+    def _field_table(self):
+        """Return the `FieldTable` shared by this endpoint's compact records."""
+        if self._compact_table is None:
+            self._compact_table = FieldTable(self)
+        return self._compact_table
 
     def _lookup_ret_obj(self, name, model):
         """Loads unique Response objects.
@@ -103,6 +114,15 @@ class Endpoint:
         if method.lower() != "get":
             raise RuntimeError(f"Unsupported method '{method}'.")
 
+        self._check_openapi_parameters(self.api.openapi(), method, parameters)
+
+    def _check_openapi_parameters(self, openapi, method, parameters):
+        """Validate ``parameters`` against an already-fetched OpenAPI spec.
+
+        Split out of `_validate_openapi_parameters` so callers that obtain
+        the spec differently (e.g. the asyncio client, which has to await
+        it) share the same validation rules.
+        """
         openapi_definition_path = "/api/{app}/{endpoint}/".format(
             app=self.app.name,
             endpoint=self.name,
@@ -110,9 +130,7 @@ class Endpoint:
 
         # Parse NetBox OpenAPI definition
         try:
-            openapi_definition = self.api.openapi()["paths"].get(
-                openapi_definition_path
-            )
+            openapi_definition = openapi["paths"].get(openapi_definition_path)
 
             if not openapi_definition:
                 raise ParameterValidationError(
@@ -129,10 +147,11 @@ class Endpoint:
 
         # Validate all parameters. Custom field filters (cf_<fieldname>, plus
         # lookup expressions like cf_<fieldname>__gt) are per-instance dynamic
-        # and not listed in the OpenAPI spec, so they are skipped here.
+        # and not listed in the OpenAPI spec, so they are skipped here, as are
+        # the fields/omit projections, which aren't filters.
         validation_errors = []
         for p in parameters:
-            if p.startswith("cf_"):
+            if p.startswith("cf_") or p in ("fields", "omit"):
                 continue
             if p not in allowed_parameters:
                 validation_errors.append(
@@ -142,7 +161,7 @@ class Endpoint:
         if len(validation_errors) > 0:
             raise ParameterValidationError(validation_errors)
 
-    def all(self, limit=0, offset=None):
+    def all(self, limit=0, offset=None, read_ahead=None, fields=None, omit=None):
         """Queries the 'ListView' of a given endpoint.
 
         Returns all objects from an endpoint.
@@ -154,6 +173,13 @@ class Endpoint:
             be returned with each query to the Netbox server. The queries
             will be made as you iterate through the result set.
         * **offset** (int, optional): Overrides the offset on paginated returns.
+        * **read_ahead** (int, optional): Overrides the number of pages
+            fetched ahead of iteration (`Api` ``read_ahead``) for this query.
+        * **fields** (list, optional): Only fetch these fields (NetBox 4.0+).
+            ``id`` and ``url`` are always included. See `Record` for how
+            the other fields of these partial records behave.
+        * **omit** (list, optional): Fetch all fields except these
+            (NetBox 4.3+).
 
         ## Returns
         A RecordSet object.
@@ -181,22 +207,30 @@ class Endpoint:
         """
         if limit == 0 and offset is not None:
             raise ValueError("offset requires a positive limit value")
+        filters = self._projection(fields, omit)
         req = Request(
+            filters=filters,
             base="{}/".format(self.url),
             token=self.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
             threading=self.api.threading,
             thread_pool_executor=self.api.thread_pool_executor,
             max_workers=self.api.max_workers,
             limit=limit,
             offset=offset,
+            read_ahead=self.api.read_ahead if read_ahead is None else read_ahead,
+            cursor_shards=self.api.cursor_shards,
+            cursor_shards_ordered=self.api.cursor_shards_ordered,
+            page_size_controller=self.api.page_size_controller,
+            streaming=self.api.streaming,
             # Passed uncalled so the version probe behind
             # _effective_pagination() is deferred until the request actually
             # runs, rather than firing when this lazy RecordSet is built.
             pagination=self.api._effective_pagination,
         )
 
-        return RecordSet(self, req)
+        return RecordSet(self, req, partial=self._partial_policy(filters))
 
     def get(self, *args, **kwargs):
         """Queries the DetailsView of a given endpoint.
@@ -208,6 +242,9 @@ class Endpoint:
             be added as a keyword arg.
         * **strict_filters** (bool, optional): Overrides the global filter
             validation per-request basis. Handled by the filter() method.
+        * **fields** (list, optional): Only fetch these fields, see `all()`.
+        * **omit** (list, optional): Fetch all fields except these, see
+            `all()`.
 
         ## Returns
         A single Record object or None
@@ -258,20 +295,72 @@ class Endpoint:
             except StopIteration:
                 return ret
 
+        filters = self._projection(kwargs.get("fields"), kwargs.get("omit"))
         req = Request(
             key=key,
+            filters=filters,
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         )
         try:
-            return next(RecordSet(self, req), None)
+            return next(
+                RecordSet(self, req, partial=self._partial_policy(filters)), None
+            )
         except RequestError as e:
             if e.req.status_code == 404:
                 return None
             else:
                 raise e
 
+    def get_many(self, ids, chunk_size=None, fields=None, omit=None):
+        """Queries the objects with the given IDs.
+
+        The IDs are sent as ``id`` filters of list requests, split so that
+        each request URL stays within `pynetbox.core.batch.MAX_URL_LENGTH`
+        characters, and the requests are sent concurrently on the `Api`'s
+        thread pool.
+
+        ## Parameters
+
+        * **ids** (iterable): IDs of the objects.
+        * **chunk_size** (int, optional): Maximum IDs per request. Defaults
+            to as many as fit in the URL.
+        * **fields** (list, optional): Only fetch these fields, see `all()`.
+        * **omit** (list, optional): Fetch all fields except these, see
+            `all()`.
+
+        ## Returns
+        A `RecordMap`: a dict of ID to Record, in the order of ``ids``. IDs
+        that don't exist are listed in its ``missing`` attribute.
+
+        ## Examples
+
+        ```python
+        devices = nb.dcim.devices.get_many([1, 2, 3, 999])
+        devices[1]
+        # test1-edge1
+        devices.missing
+        # [999]
+        ```
+        """
+        ids = list(dict.fromkeys(ids))
+        filters = self._projection(fields, omit)
+        found = batch.fetch_by_id(self, ids, chunk_size=chunk_size, filters=filters)
+        partial = self._partial_policy(filters)
+        ret = RecordMap()
+        for key in ids:
+            values = found.get(key)
+            if values is None:
+                ret.missing.append(key)
+                continue
+            record = self.return_obj(values, self.api, self)
+            if partial is not None:
+                record._partial = partial
+            ret[key] = record
+        return ret
+
     def filter(self, *args, **kwargs):
         """Queries the 'ListView' of a given endpoint.
 
@@ -292,6 +381,18 @@ class Endpoint:
         * **offset** (int, optional): Overrides the offset on paginated returns.
         * **strict_filters** (bool, optional): Overrides the global filter
             validation per-request basis.
+        * **read_ahead** (int, optional): Overrides the number of pages
+            fetched ahead of iteration (`Api` ``read_ahead``) for this query.
+        * **fields** (list, optional): Only fetch these fields, see `all()`.
+        * **omit** (list, optional): Fetch all fields except these, see
+            `all()`.
+
+        A filter given so many values that the request URL would exceed
+        `pynetbox.core.batch.MAX_URL_LENGTH` characters is split over
+        several requests, sent concurrently. Their results are merged, and
+        objects matched by more than one request are returned once. Filters
+        that NetBox ANDs together (``tag``, ``tag_id`` and ``__n`` lookups)
+        are never split, nor are queries with an ``offset``.
 
         ## Returns
         A RecordSet object.
@@ -337,49 +438,125 @@ class Endpoint:
         ```
         """
 
-        if args:
-            kwargs.update({"q": args[0]})
-
-        if any(i in RESERVED_KWARGS for i in kwargs):
-            raise ValueError(
-                "A reserved kwarg was passed ({}). Please remove it "
-                "and try again.".format(RESERVED_KWARGS)
-            )
-        limit = kwargs.pop("limit") if "limit" in kwargs else 0
-        offset = kwargs.pop("offset") if "offset" in kwargs else None
-        strict_filters = (
-            # kwargs value takes precedence on globally set value
-            kwargs.pop("strict_filters")
-            if "strict_filters" in kwargs
-            else self.api.strict_filters
+        read_ahead = (
+            kwargs.pop("read_ahead") if "read_ahead" in kwargs else self.api.read_ahead
         )
-
-        if limit == 0 and offset is not None:
-            raise ValueError("offset requires a positive limit value")
-        filters = {x: y if y is not None else "null" for x, y in kwargs.items()}
+        filters, limit, offset, strict_filters = self._parse_filter_args(args, kwargs)
 
         if strict_filters:
             self._validate_openapi_parameters("get", filters)
 
-        req = Request(
+        # Paging through a merged result isn't possible, so only full
+        # iterations split their filters.
+        split = None if offset is not None else batch.split_filter(self.url, filters)
+        if split is not None:
+            name, chunks = split
+            req = batch.SplitRequest(
+                [
+                    self._list_request(
+                        dict(filters, **{name: chunk}), limit, offset, read_ahead
+                    )
+                    for chunk in chunks
+                ],
+                max_workers=self.api.max_workers,
+                thread_pool_executor=self.api.thread_pool_executor,
+            )
+        else:
+            req = self._list_request(filters, limit, offset, read_ahead)
+
+        return RecordSet(self, req, partial=self._partial_policy(filters))
+
+    def _list_request(self, filters, limit, offset, read_ahead):
+        """Build the `Request` of a `filter()` query."""
+        return Request(
             filters=filters,
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
             threading=self.api.threading,
             thread_pool_executor=self.api.thread_pool_executor,
             max_workers=self.api.max_workers,
             limit=limit,
             offset=offset,
+            read_ahead=read_ahead,
+            cursor_shards=self.api.cursor_shards,
+            cursor_shards_ordered=self.api.cursor_shards_ordered,
+            page_size_controller=self.api.page_size_controller,
+            streaming=self.api.streaming,
             # Passed uncalled so the version probe behind
             # _effective_pagination() is deferred until the request actually
             # runs, rather than firing when this lazy RecordSet is built.
             pagination=self.api._effective_pagination,
         )
 
-        return RecordSet(self, req)
+    def _projection(self, fields=None, omit=None):
+        """Build the ``fields``/``omit`` query parameters.
 
-    def create(self, *args, **kwargs):
+        ``id`` and ``url`` are always requested with ``fields`` and never
+        omitted, since records need them to be saved, compared and loaded
+        in full.
+
+        ## Returns
+        A dict of query parameters, empty if neither is given.
+        """
+        params = {}
+        if fields:
+            if isinstance(fields, str):
+                fields = fields.split(",")
+            fields = dict.fromkeys(["id", "url"] + [f.strip() for f in fields])
+            params["fields"] = ",".join(fields)
+        if omit:
+            if isinstance(omit, str):
+                omit = omit.split(",")
+            omit = [f.strip() for f in omit if f.strip() not in ("id", "url")]
+            if omit:
+                params["omit"] = ",".join(omit)
+        return params
+
+    def _partial_policy(self, filters):
+        """Return the partial record policy for a query, or None."""
+        if filters and ("fields" in filters or "omit" in filters):
+            return self.api.partial_records
+        return None
+
+    def _parse_filter_args(self, args, kwargs):
+        """Split the arguments of `filter()` into filters and paging options.
+
+        ## Returns
+        A ``(filters, limit, offset, strict_filters)`` tuple.
+
+        ## Raises
+        ValueError: if a reserved kwarg is passed or ``offset`` is given
+            without a positive ``limit``.
+        """
+        if args:
+            kwargs.update({"q": args[0]})
+
+        if any(i in RESERVED_KWARGS for i in kwargs):
+            raise ValueError(
+                "A reserved kwarg was passed ({}). Please remove it "
+                "and try again.".format(RESERVED_KWARGS)
+            )
+        limit = kwargs.pop("limit") if "limit" in kwargs else 0
+        offset = kwargs.pop("offset") if "offset" in kwargs else None
+        projection = self._projection(
+            kwargs.pop("fields", None), kwargs.pop("omit", None)
+        )
+        strict_filters = (
+            # kwargs value takes precedence on globally set value
+            kwargs.pop("strict_filters")
+            if "strict_filters" in kwargs
+            else self.api.strict_filters
+        )
+
+        if limit == 0 and offset is not None:
+            raise ValueError("offset requires a positive limit value")
+        filters = {x: y if y is not None else "null" for x, y in kwargs.items()}
+        filters.update(projection)
+        return filters, limit, offset, strict_filters
+
+    def create(self, *args, chunk_size=None, max_workers=None, bisect=False, **kwargs):
         """Creates an object on an endpoint.
 
         Takes named arguments that match the given endpoint's
@@ -387,11 +564,22 @@ class Endpoint:
 
         ## Parameters
 
-        * **args**: Not used.
+        * **args** (list, optional): A list of dicts, to create several
+            objects with a bulk request.
         * **kwargs**: Fields and values to create the object with.
+        * **chunk_size** (int, optional): With a list, create the objects
+            with requests of this many objects (500 by default), sent
+            concurrently. See `pynetbox.core.bulk.BulkResult`.
+        * **max_workers** (int, optional): With a list, the number of
+            chunks sent concurrently. Defaults to the `Api`'s
+            ``max_workers``.
+        * **bisect** (bool, optional): With a list, split the chunks that
+            fail in halves and retry them, to find the objects at fault.
 
         ## Returns
-        A Record object.
+        A Record object, a list of Records for a list of objects, or a
+        `BulkResult` if ``chunk_size``, ``max_workers`` or ``bisect`` is
+        given.
 
         ## Examples
 
@@ -416,19 +604,39 @@ class Endpoint:
             site={'id': 1}
         )
         ```
+
+        Creating many devices in chunks, and listing the rows that failed:
+
+        ```python
+        result = nb.dcim.devices.create(rows, chunk_size=500, bisect=True)
+        for failure in result.failures:
+            print(failure.items[0]["name"], failure.error.error)
+        ```
         """
+        if chunk_size is not None or max_workers is not None or bisect:
+            if not args or not isinstance(args[0], list):
+                raise ValueError("chunked create requires a list of objects")
+            return bulk.write(
+                self.api,
+                lambda items: self._records(self._write_request().post(items)),
+                args[0],
+                chunk_size,
+                max_workers,
+                bisect,
+            )
 
         req = Request(
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).post(args[0] if args else kwargs)
 
         if isinstance(req, list):
             return [self.return_obj(i, self.api, self) for i in req]
         return self.return_obj(req, self.api, self)
 
-    def update(self, objects):
+    def update(self, objects, chunk_size=None, max_workers=None, bisect=False):
         """Updates objects in NetBox.
 
         Takes a list of objects and updates them in NetBox.
@@ -436,9 +644,14 @@ class Endpoint:
         ## Parameters
 
         * **objects** (list): A list of Record objects to update.
+        * **chunk_size** (int, optional): Update the objects with requests
+            of this many objects, sent concurrently. See `create()`.
+        * **max_workers** (int, optional): Chunks sent concurrently.
+        * **bisect** (bool, optional): Retry failed chunks in halves.
 
         ## Returns
-        A list of Record objects.
+        A list of Record objects, or a `BulkResult` if ``chunk_size``,
+        ``max_workers`` or ``bisect`` is given.
 
         ## Examples
 
@@ -449,6 +662,33 @@ class Endpoint:
         nb.dcim.devices.update(devices)
         ```
         """
+        series = self._build_update_series(objects)
+        if chunk_size is not None or max_workers is not None or bisect:
+            return bulk.write(
+                self.api,
+                lambda items: self._records(self._write_request().patch(items)),
+                series,
+                chunk_size,
+                max_workers,
+                bisect,
+            )
+        req = Request(
+            base=self.url,
+            token=self.token,
+            http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
+        ).patch(series)
+
+        if isinstance(req, list):
+            return [self.return_obj(i, self.api, self) for i in req]
+        return self.return_obj(req, self.api, self)
+
+    def _build_update_series(self, objects):
+        """Build the bulk PATCH payload for `update()`.
+
+        Records contribute only their changed fields (plus ``id``) and are
+        skipped entirely when unchanged; dicts are sent as given.
+        """
         series = []
         if not isinstance(objects, list):
             raise ValueError(
@@ -470,17 +710,44 @@ class Endpoint:
                 raise ValueError(
                     "Object passed must be dict|Record - was {}".format(type(objects))
                 )
-        req = Request(
+        return series
+
+    def _build_delete_ids(self, objects):
+        """Normalize the objects passed to `delete()` into a list of ids."""
+        cleaned_ids = []
+        for o in objects:
+            if isinstance(o, int):
+                cleaned_ids.append(o)
+            elif isinstance(o, str) and o.isnumeric():
+                cleaned_ids.append(int(o))
+            elif isinstance(o, Record):
+                if not hasattr(o, "id"):
+                    raise ValueError(
+                        "Record from '"
+                        + o.url
+                        + "' does not have an id and cannot be bulk deleted"
+                    )
+                cleaned_ids.append(o.id)
+            else:
+                raise ValueError(
+                    "Invalid object in list of objects to delete: " + str(type(o))
+                )
+        return cleaned_ids
+
+    def _write_request(self):
+        """Build the `Request` of a bulk write."""
+        return Request(
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
-        ).patch(series)
+            json_codec=api_codec(self.api),
+        )
 
-        if isinstance(req, list):
-            return [self.return_obj(i, self.api, self) for i in req]
-        return self.return_obj(req, self.api, self)
+    def _records(self, values):
+        """Build the Records returned by a bulk write."""
+        return [self.return_obj(i, self.api, self) for i in values]
 
-    def delete(self, objects):
+    def delete(self, objects, chunk_size=None, max_workers=None, bisect=False):
         """Deletes objects from NetBox.
 
         Takes a list of objects and deletes them from NetBox.
@@ -488,9 +755,15 @@ class Endpoint:
         ## Parameters
 
         * **objects** (list): A list of Record objects to delete.
+        * **chunk_size** (int, optional): Delete the objects with requests
+            of this many objects, sent concurrently. See `create()`.
+        * **max_workers** (int, optional): Chunks sent concurrently.
+        * **bisect** (bool, optional): Retry failed chunks in halves.
 
         ## Returns
-        True if the delete operation was successful.
+        True if the delete operation was successful, or a `BulkResult`
+        listing the IDs deleted if ``chunk_size``, ``max_workers`` or
+        ``bisect`` is given.
 
         ## Examples
 
@@ -499,37 +772,206 @@ class Endpoint:
         nb.dcim.devices.delete(devices)
         ```
         """
-        cleaned_ids = []
         if not isinstance(objects, list) and not isinstance(objects, RecordSet):
             raise ValueError(
                 "objects must be list[str|int|Record]"
                 "|RecordSet - was " + str(type(objects))
             )
-        for o in objects:
-            if isinstance(o, int):
-                cleaned_ids.append(o)
-            elif isinstance(o, str) and o.isnumeric():
-                cleaned_ids.append(int(o))
-            elif isinstance(o, Record):
-                if not hasattr(o, "id"):
-                    raise ValueError(
-                        "Record from '"
-                        + o.url
-                        + "' does not have an id and cannot be bulk deleted"
-                    )
-                cleaned_ids.append(o.id)
-            else:
-                raise ValueError(
-                    "Invalid object in list of objects to delete: " + str(type(o))
-                )
+        cleaned_ids = self._build_delete_ids(objects)
+        if chunk_size is not None or max_workers is not None or bisect:
+
+            def send(ids):
+                self._write_request().delete(data=[{"id": i} for i in ids])
+                return ids
+
+            return bulk.write(
+                self.api, send, cleaned_ids, chunk_size, max_workers, bisect
+            )
 
         req = Request(
             base=self.url,
             token=self.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         )
         return True if req.delete(data=[{"id": i} for i in cleaned_ids]) else False
 
+    def upsert(self, rows, key, chunk_size=None, max_workers=None, bisect=False):
+        """Creates or updates objects identified by a natural key.
+
+        The existing objects are looked up for all rows at once, with list
+        requests filtered on the values of the ``key`` fields (split over
+        several concurrent requests if needed, see `filter()`). Rows with
+        no existing object are created, and the others are applied to it
+        as with `Record.update()`: only the fields that differ are sent,
+        and objects the row doesn't change aren't written. Creates and
+        updates are sent in chunks, concurrently, as with ``chunk_size``
+        in `create()` and `update()`.
+
+        ## Parameters
+
+        * **rows** (list): Dicts of fields, as accepted by `create()`.
+        * **key** (str or tuple): Field(s) identifying an object, e.g.
+            ``("name", "site")``. Related objects in key fields are given
+            as a `Record`, a dict with an ``id``, an id or a slug, and
+            choices by ``value``.
+        * **chunk_size** (int, optional): Objects per write request.
+            Defaults to 500.
+        * **max_workers** (int, optional): Write requests sent
+            concurrently. Defaults to the `Api`'s ``max_workers``.
+        * **bisect** (bool, optional): Retry failed chunks in halves, see
+            `create()`.
+
+        ## Returns
+        An `UpsertResult` with the records created, updated and unchanged,
+        and the rows that couldn't be written.
+
+        ## Raises
+        ValueError: if a row lacks a key field, several rows have the same
+            key, several existing objects match one, or a related object
+            given by slug has none.
+
+        ## Examples
+
+        ```python
+        result = nb.dcim.devices.upsert(
+            [
+                {"name": "edge1", "site": {"id": 1}, "role": 2, "device_type": 3},
+                {"name": "edge2", "site": {"id": 1}, "role": 2, "device_type": 3},
+            ],
+            key=("name", "site"),
+        )
+        result.counts
+        # {'created': 1, 'updated': 0, 'unchanged': 1, 'failed': 0}
+        ```
+        """
+        if isinstance(key, str):
+            key = (key,)
+        rows = list(rows)
+        keys = []
+        for row in rows:
+            missing = [field for field in key if field not in row]
+            if missing:
+                raise ValueError(
+                    "Key field(s) {} missing from row: {}".format(missing, row)
+                )
+            keys.append(tuple(bulk.key_value(row[field]) for field in key))
+        if len(set(keys)) < len(keys):
+            raise ValueError("Several rows have the same key {}".format(key))
+
+        existing = {}
+        if rows:
+            filters, by_slug = self._upsert_filters(key, rows, keys)
+            wanted = set(keys)
+            for values in self.filter(strict_filters=False, **filters).raw():
+                found = tuple(
+                    bulk.key_value(values.get(field), by_slug=field in by_slug)
+                    for field in key
+                )
+                if found not in wanted:
+                    continue
+                if found in existing:
+                    raise ValueError(
+                        "Several objects match key {} = {}".format(key, found)
+                    )
+                existing[found] = values
+
+        ret = bulk.UpsertResult()
+        creates, create_positions = [], []
+        updates, update_positions = [], []
+        for n, (row, found) in enumerate(zip(rows, keys)):
+            if found not in existing:
+                creates.append(row)
+                create_positions.append(n)
+                continue
+            record = self.return_obj(existing[found], self.api, self)
+            for k, v in row.items():
+                if k in key:
+                    # Already equal, and slugs can't be written.
+                    continue
+                # Compare related objects by id, as Record.serialize() does.
+                if isinstance(v, dict) and "id" in v:
+                    v = v["id"]
+                setattr(record, k, v)
+            changes = record.updates()
+            if changes:
+                changes["id"] = record.id
+                updates.append(changes)
+                update_positions.append(n)
+            else:
+                ret.unchanged.append(record)
+
+        if creates:
+            ret.add(
+                ret.created,
+                bulk.write(
+                    self.api,
+                    lambda items: self._records(self._write_request().post(items)),
+                    creates,
+                    chunk_size,
+                    max_workers,
+                    bisect,
+                ),
+                create_positions,
+            )
+        if updates:
+            ret.add(
+                ret.updated,
+                bulk.write(
+                    self.api,
+                    lambda items: self._records(self._write_request().patch(items)),
+                    updates,
+                    chunk_size,
+                    max_workers,
+                    bisect,
+                ),
+                update_positions,
+            )
+        return ret
+
+    def _upsert_filters(self, key, rows, keys):
+        """Return the lookup filters of `upsert()`.
+
+        Related objects given as a `Record`, a dict or an id are looked up
+        with the ``<field>_id`` filter, and slugs with the ``<field>``
+        filter. Whether an int is an id or a plain value is read from an
+        existing object, fetched only if needed.
+
+        ## Returns
+        The filters, and the set of key fields holding slugs.
+
+        ## Raises
+        ValueError: if a related key field mixes ids and slugs.
+        """
+        sample = None
+        filters = {}
+        by_slug = set()
+        for n, field in enumerate(key):
+            given = [row[field] for row in rows]
+            related = any(
+                isinstance(v, Record) or (isinstance(v, dict) and "id" in v)
+                for v in given
+            )
+            if not related and any(
+                isinstance(v, int) and not isinstance(v, bool) for v in given
+            ):
+                if sample is None:
+                    sample = next(iter(self.all(limit=1, offset=0).raw()), {})
+                value = sample.get(field)
+                related = isinstance(value, dict) and "id" in value
+            slugs = any(isinstance(v, str) for v in given)
+            if related and slugs:
+                raise ValueError(
+                    "Key field {} mixes ids and slugs of related objects".format(field)
+                )
+            if slugs:
+                by_slug.add(field)
+            values = list(dict.fromkeys(k[n] for k in keys))
+            filters[field + "_id" if related else field] = [
+                "null" if v is None else v for v in values
+            ]
+        return filters, by_slug
+
     def choices(self):
         """Returns all choices from the endpoint if it has them.
 
@@ -554,20 +996,25 @@ class Endpoint:
             base=self.url,
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).options()
 
-        actions = req.get("actions", {})
+        self._choices = self._parse_choices(req)
+        return self._choices
+
+    def _parse_choices(self, options):
+        """Extract the ``choices`` of each field from an OPTIONS response."""
+        actions = options.get("actions", {})
         post_data = actions.get("POST") or actions.get("PUT")
         if post_data is None:
             raise ValueError(
                 "Unexpected format in the OPTIONS response at {}".format(self.url)
             )
-        self._choices = {}
+        choices = {}
         for prop in post_data:
             if "choices" in post_data[prop]:
-                self._choices[prop] = post_data[prop]["choices"]
-
-        return self._choices
+                choices[prop] = post_data[prop]["choices"]
+        return choices
 
     def count(self, *args, **kwargs):
         """Returns the count of objects in a query.
@@ -599,16 +1046,30 @@ class Endpoint:
 
         if any(i in RESERVED_KWARGS for i in kwargs):
             raise ValueError(
-                "A reserved {} kwarg was passed. Please remove it "
-                "try again.".format(RESERVED_KWARGS)
+                "A reserved {} kwarg was passed. Please remove it try again.".format(
+                    RESERVED_KWARGS
+                )
             )
 
-        ret = Request(
-            filters=kwargs,
-            base=self.url,
-            token=self.token,
-            http_session=self.api.http_session,
-        )
+        def request(filters):
+            return Request(
+                filters=filters,
+                base=self.url,
+                token=self.token,
+                http_session=self.api.http_session,
+                json_codec=api_codec(self.api),
+            )
+
+        split = batch.split_filter(self.url, kwargs)
+        if split is not None:
+            name, chunks = split
+            ret = batch.SplitRequest(
+                [request(dict(kwargs, **{name: chunk})) for chunk in chunks],
+                max_workers=self.api.max_workers,
+                thread_pool_executor=self.api.thread_pool_executor,
+            )
+        else:
+            ret = request(kwargs)
 
         return ret.get_count()
 
@@ -628,6 +1089,7 @@ class DetailEndpoint:
             base=self.url,
             token=parent_obj.api.token,
             http_session=parent_obj.api.http_session,
+            json_codec=api_codec(parent_obj.api),
         )
 
     def list(self, **kwargs):
@@ -0,0 +1,115 @@
+"""
+Identity map for nested records.
+
+A NetBox list response repeats the same nested objects over and over: every
+device of a site carries its own copy of the site, tenant, role and device
+type. With an `IdentityMap` active, records built from those nested objects
+are shared: each object is built once per ``(model, url)``, and every later
+reference gets the same record.
+
+Shared records are read-only, and loading one with `Record.full_details()`
+(directly or through a lazy attribute lookup) upgrades it for every record
+that references it. ``copy.copy()`` returns an ordinary, editable `Record`.
+
+A map is active for:
+
+* a `RecordSet`, with `RecordSet.share_nested()`;
+* a block of code, with the `identity_map()` context manager;
+* an `Api`, when it was created with ``identity_map=True``.
+
+The map only holds weak references, so shared records are freed once no
+record references them anymore.
+"""
+
+import contextlib
+import contextvars
+import threading
+import weakref
+
+_current = contextvars.ContextVar("pynetbox_identity_map", default=None)
+
+
+class IdentityMap:
+    """Shared nested records, keyed by record class and object URL.
+
+    * **hits**: nested objects answered with an existing record.
+    * **misses**: nested records built and added to the map.
+    """
+
+    def __init__(self):
+        self._records = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, key):
+        record = self._records.get(key)
+        if record is not None:
+            self.hits += 1
+        return record
+
+    def add(self, key, record):
+        """Add ``record`` unless another thread added one first.
+
+        ## Returns
+        The record stored for ``key``.
+        """
+        with self._lock:
+            stored = self._records.setdefault(key, record)
+            if stored is record:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return stored
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+@contextlib.contextmanager
+def identity_map(imap=None):
+    """Share nested records built in the ``with`` block.
+
+    ## Parameters
+
+    * **imap** (IdentityMap, optional): Map to use, e.g. to share records
+        across several blocks. Defaults to a new map.
+
+    ## Returns
+    A context manager yielding the `IdentityMap`.
+
+    ## Examples
+
+    ```python
+    with pynetbox.identity_map():
+        devices = list(nb.dcim.devices.filter(site="site-1"))
+    devices[0].site is devices[1].site
+    # True
+    ```
+    """
+    if imap is None:
+        imap = IdentityMap()
+    token = _current.set(imap)
+    try:
+        yield imap
+    finally:
+        _current.reset(token)
+
+
+def active(api):
+    """Return the identity map in effect for records of ``api``, or None."""
+    imap = _current.get()
+    if imap is not None:
+        return imap
+    imap = getattr(api, "identity_map", None)
+    return imap if isinstance(imap, IdentityMap) else None
@@ -14,14 +14,22 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import collections
 import concurrent.futures as cf
 import io
+import itertools
+import math
 import os
-import json
+import queue
+import threading
+import time
+import urllib.parse
 import warnings
 
 from packaging import version
 
+from pynetbox.core.streaming import CHUNK_SIZE, StreamedPage
+
 # NetBox v2 token prefix (introduced in NetBox 4.5.0)
 TOKEN_PREFIX = "nbt_"
 
@@ -92,6 +100,38 @@ def calc_pages(limit, count):
     return int(count / limit) + (limit % count > 0)
 
 
+def map_ordered(executor, func, items, window, first=None):
+    """Yield ``func(item)`` for each of ``items``, in order.
+
+    Calls run on a pool made by ``executor`` with at most ``window`` of them
+    outstanding. A new call is submitted each time a result is handed to
+    the caller, so memory stays bounded to the window however many items
+    there are. ``first``, if given, is yielded once the first calls are
+    submitted.
+    """
+    items = iter(items)
+    pending = collections.deque()
+    with executor(max_workers=window) as pool:
+
+        def submit(n):
+            for item in itertools.islice(items, n):
+                pending.append(pool.submit(func, item))
+
+        try:
+            submit(window)
+            if first is not None:
+                yield first
+            while pending:
+                result = pending.popleft().result()
+                submit(1)
+                yield result
+        finally:
+            # Abandoned iteration: drop queued calls so leaving the pool
+            # only waits for the ones already running.
+            for future in pending:
+                future.cancel()
+
+
 class RequestError(Exception):
     """Basic Request Exception.
 
@@ -199,6 +239,107 @@ class ParameterValidationError(Exception):
         return self.error
 
 
+class AdaptivePageSize:
+    """Chooses the page size of list requests from observed responses.
+
+    Each page request reports its latency and payload size, and the next
+    page of the same endpoint is sized so a page takes about
+    ``target_seconds`` to fetch without exceeding ``max_bytes``. Large pages
+    amortize the per-request overhead, so endpoints with small objects
+    converge on big pages while endpoints with heavy objects (e.g. devices
+    with config contexts) use smaller ones. The size changes by at most a
+    factor of two between pages.
+
+    When NetBox returns fewer results than requested while more remain, the
+    page size was capped by its ``MAX_PAGE_SIZE`` setting; that value is
+    remembered as the upper bound for the endpoint.
+
+    State is kept per endpoint URL and is shared by every query made through
+    the same `Api`, so later queries start from the size learned earlier.
+
+    ## Parameters
+
+    * **initial** (int, optional): Page size of the first request to an
+        endpoint. Defaults to 100.
+    * **min_size** (int, optional): Smallest page size used. Defaults to 25.
+    * **max_size** (int, optional): Largest page size requested. Defaults
+        to 1000.
+    * **target_seconds** (float, optional): Page latency to aim for.
+        Defaults to 1.0.
+    * **max_bytes** (int, optional): Largest response body to aim for.
+        Defaults to 8 MiB.
+
+    ## Examples
+
+    ```python
+    nb = pynetbox.api(
+        'http://localhost:8000',
+        adaptive_page_size=pynetbox.AdaptivePageSize(max_size=5000),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        initial=100,
+        min_size=25,
+        max_size=1000,
+        target_seconds=1.0,
+        max_bytes=8 * 1024 * 1024,
+    ):
+        if not 0 < min_size <= initial <= max_size:
+            raise ValueError(
+                "page sizes must satisfy 0 < min_size <= initial <= max_size"
+            )
+        if target_seconds <= 0 or max_bytes <= 0:
+            raise ValueError("target_seconds and max_bytes must be positive")
+        self.initial = initial
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self._sizes = {}
+        self._server_max = {}
+        self._lock = threading.Lock()
+
+    def _upper(self, url):
+        return min(self.max_size, self._server_max.get(url, self.max_size))
+
+    def size(self, url):
+        """Page size to request next from ``url``."""
+        with self._lock:
+            return min(self._sizes.get(url, self.initial), self._upper(url))
+
+    def server_max(self, url):
+        """``MAX_PAGE_SIZE`` discovered for ``url``, or None if not hit yet."""
+        with self._lock:
+            return self._server_max.get(url)
+
+    def record(self, url, requested, received, elapsed, size_bytes, more):
+        """Report a fetched page and adjust the page size for ``url``.
+
+        ## Parameters
+
+        * **url** (str): Endpoint URL the page was requested from.
+        * **requested** (int): The ``limit`` sent.
+        * **received** (int): Number of results returned.
+        * **elapsed** (float): Seconds the request took.
+        * **size_bytes** (int): Size of the response body.
+        * **more** (bool): Whether the response had a ``next`` link.
+        """
+        with self._lock:
+            if more and received < requested:
+                self._server_max[url] = received
+            if not received:
+                return
+            target = received * self.target_seconds / max(elapsed, 1e-3)
+            if size_bytes:
+                target = min(target, received * self.max_bytes / size_bytes)
+            target = max(requested / 2, min(target, requested * 2))
+            upper = self._upper(url)
+            self._sizes[url] = max(min(self.min_size, upper), min(int(target), upper))
+
+
 class Request:
     """Creates requests to the Netbox API.
 
@@ -228,6 +369,12 @@ class Request:
         max_workers=4,
         expect_json=True,
         pagination="offset",
+        read_ahead=0,
+        cursor_shards=0,
+        cursor_shards_ordered=False,
+        page_size_controller=None,
+        json_codec=None,
+        streaming=False,
     ):
         """Instantiates a new Request object.
 
@@ -250,6 +397,25 @@ class Request:
             Cursor pagination (NetBox 4.6+) pages with the ``start`` parameter
             and follows ``next`` links sequentially; it omits the total count
             and is mutually exclusive with threading.
+        * **read_ahead** (int, optional): Number of list pages to request
+            in the background while the caller consumes the current one when
+            threading is disabled. ``0`` (default) fetches each page only
+            once the previous one has been consumed.
+        * **cursor_shards** (int, optional): When cursor pagination is in
+            effect and greater than 1, split the id span of the result set
+            into this many ``id`` ranges and walk their cursor chains
+            concurrently. Ignored when the filters already constrain ``id``.
+        * **cursor_shards_ordered** (bool, optional): Yield sharded results
+            in id order instead of as pages complete. Defaults to False.
+        * **page_size_controller** (AdaptivePageSize, optional): Sizes the
+            pages of sequential list requests that do not set an explicit
+            ``limit``. See `AdaptivePageSize`.
+        * **json_codec** (object, optional): Codec used to encode JSON
+            bodies and decode JSON responses instead of ``requests``' own
+            handling. See `pynetbox.core.codec`.
+        * **streaming** (bool, optional): Parse sequentially fetched list
+            pages incrementally from the response stream, yielding each
+            result as soon as it is decoded. See `StreamedPage`.
 
         ## Note
 
@@ -275,6 +441,12 @@ class Request:
         self.offset = offset
         self.expect_json = expect_json
         self.pagination = pagination
+        self.read_ahead = read_ahead
+        self.cursor_shards = cursor_shards
+        self.cursor_shards_ordered = cursor_shards_ordered
+        self.page_size_controller = page_size_controller
+        self.json_codec = json_codec
+        self.streaming = streaming
 
     def get_openapi(self):
         """Gets the OpenAPI Spec."""
@@ -296,7 +468,7 @@ class Request:
             )
 
         if req.ok:
-            return req.json()
+            return self._decode_json(req)
         else:
             raise RequestError(req)
 
@@ -340,10 +512,20 @@ class Request:
             headers=headers,
         )
         if req.ok:
-            return req.json()
+            return self._decode_json(req)
         else:
             raise RequestError(req)
 
+    def _decode_json(self, req):
+        """Decode a JSON response with the configured codec, if any.
+
+        Codecs decode straight from the body bytes, skipping the text copy
+        ``requests.Response.json()`` makes.
+        """
+        if self.json_codec is not None:
+            return self.json_codec.loads(req.content)
+        return req.json()
+
     def normalize_url(self, url):
         """Builds a url for POST actions."""
         if url[-1] != "/":
@@ -363,7 +545,9 @@ class Request:
             else:
                 headers["authorization"] = "Token {}".format(self.token)
 
-    def _make_call(self, verb="get", url_override=None, add_params=None, data=None):
+    def _make_call(
+        self, verb="get", url_override=None, add_params=None, data=None, stream=False
+    ):
         # Extract any file-like objects from data
         files = None
         # Verbs that support request bodies with file uploads
@@ -405,6 +589,18 @@ class Request:
                 data=data,
                 files=files,
             )
+        elif self.json_codec is not None and should_be_json_body:
+            # Content-Type is already set above; send the encoded bytes.
+            req = getattr(self.http_session, verb)(
+                url_override or self.url,
+                headers=headers,
+                params=params,
+                data=self.json_codec.dumps(data),
+            )
+        elif stream:
+            req = self.http_session.get(
+                url_override or self.url, headers=headers, params=params, stream=True
+            )
         else:
             req = getattr(self.http_session, verb)(
                 url_override or self.url, headers=headers, params=params, json=data
@@ -418,11 +614,24 @@ class Request:
             else:
                 raise RequestError(req)
         elif req.ok:
+            if stream:
+                try:
+                    return StreamedPage(
+                        req.iter_content(CHUNK_SIZE), close=req.close, response=req
+                    )
+                except ValueError:
+                    raise ContentError(req)
+            if self.page_size_controller is not None:
+                # Payload size feeds the adaptive page size. (Streamed pages
+                # returned above are never adaptively sized.)
+                self._last_response_size = len(req.content)
             # Parse response based on expected type
             if self.expect_json:
                 try:
-                    return req.json()
-                except json.JSONDecodeError:
+                    return self._decode_json(req)
+                except ValueError:
+                    # json.JSONDecodeError and the codecs' decode errors are
+                    # all ValueErrors.
                     raise ContentError(req)
             else:
                 # Return raw text for non-JSON responses
@@ -431,17 +640,242 @@ class Request:
             raise RequestError(req)
 
     def concurrent_get(self, ret, page_size, page_offsets):
-        futures_to_results = []
-        with self.thread_pool_executor(max_workers=self.max_workers) as pool:
-            for offset in page_offsets:
-                new_params = {"offset": offset, "limit": page_size}
-                futures_to_results.append(
-                    pool.submit(self._make_call, add_params=new_params)
-                )
+        """Fetch the pages at ``page_offsets`` concurrently into ``ret``.
+
+        Results are appended in offset order. `get()` streams pages through
+        `_iter_pages` instead; this is kept for callers that want a list.
+        """
+        for page in self._iter_pages(page_size, page_offsets, self.max_workers):
+            ret.extend(page["results"])
+
+    def _iter_pages(self, page_size, page_offsets, window, first_page=None):
+        """Yield the pages at ``page_offsets``, preceded by ``first_page``.
+
+        Pages are fetched on a thread pool while earlier ones are being
+        consumed, with at most ``window`` requests outstanding, and are
+        yielded in offset order (see `map_ordered`). ``first_page``, if
+        given, is yielded once the first requests are on the wire.
+        """
+        return map_ordered(
+            self.thread_pool_executor,
+            lambda offset: self._make_call(
+                add_params={"offset": offset, "limit": page_size}
+            ),
+            page_offsets,
+            window,
+            first=first_page,
+        )
+
+    def _iter_next_links(self, first_page):
+        """Yield ``first_page`` and every page reachable by its ``next`` links.
+
+        Each page's ``next`` link is requested in the background before the
+        page is handed to the caller, so fetching page N+1 overlaps with the
+        caller consuming page N. Used for cursor pagination, where page
+        boundaries cannot be computed up front.
+        """
+        page = first_page
+        with self.thread_pool_executor(max_workers=1) as pool:
+            future = None
+            try:
+                while True:
+                    future = (
+                        pool.submit(self._make_call, url_override=page["next"])
+                        if page.get("next")
+                        else None
+                    )
+                    yield page
+                    if future is None:
+                        break
+                    page = future.result()
+            finally:
+                if future is not None:
+                    future.cancel()
+
+    def _filters_on_id(self):
+        """Whether the caller's filters already constrain the ``id`` field."""
+        return any(
+            key == "id" or key.startswith("id__") for key in (self.filters or {})
+        )
+
+    def _shard_ranges(self):
+        """Probe the id span of the query and split it into shard ranges.
 
-            for future in cf.as_completed(futures_to_results):
-                result = future.result()
-                ret.extend(result["results"])
+        Makes two ``limit=1`` requests ordered by ascending and descending
+        ``id``. The first one also provides the total count.
+
+        ## Returns
+        List of ``(start, stop)`` tuples covering ``[min_id, max_id]``,
+        with ``stop`` exclusive. Empty if the query matches nothing.
+        """
+        first = self._make_call(add_params={"limit": 1, "ordering": "id", "brief": 1})
+        self.count = first["count"]
+        if not first["results"]:
+            return []
+        last = self._make_call(add_params={"limit": 1, "ordering": "-id", "brief": 1})
+        min_id = first["results"][0]["id"]
+        max_id = last["results"][0]["id"]
+        span = max_id - min_id + 1
+        step = math.ceil(span / min(self.cursor_shards, span))
+        return [
+            (start, min(start + step, max_id + 1))
+            for start in range(min_id, max_id + 1, step)
+        ]
+
+    def _walk_shard(self, start, stop, results, cancelled):
+        """Follow the cursor chain of one id range, putting pages on ``results``.
+
+        Runs on a worker thread. Every item put on the queue is a
+        ``(page, error)`` tuple; the walk ends with ``(None, error)``, where
+        ``error`` is the exception that stopped it, if any.
+        """
+
+        def put(item):
+            # The queue is bounded; keep checking for cancellation so an
+            # abandoned iteration doesn't leave the worker blocked forever.
+            while not cancelled.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        error = None
+        try:
+            req = self._make_call(
+                add_params={"limit": self.limit or 0, "start": start, "id__lt": stop}
+            )
+            while put((req["results"], None)) and req.get("next"):
+                req = self._make_call(url_override=req["next"])
+        except Exception as exc:
+            error = exc
+        put((None, error))
+
+    def _get_sharded(self):
+        """Yield the results of a cursor query walked as concurrent id ranges.
+
+        Each shard runs on its own worker and hands pages over through a
+        bounded queue, so memory stays proportional to the number of shards.
+        Unordered, pages are yielded as they complete. Ordered, the shards
+        are drained one after another; later shards can then only run a few
+        pages ahead of the one being consumed.
+        """
+        ranges = self._shard_ranges()
+        if not ranges:
+            return
+        cancelled = threading.Event()
+        if self.cursor_shards_ordered:
+            sources = [(queue.Queue(maxsize=2), 1) for _ in ranges]
+            shard_queues = [q for q, _ in sources]
+        else:
+            shared = queue.Queue(maxsize=len(ranges))
+            sources = [(shared, len(ranges))]
+            shard_queues = [shared] * len(ranges)
+
+        with self.thread_pool_executor(max_workers=len(ranges)) as pool:
+            try:
+                for (start, stop), results in zip(ranges, shard_queues):
+                    pool.submit(self._walk_shard, start, stop, results, cancelled)
+                for results, pending in sources:
+                    while pending:
+                        page, error = results.get()
+                        if error is not None:
+                            raise error
+                        if page is None:
+                            pending -= 1
+                            continue
+                        yield from page
+            finally:
+                cancelled.set()
+
+    def _get_adaptive(self, use_cursor):
+        """Yield list results, sizing each page with the page size controller.
+
+        Pages are requested by explicit ``offset`` (or cursor ``start``)
+        rather than by following ``next`` links, so every page can use a
+        different ``limit``.
+        """
+        controller = self.page_size_controller
+        params = {"start": 0} if use_cursor else {"offset": 0}
+        fetched = 0
+        first = True
+        while True:
+            limit = controller.size(self.url)
+            started = time.perf_counter()
+            req = self._make_call(add_params=dict(params, limit=limit))
+            elapsed = time.perf_counter() - started
+            if not isinstance(req, dict) or req.get("results") is None:
+                # Not a paginated list view; nothing to adapt.
+                self.count = len(req)
+                yield from req if isinstance(req, list) else [req]
+                return
+            if first:
+                self.count = req["count"]
+                first = False
+            results = req["results"]
+            controller.record(
+                self.url,
+                limit,
+                len(results),
+                elapsed,
+                getattr(self, "_last_response_size", 0),
+                bool(req.get("next")),
+            )
+            yield from results
+            if not req.get("next") or not results:
+                return
+            if use_cursor:
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(req["next"]).query)
+                params = {"start": query["start"][0]}
+            else:
+                fetched += len(results)
+                params = {"offset": fetched}
+
+    def _stream_results(self, page):
+        """Yield the results of a `StreamedPage`, reporting bad JSON as ContentError."""
+        try:
+            yield from page.results()
+        except ValueError:
+            raise ContentError(page.response)
+
+    def _get_streamed(self, add_params, use_cursor):
+        """Yield list results, decoding each page incrementally as it arrives.
+
+        Follows the same pagination as the sequential paths of `get()`, but
+        requests every page with ``stream=True`` so that only the record
+        being decoded, not the whole page, is held in memory.
+        """
+        page = self._make_call(add_params=add_params, stream=True)
+        if not page.paginated:
+            if page.is_list:
+                results = list(self._stream_results(page))
+                self.count = len(results)
+                yield from results
+            else:
+                self.count = len(page.meta)
+                yield page.meta
+            return
+        # NetBox sends count and next ahead of the results, so they are known
+        # before the first record is yielded.
+        self.count = page.meta.get("count")
+        first_run = True
+        while True:
+            yield from self._stream_results(page)
+            next_url = page.meta.get("next")
+            if not next_url or self.offset is not None:
+                return
+            if first_run and not use_cursor:
+                page = self._make_call(
+                    add_params={
+                        "limit": self.limit or page.meta["count"],
+                        "offset": page.received,
+                    },
+                    stream=True,
+                )
+            else:
+                page = self._make_call(url_override=next_url, stream=True)
+            first_run = False
 
     def _resolve_pagination(self):
         """Resolve the configured pagination strategy.
@@ -493,6 +927,22 @@ class Request:
                 stacklevel=3,
             )
 
+        if use_cursor and self.cursor_shards > 1 and not self._filters_on_id():
+            yield from self._get_sharded()
+            return
+
+        if (
+            self.page_size_controller is not None
+            and self.limit == 0
+            and self.offset is None
+            and add_params is None
+            and not self.threading
+            and not self.read_ahead
+        ):
+            yield from self._get_adaptive(use_cursor)
+            return
+
+        list_request = add_params is None
         if not add_params and self.limit is not None:
             add_params = {"limit": self.limit}
             if use_cursor:
@@ -502,12 +952,23 @@ class Request:
             elif self.limit and self.offset is not None:
                 # if non-zero limit and some offset -> add offset
                 add_params["offset"] = self.offset
+        if (
+            self.streaming
+            and list_request
+            and not self.threading
+            and not self.read_ahead
+        ):
+            yield from self._get_streamed(add_params, use_cursor)
+            return
         req = self._make_call(add_params=add_params)
         if isinstance(req, dict) and req.get("results") is not None:
             # In cursor mode NetBox omits the count (returns null); it is
             # fetched lazily by get_count() if len() is requested.
             self.count = req["count"]
-            if use_cursor:
+            if use_cursor and self.read_ahead:
+                for page in self._iter_next_links(req):
+                    yield from page["results"]
+            elif use_cursor:
                 # Sequentially follow next links; each link carries the
                 # next 'start' cursor (last pk + 1) computed by the server.
                 yield from req["results"]
@@ -519,20 +980,32 @@ class Request:
                 for i in req["results"]:
                     yield i
             elif self.threading:
-                ret = req["results"]
-                if req.get("next"):
-                    page_size = len(req["results"])
-                    pages = calc_pages(page_size, req["count"])
-                    page_offsets = [
-                        increment * page_size for increment in range(1, pages)
-                    ]
-                    if pages == 1:
-                        req = self._make_call(url_override=req.get("next"))
-                        ret.extend(req["results"])
-                    else:
-                        self.concurrent_get(ret, page_size, page_offsets)
-                for i in ret:
-                    yield i
+                if not req.get("next"):
+                    yield from req["results"]
+                    return
+                page_size = len(req["results"])
+                pages = calc_pages(page_size, req["count"])
+                page_offsets = [increment * page_size for increment in range(1, pages)]
+                if pages == 1:
+                    yield from req["results"]
+                    req = self._make_call(url_override=req.get("next"))
+                    yield from req["results"]
+                    return
+                # Stream pages in order through a sliding window of
+                # max_workers outstanding requests rather than collecting the
+                # whole result set before yielding the first record.
+                for page in self._iter_pages(
+                    page_size, page_offsets, self.max_workers, first_page=req
+                ):
+                    yield from page["results"]
+            elif self.read_ahead and req.get("next"):
+                page_size = len(req["results"])
+                pages = calc_pages(page_size, req["count"])
+                page_offsets = [increment * page_size for increment in range(1, pages)]
+                for page in self._iter_pages(
+                    page_size, page_offsets, self.read_ahead, first_page=req
+                ):
+                    yield from page["results"]
             else:
                 first_run = True
                 for i in req["results"]:
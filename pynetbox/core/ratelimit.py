@@ -0,0 +1,156 @@
+"""
+Client-side rate limiting.
+
+`RateLimiter` spaces out the HTTP requests made by an `Api` with token
+buckets, so that threaded queries and several jobs sharing one client stay
+within the request rate the NetBox server can handle.
+"""
+
+import threading
+import time
+import urllib.parse
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens are added at ``rate`` per second, up to ``burst``. Each request
+    takes one token, waiting for it if the bucket is empty. Waiting requests
+    are served in the order they arrived.
+
+    ## Parameters
+
+    * **rate** (float): Tokens added per second.
+    * **burst** (int, optional): Bucket capacity, i.e. the number of
+        requests that can be made at once after a quiet period. Defaults to
+        ``rate`` (rounded up), and at least 1.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be a positive number")
+        if burst is None:
+            burst = max(1, -int(-rate // 1))
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def __getstate__(self):
+        return {"rate": self.rate, "burst": self.burst}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return "<TokenBucket rate={} burst={}>".format(self.rate, self.burst)
+
+    def reserve(self):
+        """Take a token and return how long to wait before using it.
+
+        The token may be borrowed from the future, in which case the bucket
+        goes negative and later callers wait behind this one.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Token-bucket rate limiter for the requests made to NetBox.
+
+    Every request takes a token from the global bucket, if ``rate`` is set,
+    and from each matching budget in ``budgets``. A budget is keyed by:
+
+    * an HTTP verb, e.g. ``"POST"``;
+    * an endpoint path relative to the API root, e.g. ``"dcim/interfaces"``,
+      which matches the endpoint and its detail URLs;
+    * or both, separated by a space, e.g. ``"PATCH dcim/interfaces"``.
+
+    Capping a bulk job's endpoint or verb below the global rate leaves the
+    rest of the global budget to other callers of the same `Api`.
+
+    ## Parameters
+
+    * **rate** (float, optional): Requests per second across all requests.
+        Defaults to None (no global limit).
+    * **burst** (int, optional): Capacity of the global bucket. Defaults to
+        ``rate``.
+    * **budgets** (dict, optional): Maps budget keys to a rate or a
+        ``(rate, burst)`` tuple.
+
+    ## Examples
+
+    ```python
+    limiter = RateLimiter(
+        rate=20,
+        budgets={"dcim/interfaces": 5, "POST": (2, 10)},
+    )
+    nb = pynetbox.api(url, token=token, rate_limit=limiter)
+    ```
+    """
+
+    def __init__(self, rate=None, burst=None, budgets=None):
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.budgets = {}
+        for key, budget in (budgets or {}).items():
+            if isinstance(budget, (tuple, list)):
+                bucket = TokenBucket(*budget)
+            else:
+                bucket = TokenBucket(budget)
+            self.budgets[self._parse_key(key)] = bucket
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited = 0.0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_key(key):
+        """Split a budget key into an upper-case verb and a path segment."""
+        verb, _, path = key.strip().partition(" ")
+        if not path and not verb.isupper():
+            verb, path = "", verb
+        path = path.strip().strip("/")
+        return verb.upper() or None, "/{}/".format(path) if path else None
+
+    def _buckets(self, method, url):
+        path = urllib.parse.urlsplit(url).path
+        if not path.endswith("/"):
+            path += "/"
+        if self.bucket is not None:
+            yield self.bucket
+        for (verb, segment), bucket in self.budgets.items():
+            if verb is not None and verb != method:
+                continue
+            if segment is not None and "/api" + segment not in path:
+                continue
+            yield bucket
+
+    def acquire(self, method, url):
+        """Block until a request may be sent to ``url`` with ``method``."""
+        wait = 0.0
+        for bucket in self._buckets(method.upper(), url):
+            wait = max(wait, bucket.reserve())
+        if wait > 0:
+            with self._lock:
+                self.throttled += 1
+                self.waited += wait
+            time.sleep(wait)
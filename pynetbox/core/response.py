@@ -14,10 +14,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import collections
+import contextlib
 import copy
+import threading
 from urllib.parse import urlsplit
 
 import pynetbox.core.app
+from pynetbox.core import batch, columnar, identity
+from pynetbox.core.codec import api_codec
 from pynetbox.core.query import Request
 from pynetbox.core.util import Hashabledict
 
@@ -63,6 +68,17 @@ def get_return(lookup, return_fields=None):
         return lookup
 
 
+def _lookup(values, path):
+    """Return the value at dotted ``path`` in a response dict, or None."""
+    if path in values:
+        return values[path]
+    for key in path.split("."):
+        if not isinstance(values, dict):
+            return None
+        values = values.get(key)
+    return values
+
+
 def flatten_custom(custom_dict):
     ret = {}
 
@@ -79,6 +95,24 @@ def flatten_custom(custom_dict):
     return ret
 
 
+class _Unparsed:
+    """Placeholder in `Record._init_cache` for fields not parsed yet.
+
+    A single instance, kept by copies and pickles of records.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "_UNPARSED"
+
+    def __repr__(self):
+        return "<unparsed>"
+
+
+_UNPARSED = _Unparsed()
+
+
 class JsonField:
     """Explicit field type for values that are not to be converted
     to a Record object."""
@@ -116,23 +150,362 @@ class RecordSet:
     ```
     """
 
-    def __init__(self, endpoint, request, **kwargs):
+    def __init__(self, endpoint, request, partial=None, **kwargs):
         self.endpoint = endpoint
         self.request = request
         self.response = self.request.get()
         self._response_cache = []
+        # Policy for fields missing from records fetched with `fields` or
+        # `omit`, see `Record`. None for complete records.
+        self._partial = partial
+        self._table = None
+        self._identity = None
+        # (relations, batch_size) set by prefetch(), and the records of the
+        # current batch.
+        self._prefetch = None
+        self._batch = collections.deque()
+        if getattr(endpoint, "compact_records", False) is True:
+            self.compact()
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        if self._prefetch is None:
+            return self._build(self._next_values())
+        if not self._batch:
+            relations, batch_size = self._prefetch
+            records = []
+            while batch_size is None or len(records) < batch_size:
+                try:
+                    records.append(self._build(self._next_values()))
+                except StopIteration:
+                    break
+            if not records:
+                raise StopIteration
+            batch.prefetch(records, *relations)
+            self._batch.extend(records)
+        return self._batch.popleft()
+
+    def _next_values(self):
         if self._response_cache:
-            return self.endpoint.return_obj(
-                self._response_cache.pop(), self.endpoint.api, self.endpoint
-            )
-        return self.endpoint.return_obj(
-            next(self.response), self.endpoint.api, self.endpoint
+            return self._response_cache.pop()
+        return next(self.response)
+
+    def _build(self, values):
+        if self._table is not None:
+            return self._table.pack(values)
+        if self._identity is not None:
+            with identity.identity_map(self._identity):
+                record = self.endpoint.return_obj(
+                    values, self.endpoint.api, self.endpoint
+                )
+        else:
+            record = self.endpoint.return_obj(values, self.endpoint.api, self.endpoint)
+        if self._partial is not None:
+            record._partial = self._partial
+        return record
+
+    def raw(self):
+        """Iterate over the results as plain dicts.
+
+        Yields the objects as decoded from the response, without building
+        `Record`s, which makes it the fastest way to read a result set.
+
+        ## Returns
+        A generator of dicts.
+
+        ## Examples
+
+        ```python
+        for device in nb.dcim.devices.filter(site="site-1").raw():
+            print(device["name"], device["site"]["slug"])
+        ```
+        """
+        # Not ``yield from self.response``: closing this generator, e.g.
+        # when it is dropped partway, would close the response too.
+        while True:
+            try:
+                values = self._next_values()
+            except StopIteration:
+                return
+            yield values
+
+    def values(self, *fields):
+        """Iterate over the results as dicts holding only ``fields``.
+
+        Like `raw()`, no `Record`s are built. A field of a nested object is
+        selected with a dotted path (``"site.name"``), and is None when
+        missing. Combine with the ``fields`` argument of `Endpoint.filter()`
+        to also avoid downloading the other fields.
+
+        ## Parameters
+
+        * **fields** (str): Fields to include. All fields if none are given.
+
+        ## Returns
+        A generator of dicts.
+
+        ## Examples
+
+        ```python
+        list(nb.dcim.devices.all().values("id", "name", "site.slug"))
+        # [{'id': 1, 'name': 'test1-leaf1', 'site.slug': 'site-1'}, ...]
+        ```
+        """
+        if not fields:
+            yield from self.raw()
+            return
+        for values in self.raw():
+            yield {f: _lookup(values, f) for f in fields}
+
+    def values_list(self, *fields, flat=False):
+        """Iterate over the results as tuples of ``fields``.
+
+        Like `values()`, but yields tuples in the order of ``fields``, or
+        single values with ``flat=True``.
+
+        ## Parameters
+
+        * **fields** (str): Fields to include, dotted for nested objects.
+            All fields if none are given.
+        * **flat** (bool, optional): Yield the value of the single field
+            instead of one-item tuples. Defaults to False.
+
+        ## Returns
+        A generator of tuples, or of values when ``flat`` is True.
+
+        ## Raises
+        TypeError if ``flat`` is True and not exactly one field is given.
+
+        ## Examples
+
+        ```python
+        names = set(nb.dcim.devices.all().values_list("name", flat=True))
+        dict(nb.dcim.devices.all().values_list("name", "primary_ip4.address"))
+        ```
+        """
+        if flat and len(fields) != 1:
+            raise TypeError("flat=True requires exactly one field")
+        if flat:
+            field = fields[0]
+            for values in self.raw():
+                yield _lookup(values, field)
+        elif not fields:
+            for values in self.raw():
+                yield tuple(values.values())
+        else:
+            for values in self.raw():
+                yield tuple(_lookup(values, f) for f in fields)
+
+    def compact(self):
+        """Return `CompactRecord`s instead of `Record`s.
+
+        Compact records use a fraction of the memory of `Record`s but are
+        read-only, see `CompactRecord`. Call it before iterating.
+
+        ## Returns
+        The RecordSet itself.
+
+        ## Examples
+
+        ```python
+        ips = list(nb.ipam.ip_addresses.all().compact())
+        ```
+        """
+        self._table = self.endpoint._field_table()
+        return self
+
+    def fetch_details(self, chunk_size=batch.CHUNK_SIZE, max_workers=None):
+        """Return the results with their full details loaded.
+
+        Reads the remaining results and loads their detail views with a few
+        list requests filtered on ``id``, sent concurrently, instead of one
+        request per record on first access to a missing field. See
+        `pynetbox.batch_details()`.
+
+        ## Parameters
+
+        * **chunk_size** (int, optional): IDs per request. Defaults to 100.
+        * **max_workers** (int, optional): Requests sent concurrently.
+            Defaults to the `Api`'s ``max_workers``.
+
+        ## Returns
+        A list of the records.
+
+        ## Raises
+        ValueError: if the results are `CompactRecord`s, which are
+            read-only.
+
+        ## Examples
+
+        ```python
+        devices = nb.dcim.devices.filter(site="site-1", fields=["name"]).fetch_details()
+        [d.serial for d in devices]
+        ```
+        """
+        if self._table is not None:
+            raise ValueError("fetch_details() can't load read-only CompactRecords")
+        records = list(self)
+        batch.batch_details(records, chunk_size=chunk_size, max_workers=max_workers)
+        return records
+
+    def prefetch(self, *relations, batch_size=None):
+        """Load the nested objects ``relations`` of the results in bulk.
+
+        Reading a field of a nested object that isn't part of the nested
+        representation (``device.device_type.u_height``) loads the object,
+        one request per object. With prefetch, the nested objects are
+        collected across the results and loaded with a few list requests
+        filtered on ``id``, sent concurrently, before the records are
+        returned. See `pynetbox.batch_details()`.
+
+        ## Parameters
+
+        * **relations** (str): Nested object (or list) fields to load.
+            Nested objects of nested objects are given as dotted paths, e.g.
+            ``"device_type.manufacturer"``.
+        * **batch_size** (int, optional): Number of results read and
+            prefetched at a time. Defaults to all of them, which fetches
+            each related object once; pass e.g. the page size to keep
+            memory bounded while iterating.
+
+        ## Returns
+        The RecordSet itself.
+
+        ## Examples
+
+        ```python
+        devices = nb.dcim.devices.filter(site="site-1").prefetch(
+            "device_type", "primary_ip4"
+        )
+        for device in devices:
+            print(device.device_type.u_height, device.primary_ip4.dns_name)
+        ```
+
+        Prefetching 1,000 results at a time:
+
+        ```python
+        for interface in nb.dcim.interfaces.all().prefetch("device", batch_size=1000):
+            print(interface.device.serial)
+        ```
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self._prefetch = (relations, batch_size)
+        return self
+
+    def share_nested(self, imap=None):
+        """Share the nested records of the results.
+
+        Nested objects that appear in several results (the site, role or
+        tenant of devices) become a single read-only record, see
+        `pynetbox.core.identity`. Call it before iterating.
+
+        ## Parameters
+
+        * **imap** (IdentityMap, optional): Map to share records through,
+            e.g. across several queries. Defaults to a new map.
+
+        ## Returns
+        The RecordSet itself.
+
+        ## Examples
+
+        ```python
+        devices = list(nb.dcim.devices.filter(site="site-1").share_nested())
+        devices[0].site is devices[1].site
+        # True
+        ```
+        """
+        self._identity = imap if imap is not None else identity.IdentityMap()
+        return self
+
+    def _columns(self, columns):
+        limit = getattr(self.request, "limit", None)
+        chunk_rows = (
+            limit if isinstance(limit, int) and limit > 0 else columnar.CHUNK_ROWS
         )
+        return columnar.Columns(columns).fill(self.raw(), chunk_rows=chunk_rows)
+
+    def to_arrow(self, columns=None):
+        """Return the results as a ``pyarrow.Table``.
+
+        The table is built from the decoded pages without creating
+        `Record`s. Nested objects are flattened into dotted columns
+        (``site.id``, ``site.name``) and the ``value`` of choice fields
+        (``status.value``) is dictionary encoded. Requires ``pyarrow``.
+
+        ## Parameters
+
+        * **columns** (list, optional): Columns to include, as dotted names.
+            The name of a nested object (``"site"``) includes all of its
+            columns. Defaults to all columns.
+
+        ## Returns
+        A ``pyarrow.Table``.
+
+        ## Raises
+        ImportError if ``pyarrow`` is not installed.
+
+        ## Examples
+
+        ```python
+        table = nb.dcim.devices.all().to_arrow(["id", "name", "site.slug", "status"])
+        ```
+        """
+        return columnar.to_arrow(self._columns(columns))
+
+    def to_pandas(self, columns=None):
+        """Return the results as a ``pandas.DataFrame``.
+
+        Like `to_arrow()`, with choice field values as categorical columns.
+        Requires ``pandas``.
+
+        ## Parameters
+
+        * **columns** (list, optional): Columns to include, as dotted names.
+            Defaults to all columns.
+
+        ## Returns
+        A ``pandas.DataFrame``.
+
+        ## Raises
+        ImportError if ``pandas`` is not installed.
+
+        ## Examples
+
+        ```python
+        df = nb.dcim.interfaces.filter(site="site-1").to_pandas()
+        df.groupby("type.value").size()
+        ```
+        """
+        return columnar.to_pandas(self._columns(columns))
+
+    def to_numpy(self, columns=None):
+        """Return the results as a dict of NumPy arrays, one per column.
+
+        Columns are named and selected as in `to_arrow()`. Columns with
+        missing values are object arrays. Requires ``numpy``.
+
+        ## Parameters
+
+        * **columns** (list, optional): Columns to include, as dotted names.
+            Defaults to all columns.
+
+        ## Returns
+        A dict of column name to ``numpy.ndarray``.
+
+        ## Raises
+        ImportError if ``numpy`` is not installed.
+
+        ## Examples
+
+        ```python
+        arrays = nb.ipam.prefixes.all().to_numpy(["id", "vlan.vid"])
+        ```
+        """
+        return columnar.to_numpy(self._columns(columns))
 
     def __len__(self):
         try:
@@ -199,6 +572,29 @@ class RecordSet:
         return self.endpoint.delete(self)
 
 
+class RecordMap(dict):
+    """Dict of ID to Record returned by `Endpoint.get_many()`.
+
+    The requested IDs that don't exist, or that the token may not read, are
+    listed in ``missing`` instead of being dropped silently.
+
+    ## Examples
+
+    ```python
+    devices = nb.dcim.devices.get_many(ids)
+    if devices.missing:
+        print("not found:", devices.missing)
+    ```
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.missing = []
+
+    def __repr__(self):
+        return "<RecordMap {} found, {} missing>".format(len(self), len(self.missing))
+
+
 class Record:
     """Create Python objects from NetBox API responses.
 
@@ -301,9 +697,22 @@ class Record:
     # ('name', 'test1-switch1')
     # ('display_name', 'test1-switch1')
     ```
+
+    Records fetched with ``fields`` or ``omit`` only hold part of the
+    object. Accessing a field that was not fetched raises AttributeError,
+    or fetches the full object when `Api` was created with
+    ``partial_records="fetch"``:
+
+    ```python
+    x = nb.dcim.devices.get(1, fields=["name"])
+    x.serial
+    # AttributeError: 'serial' was not fetched ...
+    ```
     """
 
     url = None
+    # "raise" or "fetch" on records fetched with `fields`/`omit`, else None.
+    _partial = None
 
     # Internal Record metadata that should not be serialized for API updates.
     # These are object bookkeeping attributes, not NetBox API fields.
@@ -335,7 +744,8 @@ class Record:
         """Default behavior for missing attrs.
 
         We'll call `full_details()` if we're asked for an attribute
-        we don't have.
+        we don't have, unless the record was fetched with `fields` or
+        `omit`, in which case its partial policy applies.
 
         In order to prevent non-explicit behavior,`k='keys'` is
         excluded because casting to dict() calls this attr.
@@ -349,6 +759,21 @@ class Record:
         if k.startswith("__") and k.endswith("__"):
             raise AttributeError('object has no attribute "{}"'.format(k))
 
+        lazy = self.__dict__.get("_lazy")
+        if lazy and k in lazy:
+            self._materialize(k)
+            return self.__dict__[k]
+
+        if self._partial is not None and k != "keys":
+            if self._partial == "fetch" and self.full_details():
+                self._partial = None
+                return getattr(self, k)
+            raise AttributeError(
+                "'{}' was not fetched: this record was requested with "
+                "`fields` or `omit`. Include it in the query, or call "
+                "full_details() to load the whole object.".format(k)
+            )
+
         if self.url:
             if self.has_details is False and k != "keys":
                 if self.full_details():
@@ -385,7 +810,13 @@ class Record:
         return str(self)
 
     def __getstate__(self):
-        return self.__dict__
+        state = dict(self.__dict__)
+        # Copies parse their deferred fields on their own.
+        if "_lazy" in state:
+            state["_lazy"] = dict(state["_lazy"])
+        if "_init_cache" in state:
+            state["_init_cache"] = list(state["_init_cache"])
+        return state
 
     def __setstate__(self, d):
         self.__dict__.update(d)
@@ -462,127 +893,196 @@ class Record:
 
         Parses values dict at init and sets object attributes with the
         values within.
-        """
 
-        def generic_list_parser(key_name, list_item):
-            from pynetbox.models.mapper import CONTENT_TYPE_MAPPER
+        When the Api was created with ``lazy_records=True``, dict values and
+        lists of dicts are kept as they are and only parsed by
+        `_materialize()` when the attribute is first read.
+        """
+        lazy = getattr(self.api, "lazy_records", False) is True
+        if lazy:
+            # Deferred nested objects are shared through the identity map
+            # active now, not the one active when they are read.
+            imap = identity.active(self.api)
+            if imap is not None:
+                self._identity = imap
+        for k, v in values.items():
+            if lazy and (
+                isinstance(v, dict)
+                or (isinstance(v, list) and len(v) and isinstance(v[0], dict))
+            ):
+                self._defer(k, values)
+                continue
+            v, to_cache = self._parse_value(k, v, values)
+            self._add_cache((k, to_cache))
+            setattr(self, k, v)
 
-            content_type_mapper = getattr(
-                self.api, "_content_type_mapper", CONTENT_TYPE_MAPPER
-            )
+    def _parse_value(self, k, v, values):
+        """Parse the value of field ``k`` from the ``values`` dict.
 
-            if (
-                isinstance(list_item, dict)
-                and "object_type" in list_item
-                and "object" in list_item
+        ## Returns
+        A ``(value, to_cache)`` tuple: the attribute value and what is
+        recorded for it in the initial state.
+        """
+        if isinstance(v, dict):
+            lookup = getattr(self.__class__, k, None)
+            if k in ["custom_fields", "local_context_data"] or hasattr(
+                lookup, "_json_field"
             ):
-                lookup = list_item["object_type"]
-                if model := content_type_mapper.get(lookup, None):
-                    record = model(list_item["object"], self.api, self.endpoint)
-                    return GenericListObject(record)
-
-            return list_item
-
-        def list_parser(key_name, list_item):
-            if isinstance(list_item, dict):
-                lookup = getattr(self.__class__, key_name, None)
-                if not isinstance(lookup, list):
-                    # This is *list_parser*, so if the custom model field is not
-                    # a list (or is not defined), just return the default model
-                    return self.default_ret(list_item, self.api, self.endpoint)
-                else:
-                    model = lookup[0]
-                    return model(list_item, self.api, self.endpoint)
+                return v, copy.deepcopy(v)
+            if isinstance(lookup, type) and issubclass(lookup, Record):
+                v = self._nested(lookup, v)
+            else:
+                v = self._nested(self.default_ret, v)
+            return v, v
+
+        if isinstance(v, list):
+            lookup = getattr(self.__class__, k, None)
+            # An explicit JsonField marker means the column is raw JSON
+            # (e.g. a plugin field holding a list of dicts). Keep it as-is
+            # instead of coercing each dict into a nested Record, which
+            # would break serialize()/save() (no id on plain JSON dicts).
+            if hasattr(lookup, "_json_field"):
+                return v, copy.deepcopy(v)
+            # check if GFK
+            if len(v) and isinstance(v[0], dict) and "object_type" in v[0]:
+                v = [self._parse_generic_list_item(i) for i in v]
+                # An unmapped object_type (e.g. a plugin whose extension
+                # hasn't been registered) falls through as the raw dict,
+                # so cache it directly instead of assuming .serialize().
+                to_cache = [
+                    i.serialize() if hasattr(i, "serialize") else copy.deepcopy(i)
+                    for i in v
+                ]
+            elif k == "constraints":
+                # Permissions constraints can be either dict or list
+                to_cache = copy.deepcopy(v)
+            elif (
+                k in SIBLING_TYPED_LIST_FIELDS
+                and len(v)
+                and isinstance(v[0], dict)
+                and isinstance(values.get(f"{k}_type"), str)
+            ):
+                # NetBox cable-termination pattern: link_peers/
+                # connected_endpoints carry their item type in the sibling
+                # link_peers_type/connected_endpoints_type field rather
+                # than per-item. Cast each item to the model named by
+                # that sibling content type.
+                v = [
+                    self._parse_sibling_typed_list_item(i, values[f"{k}_type"])
+                    for i in v
+                ]
+                to_cache = list(v)
+            else:
+                v = [self._parse_list_item(k, i) for i in v]
+                to_cache = list(v)
+            return v, to_cache
 
-            return list_item
+        return v, v
 
-        def sibling_typed_list_parser(list_item, content_type):
-            from pynetbox.models.mapper import CONTENT_TYPE_MAPPER
+    def _parse_generic_list_item(self, list_item):
+        from pynetbox.models.mapper import CONTENT_TYPE_MAPPER
 
-            content_type_mapper = getattr(
-                self.api, "_content_type_mapper", CONTENT_TYPE_MAPPER
-            )
+        content_type_mapper = getattr(
+            self.api, "_content_type_mapper", CONTENT_TYPE_MAPPER
+        )
 
-            if isinstance(list_item, dict):
-                if model := content_type_mapper.get(content_type, None):
-                    return model(list_item, self.api, self.endpoint)
-                return self.default_ret(list_item, self.api, self.endpoint)
-            return list_item
+        if (
+            isinstance(list_item, dict)
+            and "object_type" in list_item
+            and "object" in list_item
+        ):
+            lookup = list_item["object_type"]
+            if model := content_type_mapper.get(lookup, None):
+                record = self._nested(model, list_item["object"])
+                return GenericListObject(record)
+
+        return list_item
+
+    def _parse_list_item(self, key_name, list_item):
+        if isinstance(list_item, dict):
+            lookup = getattr(self.__class__, key_name, None)
+            if not isinstance(lookup, list):
+                # This is *list_parser*, so if the custom model field is not
+                # a list (or is not defined), just return the default model
+                return self._nested(self.default_ret, list_item)
+            else:
+                model = lookup[0]
+                return self._nested(model, list_item)
 
-        for k, v in values.items():
-            if isinstance(v, dict):
-                lookup = getattr(self.__class__, k, None)
-                if k in ["custom_fields", "local_context_data"] or hasattr(
-                    lookup, "_json_field"
-                ):
-                    self._add_cache((k, copy.deepcopy(v)))
-                    setattr(self, k, v)
-                    continue
-                if isinstance(lookup, type) and issubclass(lookup, Record):
-                    v = lookup(v, self.api, self.endpoint)
-                else:
-                    v = self.default_ret(v, self.api, self.endpoint)
-                self._add_cache((k, v))
+        return list_item
 
-            elif isinstance(v, list):
-                lookup = getattr(self.__class__, k, None)
-                # An explicit JsonField marker means the column is raw JSON
-                # (e.g. a plugin field holding a list of dicts). Keep it as-is
-                # instead of coercing each dict into a nested Record, which
-                # would break serialize()/save() (no id on plain JSON dicts).
-                if hasattr(lookup, "_json_field"):
-                    self._add_cache((k, copy.deepcopy(v)))
-                    setattr(self, k, v)
-                    continue
-                # check if GFK
-                if len(v) and isinstance(v[0], dict) and "object_type" in v[0]:
-                    v = [generic_list_parser(k, i) for i in v]
-                    # An unmapped object_type (e.g. a plugin whose extension
-                    # hasn't been registered) falls through as the raw dict,
-                    # so cache it directly instead of assuming .serialize().
-                    to_cache = [
-                        i.serialize() if hasattr(i, "serialize") else copy.deepcopy(i)
-                        for i in v
-                    ]
-                elif k == "constraints":
-                    # Permissions constraints can be either dict or list
-                    to_cache = copy.deepcopy(v)
-                elif (
-                    k in SIBLING_TYPED_LIST_FIELDS
-                    and len(v)
-                    and isinstance(v[0], dict)
-                    and isinstance(values.get(f"{k}_type"), str)
-                ):
-                    # NetBox cable-termination pattern: link_peers/
-                    # connected_endpoints carry their item type in the sibling
-                    # link_peers_type/connected_endpoints_type field rather
-                    # than per-item. Cast each item to the model named by
-                    # that sibling content type.
-                    v = [sibling_typed_list_parser(i, values[f"{k}_type"]) for i in v]
-                    to_cache = list(v)
-                else:
-                    v = [list_parser(k, i) for i in v]
-                    to_cache = list(v)
-                self._add_cache((k, to_cache))
+    def _parse_sibling_typed_list_item(self, list_item, content_type):
+        from pynetbox.models.mapper import CONTENT_TYPE_MAPPER
 
-            else:
-                self._add_cache((k, v))
+        content_type_mapper = getattr(
+            self.api, "_content_type_mapper", CONTENT_TYPE_MAPPER
+        )
+
+        if isinstance(list_item, dict):
+            if model := content_type_mapper.get(content_type, None):
+                return self._nested(model, list_item)
+            return self._nested(self.default_ret, list_item)
+        return list_item
+
+    def _nested(self, model, values):
+        """Build the ``model`` record of a nested object.
+
+        With an identity map active, objects with an ``id`` and ``url`` are
+        built once and shared, see `pynetbox.core.identity`.
+        """
+        imap = identity.active(self.api)
+        url = values.get("url")
+        if imap is None or not url or "id" not in values:
+            return model(values, self.api, self.endpoint)
+        key = (model, url)
+        record = imap.get(key)
+        if record is None:
+            record = _shared_class(model)(values, self.api, self.endpoint)
+            object.__setattr__(record, "_frozen", True)
+            record = imap.add(key, record)
+        return record
+
+    def _defer(self, k, values):
+        """Keep field ``k`` of ``values`` unparsed until it is first read.
+
+        A placeholder keeps the field's position in the initial state.
+        """
+        lazy = self.__dict__.get("_lazy")
+        if lazy is None:
+            lazy = self._lazy = {}
+        lazy[k] = values
+        # Drop a value parsed from an earlier response (full_details()).
+        self.__dict__.pop(k, None)
+        self._init_cache.append((k, _UNPARSED))
+
+    def _materialize(self, k):
+        """Parse the deferred field ``k`` and set it on the record.
+
+        A value assigned to the attribute in the meantime is kept; the
+        parsed value then only provides the initial state.
+        """
+        values = self._lazy.pop(k)
+        imap = self.__dict__.get("_identity")
+        if imap is not None:
+            with identity.identity_map(imap):
+                v, to_cache = self._parse_value(k, values[k], values)
+        else:
+            v, to_cache = self._parse_value(k, values[k], values)
+        for i in range(len(self._init_cache) - 1, -1, -1):
+            if self._init_cache[i] == (k, _UNPARSED):
+                self._init_cache[i] = (k, get_return(to_cache))
+                break
+        if k not in self.__dict__:
             setattr(self, k, v)
 
+    def _materialize_all(self):
+        """Parse every deferred field."""
+        lazy = self.__dict__.get("_lazy")
+        while lazy:
+            self._materialize(next(iter(lazy)))
+
     def _endpoint_from_url(self, url):
-        url_path = urlsplit(url).path
-        base_url_path_parts = urlsplit(self.api.base_url).path.split("/")
-        if len(base_url_path_parts) > 2:
-            # There are some extra directories in the path, remove them from url
-            extra_path = "/".join(base_url_path_parts[:-1])
-            url_path = url_path[len(extra_path) :]
-        split_url_path = url_path.split("/")
-        if split_url_path[2] == "plugins":
-            app = "plugins/{}".format(split_url_path[3])
-            name = split_url_path[4]
-        else:
-            app, name = split_url_path[2:4]
-        return getattr(pynetbox.core.app.App(self.api, app), name)
+        return _endpoint_from_url(self.api, url)
 
     def full_details(self):
         """Queries the hyperlinked endpoint if 'url' is defined.
@@ -599,12 +1099,19 @@ class Record:
                 base=self.url,
                 token=self.api.token,
                 http_session=self.api.http_session,
+                json_codec=api_codec(self.api),
             )
-            self._parse_values(next(req.get()))
-            self.has_details = True
+            self._load_details(next(req.get()))
             return True
         return False
 
+    def _load_details(self, values):
+        """Update the record from its detail view ``values``."""
+        self._parse_values(values)
+        self.has_details = True
+        if self._partial is not None:
+            self._partial = None
+
     def serialize(self, nested=False, init=False):
         """Serializes an object
 
@@ -634,6 +1141,9 @@ class Record:
         if nested:
             return get_return(self)
 
+        # Deferred fields (lazy_records) need their initial state.
+        self._materialize_all()
+
         # Determine which fields to serialize
         if init:
             # For initial state, use only _init_cache
@@ -775,6 +1285,7 @@ class Record:
                 base=self.endpoint.url,
                 token=self.api.token,
                 http_session=self.api.http_session,
+                json_codec=api_codec(self.api),
             )
             result = req.patch(updates)
             if result:
@@ -824,10 +1335,93 @@ class Record:
             base=self.endpoint.url,
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         )
         return True if req.delete() else False
 
 
+# Records being updated by full_details() or lazy parsing in this thread,
+# which may set attributes on shared records.
+_thawed = threading.local()
+
+
+class _SharedRecord:
+    """Read-only record shared through an `IdentityMap`.
+
+    Mixed into the record's model by `_shared_class`. Copies are ordinary,
+    editable records of the model.
+    """
+
+    _frozen = False
+
+    def __setattr__(self, k, v):
+        if self._frozen and id(self) not in getattr(_thawed, "ids", ()):
+            raise AttributeError(
+                "'{}' is shared through an identity map and is read-only; "
+                "use copy.copy() for an editable record".format(self)
+            )
+        super().__setattr__(k, v)
+
+    def __delattr__(self, k):
+        if self._frozen and id(self) not in getattr(_thawed, "ids", ()):
+            raise AttributeError(
+                "'{}' is shared through an identity map and is read-only".format(self)
+            )
+        super().__delattr__(k)
+
+    @contextlib.contextmanager
+    def _thaw(self):
+        ids = _thawed.__dict__.setdefault("ids", set())
+        if id(self) in ids:
+            yield
+            return
+        ids.add(id(self))
+        try:
+            yield
+        finally:
+            ids.discard(id(self))
+
+    def _load_details(self, values):
+        # Loads the object for every record that references it.
+        with self._thaw():
+            super()._load_details(values)
+
+    def _materialize(self, k):
+        with self._thaw():
+            super()._materialize(k)
+
+    def __reduce_ex__(self, protocol):
+        state = self.__getstate__()
+        state.pop("_frozen", None)
+        return _unshared, (self._model,), state
+
+
+def _unshared(model):
+    return model.__new__(model)
+
+
+_shared_classes = {}
+
+
+def _shared_class(model):
+    """Return the read-only subclass of ``model`` used for shared records."""
+    cls = _shared_classes.get(model)
+    if cls is None:
+        cls = _shared_classes.setdefault(
+            model,
+            type(
+                model.__name__,
+                (_SharedRecord, model),
+                {
+                    "_model": model,
+                    "__module__": model.__module__,
+                    "__qualname__": model.__qualname__,
+                },
+            ),
+        )
+    return cls
+
+
 class PathableRecord(Record):
     """Record class for objects that support cable path tracing via /paths endpoint.
 
@@ -856,6 +1450,7 @@ class PathableRecord(Record):
             base=self.endpoint.url,
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).get()
 
         ret = []
@@ -914,3 +1509,211 @@ class GenericListObject:
             if isinstance(cur_attr, Record):
                 cur_attr = dict(cur_attr)
             yield i, cur_attr
+
+
+def _endpoint_from_url(api, url):
+    """Return the endpoint of an object URL returned by NetBox."""
+    registry = pynetbox.core.app._registry(api)
+    if registry is not None:
+        return registry.endpoint_from_url(url)
+    app, name = pynetbox.core.app._split_url(url, urlsplit(api.base_url).path)
+    return getattr(pynetbox.core.app.App(api, app), name)
+
+
+# Marks a field of a `FieldTable` that a `CompactRecord` doesn't have.
+_ABSENT = object()
+
+
+class FieldTable:
+    """Field names shared by the `CompactRecord`s of an endpoint.
+
+    Maps each field name to its position in the records' value tuples.
+    Fields are appended as they are first seen, so records with different
+    shapes (e.g. from ``fields=``) can share a table. Nested objects and
+    lists of objects get a child table per field. Child tables have no
+    endpoint, since a field may hold objects of several endpoints; their
+    records find theirs from their ``url``.
+
+    ## Parameters
+
+    * **endpoint** (Endpoint, optional): Endpoint the records belong to.
+    * **api** (Api, optional): API used to find the endpoints of nested
+        objects. Defaults to the endpoint's.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "api",
+        "names",
+        "index",
+        "children",
+        "_lock",
+        "__weakref__",
+    )
+
+    def __init__(self, endpoint=None, api=None):
+        self.endpoint = endpoint
+        self.api = api if api is not None else getattr(endpoint, "api", None)
+        self.names = []
+        self.index = {}
+        self.children = {}
+        # Held to add fields and children, so threads packing records of
+        # the same endpoint don't give two fields the same position.
+        self._lock = threading.Lock()
+
+    def child(self, name):
+        """Return the table of the nested objects in field ``name``."""
+        table = self.children.get(name)
+        if table is None:
+            with self._lock:
+                table = self.children.get(name)
+                if table is None:
+                    table = self.children[name] = FieldTable(api=self.api)
+        return table
+
+    def pack(self, values):
+        """Build a `CompactRecord` from a response dict."""
+        index = self.index
+        if any(k not in index for k in values):
+            with self._lock:
+                for k in values:
+                    if k not in index:
+                        # Named before indexed: a field found in ``index``
+                        # without the lock always fits in ``names``.
+                        self.names.append(k)
+                        index[k] = len(self.names) - 1
+        slots = [_ABSENT] * len(self.names)
+        for k, v in values.items():
+            if isinstance(v, dict) and k not in ("custom_fields", "local_context_data"):
+                v = self.child(k).pack(v)
+            elif isinstance(v, list):
+                if any(isinstance(i, dict) for i in v):
+                    table = self.child(k)
+                    v = tuple(table.pack(i) if isinstance(i, dict) else i for i in v)
+                else:
+                    v = tuple(v)
+            slots[index[k]] = v
+        return CompactRecord(self, tuple(slots))
+
+
+class CompactRecord:
+    """Read-only record with a small memory footprint.
+
+    Returned instead of `Record` by `RecordSet.compact()`, or by endpoints
+    whose ``compact_records`` attribute is True. Field values are kept in a
+    tuple, and the field names in a `FieldTable` shared by all records of
+    the endpoint, so a record costs little more than its values. Nested
+    objects are compact records too, and lists are tuples.
+
+    Fields are read as attributes or items, and ``dict(record)`` returns
+    the fields as a dict, like `Record`. Compact records don't fetch missing
+    fields, track changes or save; use `to_record()` to get a `Record`.
+
+    ## Examples
+
+    ```python
+    ips = list(nb.ipam.ip_addresses.all().compact())
+    ips[0].address
+    # '10.0.0.1/24'
+    ips[0].assigned_object.device.name
+    # 'test1-leaf1'
+    ```
+    """
+
+    __slots__ = ("_table", "_values")
+
+    def __init__(self, table, values):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_values", values)
+
+    def __getattr__(self, k):
+        if not k.startswith("_"):
+            i = self._table.index.get(k)
+            if i is not None and i < len(self._values):
+                v = self._values[i]
+                if v is not _ABSENT:
+                    return v
+        raise AttributeError('object has no attribute "{}"'.format(k))
+
+    def __setattr__(self, k, v):
+        raise AttributeError("CompactRecord is read-only; use to_record() to edit")
+
+    def __getitem__(self, k):
+        try:
+            return getattr(self, k)
+        except AttributeError:
+            raise KeyError(k) from None
+
+    def __iter__(self):
+        for k, v in zip(self._table.names, self._values):
+            if v is _ABSENT:
+                continue
+            if isinstance(v, CompactRecord):
+                v = dict(v)
+            elif isinstance(v, tuple):
+                v = [dict(i) if isinstance(i, CompactRecord) else i for i in v]
+            yield k, v
+
+    def __contains__(self, k):
+        return getattr(self, k, _ABSENT) is not _ABSENT
+
+    def __str__(self):
+        return (
+            getattr(self, "name", None)
+            or getattr(self, "label", None)
+            or getattr(self, "display", None)
+            or ""
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state):
+        packed = FieldTable().pack(state)
+        object.__setattr__(self, "_table", packed._table)
+        object.__setattr__(self, "_values", packed._values)
+
+    def _endpoint(self):
+        """Return the record's endpoint, or None if it can't be told."""
+        table = self._table
+        if table.endpoint is not None:
+            return table.endpoint
+        url = getattr(self, "url", None)
+        if url and table.api is not None:
+            return _endpoint_from_url(table.api, url)
+        return None
+
+    def __key__(self):
+        endpoint = self._endpoint()
+        if endpoint is None:
+            return None
+        return (endpoint.name, getattr(self, "id", None))
+
+    def __hash__(self):
+        key = self.__key__()
+        return object.__hash__(self) if key is None else hash(key)
+
+    def __eq__(self, other):
+        # Records whose endpoint is unknown are only equal to themselves.
+        if isinstance(other, CompactRecord):
+            key = self.__key__()
+            if key is None:
+                return self is other
+            return key == other.__key__()
+        return NotImplemented
+
+    def to_record(self):
+        """Return a full `Record` of the endpoint's model for these values.
+
+        ## Raises
+        ValueError: if the record's endpoint is unknown, as for nested
+            objects without a ``url``.
+        """
+        endpoint = self._endpoint()
+        if endpoint is None:
+            raise ValueError("Can't tell the endpoint of {!r}".format(self))
+        return endpoint.return_obj(dict(self), endpoint.api, endpoint)
+
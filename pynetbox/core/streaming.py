@@ -0,0 +1,189 @@
+"""
+Incremental parsing of JSON list pages.
+
+`StreamedPage` reads a response body chunk by chunk and decodes the items of
+its ``results`` array one at a time, so a list page never has to be held in
+memory as a whole and its first record is available as soon as it has been
+received.
+"""
+
+import codecs
+import json
+
+# Size of the chunks read from the response body.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class StreamedPage:
+    """A JSON response body parsed incrementally.
+
+    On construction the body is read up to the start of the ``results``
+    array of a paginated page (or the start of a top-level array). The other
+    members of the page seen so far, normally ``count``, ``next`` and
+    ``previous``, are available in `meta`. Iterating `results()` yields the
+    array items as they are decoded and then parses the rest of the page, so
+    `meta` is complete once the iteration ends.
+
+    A body that is an object without a ``results`` array is parsed entirely
+    into `meta`.
+
+    ## Parameters
+
+    * **chunks** (iterable of bytes): The body, e.g.
+        ``response.iter_content(CHUNK_SIZE)``.
+    * **close** (callable, optional): Called once the body has been
+        consumed or the iteration is abandoned.
+    * **response** (optional): The response being parsed, kept for error
+        reporting.
+
+    ## Raises
+    ValueError if the body is not valid JSON.
+    """
+
+    def __init__(self, chunks, close=None, response=None):
+        self.response = response
+        self.meta = {}
+        self.paginated = False
+        self.is_list = False
+        self.received = 0
+        self._chunks = iter(chunks)
+        self._close = close
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        try:
+            self._start()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Release the underlying response."""
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+    def _fill(self):
+        """Append the next chunk to the buffer, dropping the parsed prefix.
+
+        Returns False once the body is exhausted.
+        """
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            tail = self._text.decode(b"", final=True)
+        else:
+            tail = self._text.decode(chunk)
+        self._buf = self._buf[self._pos :] + tail
+        self._pos = 0
+        return True
+
+    def _more(self):
+        """Read until the unparsed part of the buffer has doubled.
+
+        Growing geometrically keeps re-parsing a value that spans many chunks
+        linear in its size.
+        """
+        target = 2 * (len(self._buf) - self._pos) + 1
+        grew = False
+        while len(self._buf) - self._pos < target and self._fill():
+            grew = True
+        return grew
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON data")
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(
+                "Expected one of {!r} but found {!r} in JSON data".format(chars, char)
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode the JSON value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._more():
+                    continue
+                raise
+            # A number or literal that ends exactly at the end of the buffer
+            # may continue in the next chunk ("12" of "123"); strings,
+            # objects and arrays are self-delimiting.
+            if end == len(self._buf) and self._buf[end - 1] not in '"]}':
+                if self._more():
+                    continue
+            self._pos = end
+            return value
+
+    def _start(self):
+        char = self._peek()
+        if char == "[":
+            self._pos += 1
+            self.is_list = True
+        elif char == "{":
+            self._pos += 1
+            self._members()
+        else:
+            self.meta = self._value()
+
+    def _members(self):
+        """Parse object members until the ``results`` array or the end."""
+        while True:
+            char = self._expect('},"')
+            if char == "}":
+                return
+            if char == ",":
+                continue
+            self._pos -= 1
+            key = self._value()
+            self._expect(":")
+            if key == "results" and self._peek() == "[":
+                self._pos += 1
+                self.paginated = True
+                return
+            self.meta[key] = self._value()
+
+    def results(self):
+        """Yield the items of the ``results`` (or top-level) array.
+
+        Once exhausted, the remaining members of the page are parsed into
+        `meta`. The response is closed when the iteration ends, including
+        when it is abandoned early.
+        """
+        try:
+            if self.paginated or self.is_list:
+                while True:
+                    char = self._peek()
+                    if char in "],":
+                        self._pos += 1
+                        if char == "]":
+                            break
+                        continue
+                    item = self._value()
+                    self.received += 1
+                    yield item
+                if self.paginated:
+                    self._members()
+        finally:
+            self.close()
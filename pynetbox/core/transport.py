@@ -0,0 +1,531 @@
+"""
+HTTP transport used by `Api`.
+
+`PynetboxAdapter` is a ``requests`` transport adapter whose connection pools
+count how connections are created, reused and discarded, and which can
+enable TCP keep-alive on its sockets. `Api` mounts one sized to its worker
+count. `RetryPolicy` retries failed requests at the same level, an optional
+`RateLimiter` spaces requests out before they are sent, an optional cache
+(see `pynetbox.core.cache`) revalidates GET responses, and `SingleFlight`
+merges identical GET requests made at the same time.
+"""
+
+import queue
+import random
+import socket
+import threading
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.retry import Retry
+
+from pynetbox.core import cache as _cache
+
+
+class PoolStats:
+    """Connection counters shared by the pools of a `PynetboxAdapter`.
+
+    * **created**: TCP connections opened, including reconnects of pooled
+      connections the server had closed.
+    * **reused**: requests sent over an already open pooled connection.
+    * **discarded**: connections dropped instead of being returned to the
+      pool, because the pool was full or the connection errored.
+
+    ## Examples
+
+    ```python
+    nb.pool_stats.as_dict()
+    # {'created': 4, 'reused': 1210, 'discarded': 0}
+    ```
+    """
+
+    _fields = ("created", "reused", "discarded")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        return self.as_dict()
+
+    def __setstate__(self, state):
+        self._lock = threading.Lock()
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        return "<PoolStats {}>".format(
+            " ".join("{}={}".format(k, v) for k, v in self.as_dict().items())
+        )
+
+    def _incr(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def as_dict(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            return {field: getattr(self, field) for field in self._fields}
+
+    def reset(self):
+        """Set all counters back to zero."""
+        with self._lock:
+            for field in self._fields:
+                setattr(self, field, 0)
+
+
+class _StatsQueue(queue.LifoQueue):
+    """Pool queue that counts connections it has no room for."""
+
+    stats = None
+
+    def put(self, item, block=True, timeout=None):
+        try:
+            super().put(item, block, timeout)
+        except queue.Full:
+            if self.stats is not None:
+                self.stats._incr("discarded")
+            raise
+        # urllib3 returns None to the pool in place of a connection it
+        # closed after an error. (The pool is pre-filled with None before
+        # stats are attached, which is not counted.)
+        if item is None and self.stats is not None:
+            self.stats._incr("discarded")
+
+
+class _StatsPoolMixin:
+    QueueCls = _StatsQueue
+    stats = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn._pynetbox_fresh = True
+        if self.stats is not None:
+            self.stats._incr("created")
+        return conn
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        if self.stats is not None:
+            if getattr(conn, "sock", None) is not None:
+                self.stats._incr("reused")
+            elif not getattr(conn, "_pynetbox_fresh", False):
+                # A pooled connection the server closed; urllib3 reconnects it.
+                self.stats._incr("created")
+        conn._pynetbox_fresh = False
+        return conn
+
+
+class _StatsHTTPConnectionPool(_StatsPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _StatsHTTPSConnectionPool(_StatsPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _StatsPoolManager(PoolManager):
+    def __init__(self, stats, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {
+            "http": _StatsHTTPConnectionPool,
+            "https": _StatsHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self.stats
+        pool.pool.stats = self.stats
+        return pool
+
+
+def tcp_keepalive_options(idle=60, interval=10, count=6):
+    """Socket options enabling TCP keep-alive probes.
+
+    ## Parameters
+
+    * **idle** (int): Seconds a connection is idle before probes start.
+    * **interval** (int): Seconds between probes.
+    * **count** (int): Unanswered probes before the connection is dropped.
+
+    ## Returns
+    List of ``(level, option, value)`` tuples, for the options the platform
+    supports, suitable for ``socket_options``.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # TCP_KEEPIDLE on Linux, TCP_KEEPALIVE on macOS.
+    idle_option = getattr(
+        socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None)
+    )
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+
+class RetryStats:
+    """Counters of the retries made by a `RetryPolicy`.
+
+    * **retries**: requests retried, for any reason.
+    * **by_status**: retries per HTTP status code (e.g. ``{503: 2}``).
+    * **connect_errors**: retries after failing to connect.
+    * **read_errors**: retries after the connection failed mid-response.
+    * **exhausted**: requests that still failed after the last retry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        return self.as_dict()
+
+    def __setstate__(self, state):
+        self._lock = threading.Lock()
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        return "<RetryStats {}>".format(self.as_dict())
+
+    def _record(self, status=None, field=None):
+        with self._lock:
+            self.retries += 1
+            if status is not None:
+                self.by_status[status] = self.by_status.get(status, 0) + 1
+            if field is not None:
+                setattr(self, field, getattr(self, field) + 1)
+
+    def _record_exhausted(self):
+        with self._lock:
+            self.exhausted += 1
+
+    def as_dict(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "by_status": dict(self.by_status),
+                "connect_errors": self.connect_errors,
+                "read_errors": self.read_errors,
+                "exhausted": self.exhausted,
+            }
+
+    def reset(self):
+        """Set all counters back to zero."""
+        with self._lock:
+            self.retries = 0
+            self.by_status = {}
+            self.connect_errors = 0
+            self.read_errors = 0
+            self.exhausted = 0
+
+
+class RetryPolicy(Retry):
+    """Retry policy for requests to NetBox, with counters.
+
+    A urllib3 ``Retry`` with defaults suited to NetBox. Failed connections
+    are retried for every verb, since nothing reached the server. Responses
+    with a status in ``status_forcelist`` and dropped responses are retried
+    for idempotent verbs only. Waits grow exponentially from
+    ``backoff_factor`` with random jitter. A ``Retry-After`` header sent with
+    a 429 or 503 takes precedence over the computed wait.
+
+    Retries happen per HTTP request, so a failed page of a paginated query
+    is fetched again on its own and iteration carries on from there. When
+    the retries are exhausted the last response is returned and raised as
+    `RequestError`, as without retries.
+
+    ## Parameters
+
+    * **total** (int, optional): Maximum retries per request. Defaults to 5.
+    * **backoff_factor** (float, optional): The n-th retry waits up to
+        ``backoff_factor * 2 ** (n - 1)`` seconds. Defaults to 0.5.
+    * **jitter** (float, optional): Fraction of each wait that is
+        randomized, from 0 (none) to 1. Defaults to 0.5.
+    * **status_forcelist** (iterable, optional): Statuses to retry.
+        Defaults to 429, 502, 503 and 504.
+    * **retry_writes** (bool, optional): Also retry PUT and DELETE, which
+        are idempotent in NetBox. POST and PATCH are never retried on a
+        response. Defaults to False.
+    * **stats** (RetryStats, optional): Counters to update. A new one is
+        created by default and available as ``policy.stats``.
+    * **rate_limiter** (RateLimiter, optional): Limiter each retry waits on
+        after its backoff. Retries are sent by urllib3, below
+        `PynetboxAdapter.send()`, so the adapter sets this to its own
+        limiter. Defaults to None.
+    * Any other ``urllib3.util.Retry`` argument.
+
+    ## Examples
+
+    ```python
+    nb = pynetbox.api(url, token=token, retries=RetryPolicy(total=8, retry_writes=True))
+    nb.retry_stats.as_dict()
+    ```
+    """
+
+    DEFAULT_STATUS_FORCELIST = frozenset({429, 502, 503, 504})
+    IDEMPOTENT_READS = frozenset({"GET", "HEAD", "OPTIONS"})
+    IDEMPOTENT_WRITES = frozenset({"PUT", "DELETE"})
+
+    def __init__(
+        self,
+        total=5,
+        backoff_factor=0.5,
+        jitter=0.5,
+        retry_writes=False,
+        stats=None,
+        rate_limiter=None,
+        **kwargs,
+    ):
+        kwargs.setdefault("status_forcelist", self.DEFAULT_STATUS_FORCELIST)
+        kwargs.setdefault(
+            "allowed_methods",
+            self.IDEMPOTENT_READS | self.IDEMPOTENT_WRITES
+            if retry_writes
+            else self.IDEMPOTENT_READS,
+        )
+        # Hand the final response back so it surfaces as RequestError.
+        kwargs.setdefault("raise_on_status", False)
+        super().__init__(total=total, backoff_factor=backoff_factor, **kwargs)
+        self.jitter = jitter
+        self.stats = stats if stats is not None else RetryStats()
+        self.rate_limiter = rate_limiter
+        # Method and URL of the request this retry is for, set by increment().
+        self._attempt = None
+
+    def new(self, **kw):
+        # Retry objects are immutable; each attempt creates a new one. Keep
+        # the jitter setting and the shared counters.
+        kw.setdefault("jitter", self.jitter)
+        kw.setdefault("stats", self.stats)
+        kw.setdefault("rate_limiter", self.rate_limiter)
+        return super().new(**kw)
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff and self.jitter:
+            backoff -= random.uniform(0, backoff * self.jitter)
+        return backoff
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        try:
+            new_retry = super().increment(
+                method=method, url=url, response=response, error=error, **kwargs
+            )
+        except MaxRetryError:
+            self.stats._record_exhausted()
+            raise
+        if error is not None and self._is_connection_error(error):
+            self.stats._record(field="connect_errors")
+        elif error is not None and self._is_read_error(error):
+            self.stats._record(field="read_errors")
+        elif error is not None:
+            self.stats._record()
+        else:
+            self.stats._record(status=getattr(response, "status", None))
+        if method is not None:
+            new_retry._attempt = (method, url)
+        return new_retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None and self._attempt is not None:
+            self.rate_limiter.acquire(*self._attempt)
+
+
+class _Call:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical GET requests that are in flight at the same time.
+
+    The first caller of a URL sends the request; callers asking for the same
+    URL, with the same token, ``Accept`` and branch headers, before it
+    completes wait for it and receive a copy of its response instead of
+    sending their own. Errors are raised in every waiting caller.
+
+    * **hits**: requests answered by another caller's request.
+    * **misses**: requests sent to the server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+
+    def do(self, key, send):
+        """Return ``send()``, or the response of an identical call in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.misses += 1
+                leader = True
+            else:
+                self.hits += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy_response(call.response)
+        try:
+            response = send()
+            # The adapter returns before the body is read; read it here so
+            # the waiting callers have a body to copy.
+            response.content
+            call.response = response
+            return response
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def _copy_response(response):
+    """Return a copy of a fully read response for another caller."""
+    copy = requests.Response()
+    copy.__dict__.update(response.__dict__)
+    copy.headers = response.headers.copy()
+    copy.history = list(response.history)
+    copy.raw = None
+    return copy
+
+
+class PynetboxAdapter(HTTPAdapter):
+    """Transport adapter with connection statistics and socket options.
+
+    ## Parameters
+
+    * **pool_connections** (int, optional): Number of per-host pools to
+        cache. Defaults to 10.
+    * **pool_maxsize** (int, optional): Connections kept per host. Defaults
+        to 10.
+    * **pool_block** (bool, optional): Wait for a free connection when all
+        of them are in use instead of opening an extra, unpooled one.
+        Defaults to False.
+    * **max_retries** (int or urllib3 Retry, optional): Passed to
+        `requests.adapters.HTTPAdapter`. Defaults to 0.
+    * **tcp_keepalive** (bool, optional): Enable TCP keep-alive probes on
+        new connections (see `tcp_keepalive_options`). Defaults to False.
+    * **socket_options** (list, optional): Socket options for new
+        connections, replacing urllib3's defaults (which disable Nagle's
+        algorithm). Combined with ``tcp_keepalive`` if both are given.
+    * **rate_limiter** (RateLimiter, optional): Limiter every request waits
+        on before it is sent. Retries of a `RetryPolicy` wait on it too.
+        Defaults to None.
+    * **cache** (MemoryCache or DiskCache, optional): Cache used to
+        revalidate GET responses, see `pynetbox.core.cache`. Defaults to
+        None.
+    * **single_flight** (SingleFlight, optional): Coalesces identical GET
+        requests in flight at the same time. Streamed requests are not
+        coalesced. Defaults to None.
+
+    ## Examples
+
+    ```python
+    adapter = PynetboxAdapter(pool_maxsize=32, pool_block=True, tcp_keepalive=True)
+    nb.http_session.mount("https://", adapter)
+    adapter.stats.as_dict()
+    ```
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + [
+        "stats",
+        "socket_options",
+        "rate_limiter",
+        "cache",
+        "single_flight",
+    ]
+
+    def __init__(
+        self,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        pool_block=False,
+        max_retries=0,
+        tcp_keepalive=False,
+        socket_options=None,
+        rate_limiter=None,
+        cache=None,
+        single_flight=None,
+    ):
+        self.stats = PoolStats()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.single_flight = single_flight
+        if tcp_keepalive:
+            socket_options = (
+                list(
+                    socket_options
+                    if socket_options is not None
+                    else HTTPConnection.default_socket_options
+                )
+                + tcp_keepalive_options()
+            )
+        self.socket_options = socket_options
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+        if rate_limiter is not None and isinstance(self.max_retries, RetryPolicy):
+            # A copy, so a policy shared between adapters keeps no limiter.
+            self.max_retries = self.max_retries.new(rate_limiter=rate_limiter)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        # Mirrors HTTPAdapter.init_poolmanager, with the counting pools.
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        if self.socket_options is not None:
+            pool_kwargs.setdefault("socket_options", self.socket_options)
+        self.poolmanager = _StatsPoolManager(
+            self.stats,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def send(self, request, stream=False, **kwargs):
+        if self.single_flight is not None and request.method == "GET" and not stream:
+            return self.single_flight.do(
+                _cache.cache_key(request),
+                lambda: self._send(request, stream=False, **kwargs),
+            )
+        return self._send(request, stream=stream, **kwargs)
+
+    def _send(self, request, stream=False, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(request.method, request.url)
+        if self.cache is None or request.method != "GET":
+            return super().send(request, stream=stream, **kwargs)
+        key, entry = _cache.prepare(self.cache, request)
+        response = super().send(request, stream=stream, **kwargs)
+        return _cache.update(self.cache, key, entry, response, stream=stream)
@@ -66,6 +66,7 @@ for model in nb.plugins.branching.branchable_models.all():
 ```
 """
 
+from pynetbox.core.codec import api_codec
 from pynetbox.core.extension import Extension
 from pynetbox.core.query import Request
 from pynetbox.core.response import JsonField, Record
@@ -85,6 +86,7 @@ def _post_detail(parent, action_name, data=None, return_cls=None, api=None):
         base=url,
         token=parent.api.token,
         http_session=parent.api.http_session,
+        json_codec=api_codec(parent.api),
     ).post(data or {})
     if return_cls is None:
         return resp
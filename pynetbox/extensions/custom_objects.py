@@ -46,6 +46,7 @@ result = schema_apply(nb, {"schema_version": "1", "types": [...]},
 ```
 """
 
+from pynetbox.core.codec import api_codec
 from pynetbox.core.extension import Extension
 from pynetbox.core.query import Request
 from pynetbox.core.response import JsonField, Record
@@ -58,7 +59,12 @@ def _plugin_request(api, path):
     """
     slug = CustomObjectsExtension.plugin_name.replace("_", "-")
     base = "{}/plugins/{}/{}".format(api.base_url, slug, path)
-    return Request(base=base, token=api.token, http_session=api.http_session)
+    return Request(
+        base=base,
+        token=api.token,
+        http_session=api.http_session,
+        json_codec=api_codec(api),
+    )
 
 
 class CustomObjectTypeFields(Record):
@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from pynetbox.core.codec import api_codec
 from pynetbox.core.endpoint import (
     DetailEndpoint,
     RODetailEndpoint,
@@ -42,6 +43,7 @@ class TraceableRecord(Record):
             base=self.endpoint.url,
             token=self.api.token,
             http_session=self.api.http_session,
+            json_codec=api_codec(self.api),
         ).get()
 
         ret = []
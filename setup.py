@@ -14,6 +14,12 @@ setup(
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
     install_requires=["requests>=2.20.0,<3.0", "packaging"],
+    extras_require={
+        "async": ["httpx>=0.23"],
+        "arrow": ["pyarrow"],
+        "numpy": ["numpy"],
+        "pandas": ["pandas"],
+    },
     zip_safe=False,
     keywords=["netbox"],
     classifiers=[
@@ -193,6 +193,19 @@ class ApiPaginationTestCase(unittest.TestCase):
             with self.assertWarns(UserWarning):
                 self.assertEqual(api._effective_pagination(), "cursor")
 
+    def test_effective_pagination_cursor_shards_does_not_warn(self):
+        """Sharded cursor pagination is parallel, so threading is not a no-op."""
+        import warnings
+
+        api = pynetbox.api(host, pagination="cursor", threading=True, cursor_shards=4)
+        with patch(
+            "requests.sessions.Session.get",
+            return_value=self.ResponseHeadersWithVersion("4.6"),
+        ):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self.assertEqual(api._effective_pagination(), "cursor")
+
     def test_effective_pagination_offset_fallback_does_not_warn(self):
         """Falling back to offset (NetBox < 4.6) leaves threading functional."""
         import warnings
@@ -81,3 +81,72 @@ class AppEndpointLiteralNameTestCase(unittest.TestCase):
         api = pynetbox.api(host, **def_kwargs)
         endpoint = api.dcim.endpoint("device_roles")
         self.assertEqual(endpoint.name, "device_roles")
+
+
+class RegistryTestCase(unittest.TestCase):
+    def test_endpoints_interned(self):
+        api = pynetbox.api(host, **def_kwargs)
+        self.assertIs(api.dcim.devices, api.dcim.devices)
+        self.assertIs(api.dcim.device_roles, api.dcim.device_roles)
+        self.assertIsNot(api.dcim.device_roles, api.dcim.endpoint("device_roles"))
+        self.assertIs(api.plugins.test_plugin, api.plugins.test_plugin)
+        self.assertIs(api.plugins.test_plugin.things, api.plugins.test_plugin.things)
+
+    def test_not_shared_between_apis(self):
+        api = pynetbox.api(host, **def_kwargs)
+        other = pynetbox.api(host, **def_kwargs)
+        self.assertIsNot(api.dcim.devices, other.dcim.devices)
+
+    def test_token_change_rebuilds_endpoints(self):
+        api = pynetbox.api(host, **def_kwargs)
+        devices = api.dcim.devices
+        api.token = "def456"
+        self.assertIsNot(api.dcim.devices, devices)
+        self.assertEqual(api.dcim.devices.token, "def456")
+
+    def test_endpoint_from_url(self):
+        api = pynetbox.api(host, **def_kwargs)
+        registry = api._registry
+        site = registry.endpoint_from_url("{}/api/dcim/sites/1/".format(host))
+        self.assertIs(site, api.dcim.sites)
+        self.assertIs(
+            registry.endpoint_from_url("{}/api/dcim/sites/2/".format(host)), site
+        )
+        self.assertIs(
+            registry.endpoint_from_url(
+                "{}/api/plugins/test-plugin/things/3/".format(host)
+            ),
+            api.plugins.test_plugin.things,
+        )
+        self.assertIs(
+            registry.endpoint_from_url("{}/api/dcim/device-types/1/".format(host)),
+            api.dcim.device_types,
+        )
+        self.assertIs(
+            registry.endpoint_from_url(
+                "{}/api/plugins/test-plugin/my_things/1/".format(host)
+            ),
+            api.plugins.test_plugin.endpoint("my_things"),
+        )
+        self.assertEqual(len(registry._urls), 4)
+
+    def test_nested_records_share_endpoint(self):
+        api = pynetbox.api(host, **def_kwargs)
+        devices = [
+            api.dcim.devices.return_obj(
+                {
+                    "id": i,
+                    "url": "{}/api/dcim/devices/{}/".format(host, i),
+                    "site": {
+                        "id": 1,
+                        "url": "{}/api/dcim/sites/1/".format(host),
+                        "name": "site-1",
+                    },
+                },
+                api,
+                api.dcim.devices,
+            )
+            for i in range(3)
+        ]
+        self.assertIs(devices[0].site.endpoint, devices[2].site.endpoint)
+        self.assertIs(devices[0].site.endpoint, api.dcim.sites)
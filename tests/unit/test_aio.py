@@ -0,0 +1,167 @@
+import json
+import unittest
+from urllib.parse import parse_qs
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from pynetbox.core.query import RequestError
+from pynetbox.core.response import Record
+
+if httpx is not None:
+    from pynetbox.core.aio import AsyncApi, AsyncEndpoint, AsyncRecordSet
+
+
+def _page(results, count, next_url=None):
+    return {"count": count, "next": next_url, "previous": None, "results": results}
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncApiTestCase(unittest.IsolatedAsyncioTestCase):
+    def make_api(self, handler, **kwargs):
+        self.calls = []
+
+        def record(request):
+            self.calls.append(request)
+            return handler(request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        api = AsyncApi(
+            "http://localhost:8000", token="abc123", http_client=client, **kwargs
+        )
+        self.addAsyncCleanup(api.aclose)
+        return api
+
+    async def test_all_follows_pages(self):
+        rows = [{"id": i, "name": "dev{}".format(i)} for i in range(1, 6)]
+
+        def handler(request):
+            params = parse_qs(request.url.query.decode())
+            offset = int(params.get("offset", ["0"])[0])
+            page = rows[offset : offset + 2]
+            nxt = "http://localhost:8000/api/dcim/devices/?limit=2&offset={}".format(
+                offset + 2
+            )
+            body = _page(page, len(rows), nxt if offset + 2 < len(rows) else None)
+            return httpx.Response(200, json=body)
+
+        api = self.make_api(handler)
+        ret = api.dcim.devices.all()
+        self.assertIsInstance(ret, AsyncRecordSet)
+        self.assertEqual(self.calls, [])
+        devices = [d async for d in ret]
+        self.assertEqual([d.id for d in devices], [1, 2, 3, 4, 5])
+        self.assertTrue(all(isinstance(d, Record) for d in devices))
+        self.assertEqual(self.calls[0].headers["authorization"], "Token abc123")
+
+    async def test_max_concurrency_keeps_order(self):
+        rows = list(range(1, 8))
+
+        def handler(request):
+            params = parse_qs(request.url.query.decode())
+            offset = int(params.get("offset", ["0"])[0])
+            page = [{"id": i} for i in rows[offset : offset + 2]]
+            nxt = "next" if offset + 2 < len(rows) else None
+            return httpx.Response(200, json=_page(page, len(rows), nxt))
+
+        api = self.make_api(handler, max_concurrency=3)
+        ids = [d.id async for d in api.dcim.devices.filter(site="a")]
+        self.assertEqual(ids, rows)
+        offsets = sorted(
+            int(parse_qs(c.url.query.decode()).get("offset", ["0"])[0])
+            for c in self.calls
+        )
+        self.assertEqual(offsets, [0, 2, 4, 6])
+        self.assertTrue(
+            all(parse_qs(c.url.query.decode())["site"] == ["a"] for c in self.calls)
+        )
+
+    async def test_get_by_key_and_404(self):
+        def handler(request):
+            if request.url.path.endswith("/1/"):
+                return httpx.Response(200, json={"id": 1, "name": "dev1"})
+            return httpx.Response(404, json={"detail": "Not found."})
+
+        api = self.make_api(handler)
+        device = await api.dcim.devices.get(1)
+        self.assertEqual(device.name, "dev1")
+        self.assertIsNone(await api.dcim.devices.get(2))
+
+    async def test_get_multiple_results_raises(self):
+        def handler(request):
+            return httpx.Response(200, json=_page([{"id": 1}, {"id": 2}], 2))
+
+        api = self.make_api(handler)
+        with self.assertRaises(ValueError):
+            await api.dcim.devices.get(name="dev")
+
+    async def test_create_update_delete(self):
+        def handler(request):
+            if request.method == "DELETE":
+                return httpx.Response(204)
+            body = json.loads(request.content)
+            self.assertEqual(request.headers["content-type"], "application/json")
+            return httpx.Response(200, json=body)
+
+        api = self.make_api(handler)
+        created = await api.dcim.devices.create(name="dev1")
+        self.assertEqual(created.name, "dev1")
+        updated = await api.dcim.devices.update([{"id": 1, "name": "new"}])
+        self.assertEqual(updated[0].name, "new")
+        self.assertTrue(await api.dcim.devices.delete([1, 2]))
+        self.assertEqual(json.loads(self.calls[-1].content), [{"id": 1}, {"id": 2}])
+
+    async def test_count(self):
+        def handler(request):
+            params = parse_qs(request.url.query.decode())
+            self.assertEqual(params["limit"], ["1"])
+            return httpx.Response(200, json=_page([{"id": 1}], 42))
+
+        api = self.make_api(handler)
+        self.assertEqual(await api.dcim.devices.count(site="a"), 42)
+        self.assertEqual(await api.dcim.devices.all().count(), 42)
+
+    async def test_request_error(self):
+        def handler(request):
+            return httpx.Response(400, json={"name": ["This field is required."]})
+
+        api = self.make_api(handler)
+        with self.assertRaises(RequestError) as ctx:
+            await api.dcim.devices.create(site=1)
+        self.assertEqual(ctx.exception.req.status_code, 400)
+        self.assertEqual(ctx.exception.error, '{"name":["This field is required."]}')
+
+    async def test_records_do_not_lazy_load(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={
+                    "id": 1,
+                    "site": {"id": 2, "url": "http://localhost:8000/api/dcim/sites/2/"},
+                    "device_type": {
+                        "id": 3,
+                        "url": "http://localhost:8000/api/dcim/device-types/3/",
+                    },
+                },
+            )
+
+        api = self.make_api(handler)
+        device = await api.dcim.devices.get(1)
+        self.assertEqual(device.site.id, 2)
+        with self.assertRaises(AttributeError):
+            device.site.description
+        self.assertEqual(len(self.calls), 1)
+        self.assertIs(device.site.endpoint, api.dcim.sites)
+        self.assertIs(device.device_type.endpoint, api.dcim.device_types)
+
+    async def test_endpoints_interned(self):
+        api = self.make_api(lambda request: httpx.Response(200, json={}))
+        self.assertIs(api.dcim.devices, api.dcim.devices)
+        self.assertIsInstance(api.plugins.test_plugin.things, AsyncEndpoint)
+        self.assertIs(api.plugins.test_plugin.things, api.plugins.test_plugin.things)
+
+
+if __name__ == "__main__":
+    unittest.main()
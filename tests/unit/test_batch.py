@@ -0,0 +1,224 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import pynetbox
+from pynetbox.core.batch import fetch_by_id
+from pynetbox.core.response import Record, RecordSet
+
+HOST = "http://localhost:8000"
+
+
+def device(i, **values):
+    return dict(
+        {
+            "id": i,
+            "name": "dev{}".format(i),
+            "url": "{}/api/dcim/devices/{}/".format(HOST, i),
+        },
+        **values,
+    )
+
+
+def obj(endpoint, i, **values):
+    return dict(
+        {"id": i, "url": "{}/api/{}/{}/".format(HOST, endpoint, i)},
+        **values,
+    )
+
+
+class FakeGet:
+    """Serve list requests filtered on ``id`` from ``objects``."""
+
+    def __init__(self, objects):
+        self.objects = {values["url"]: values for values in objects}
+        self.calls = []
+
+    def __call__(self, request, *args, **kwargs):
+        ids = request.filters["id"]
+        self.calls.append((request.base, list(ids), request.limit))
+        urls = ["{}{}/".format(request.base, i) for i in ids]
+        return iter([self.objects[url] for url in urls if url in self.objects])
+
+
+class FetchByIdTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api(HOST, token="abc123")
+        self.get = FakeGet([device(i) for i in range(1, 251)])
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self.get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chunks(self):
+        found = fetch_by_id(self.api.dcim.devices, [3, 1, 3, 999] + list(range(4, 250)))
+        self.assertEqual(len(found), 248)
+        self.assertNotIn(999, found)
+        self.assertEqual(found[3]["name"], "dev3")
+        self.assertEqual([len(ids) for _, ids, _ in self.get.calls], [100, 100, 49])
+        self.assertEqual([limit for _, _, limit in self.get.calls], [100, 100, 49])
+
+    def test_empty(self):
+        self.assertEqual(fetch_by_id(self.api.dcim.devices, []), {})
+        self.assertEqual(self.get.calls, [])
+
+
+class BatchDetailsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api(HOST, token="abc123")
+        self.get = FakeGet([device(i, serial="SN{}".format(i)) for i in range(1, 11)])
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self.get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def interfaces(self):
+        return [
+            Record(
+                {
+                    "id": 100 + i,
+                    "name": "eth0",
+                    "url": "{}/api/dcim/interfaces/{}/".format(HOST, 100 + i),
+                    "device": device(i % 5 + 1),
+                },
+                self.api,
+                self.api.dcim.interfaces,
+            )
+            for i in range(10)
+        ]
+
+    def test_nested_records(self):
+        interfaces = self.interfaces()
+        loaded = pynetbox.batch_details(i.device for i in interfaces)
+        self.assertEqual(loaded, 10)
+        self.assertEqual(len(self.get.calls), 1)
+        self.assertEqual(self.get.calls[0][0], "{}/api/dcim/devices/".format(HOST))
+        self.assertEqual(self.get.calls[0][1], [1, 2, 3, 4, 5])
+        self.assertTrue(all(i.device.has_details for i in interfaces))
+        self.assertEqual(interfaces[6].device.serial, "SN2")
+        # Already loaded: no more requests.
+        self.assertEqual(pynetbox.batch_details(i.device for i in interfaces), 0)
+        self.assertEqual(len(self.get.calls), 1)
+
+    def test_skips_records_without_url_or_id(self):
+        record = Record({"name": "x"}, self.api, self.api.dcim.devices)
+        self.assertEqual(pynetbox.batch_details([record]), 0)
+        self.assertEqual(self.get.calls, [])
+
+    def test_skips_compact_records(self):
+        request = Mock()
+        request.get.return_value = iter([device(1)])
+        records = list(RecordSet(self.api.dcim.devices, request).compact())
+        self.assertEqual(pynetbox.batch_details(records), 0)
+        self.assertEqual(self.get.calls, [])
+        request.get.return_value = iter([device(1)])
+        with self.assertRaises(ValueError):
+            RecordSet(self.api.dcim.devices, request).compact().fetch_details()
+
+    def test_missing_object(self):
+        record = Record(device(99), self.api, self.api.dcim.devices)
+        self.assertEqual(pynetbox.batch_details([record]), 0)
+        self.assertFalse(record.has_details)
+
+    def test_shared_records(self):
+        with pynetbox.identity_map():
+            interfaces = self.interfaces()
+        pynetbox.batch_details(i.device for i in interfaces)
+        self.assertEqual(interfaces[0].device.serial, "SN1")
+
+    def test_recordset_fetch_details(self):
+        request = Mock()
+        request.get.return_value = iter(
+            [{"id": i, "url": device(i)["url"]} for i in range(1, 4)]
+        )
+        records = RecordSet(
+            self.api.dcim.devices, request, partial="raise"
+        ).fetch_details()
+        self.assertEqual([r.serial for r in records], ["SN1", "SN2", "SN3"])
+        self.assertEqual(len(self.get.calls), 1)
+
+
+class PrefetchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api(HOST, token="abc123")
+        self.get = FakeGet(
+            [
+                obj(
+                    "dcim/device-types",
+                    i,
+                    u_height=i,
+                    manufacturer=obj("dcim/manufacturers", 1),
+                )
+                for i in (1, 2)
+            ]
+            + [obj("dcim/manufacturers", 1, slug="acme", description="ACME")]
+            + [
+                obj("ipam/ip-addresses", i, dns_name="dev{}.example".format(i))
+                for i in range(1, 5)
+            ]
+            + [obj("extras/tags", 1, color="ff0000")]
+        )
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self.get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def recordset(self, count=4):
+        request = Mock()
+        # A generator, like Request.get(): it can be closed.
+        request.get.return_value = (
+            values
+            for values in [
+                device(
+                    i,
+                    device_type=obj("dcim/device-types", i % 2 + 1),
+                    primary_ip4=obj("ipam/ip-addresses", i) if i != 3 else None,
+                    tags=[obj("extras/tags", 1)],
+                )
+                for i in range(1, count + 1)
+            ]
+        )
+        return RecordSet(self.api.dcim.devices, request)
+
+    def test_prefetch(self):
+        devices = list(self.recordset().prefetch("device_type", "primary_ip4", "tags"))
+        # One request per endpoint, sent concurrently.
+        self.assertEqual(len(self.get.calls), 3)
+        calls = sorted(self.get.calls)
+        self.assertEqual(
+            calls[0][:2], ("{}/api/dcim/device-types/".format(HOST), [2, 1])
+        )
+        self.assertEqual(
+            calls[2][:2], ("{}/api/ipam/ip-addresses/".format(HOST), [1, 2, 4])
+        )
+        self.assertEqual([d.device_type.u_height for d in devices], [2, 1, 2, 1])
+        self.assertEqual(devices[3].primary_ip4.dns_name, "dev4.example")
+        self.assertIsNone(devices[2].primary_ip4)
+        self.assertEqual(devices[0].tags[0].color, "ff0000")
+        self.assertEqual(len(self.get.calls), 3)
+
+    def test_nested_path(self):
+        devices = list(self.recordset().prefetch("device_type.manufacturer"))
+        self.assertEqual(len(self.get.calls), 2)
+        self.assertEqual(devices[0].device_type.manufacturer.description, "ACME")
+        self.assertEqual(len(self.get.calls), 2)
+
+    def test_batch_size(self):
+        devices = self.recordset().prefetch("primary_ip4", batch_size=2)
+        first = next(devices)
+        self.assertEqual(first.primary_ip4.dns_name, "dev1.example")
+        self.assertEqual(len(self.get.calls), 1)
+        self.assertEqual(self.get.calls[0][1], [1, 2])
+        rest = list(devices)
+        self.assertEqual(len(rest), 3)
+        self.assertEqual(self.get.calls[1][1], [4])
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            self.recordset().prefetch("tags", batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
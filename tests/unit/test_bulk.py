@@ -0,0 +1,270 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+import pynetbox
+from pynetbox.core.query import RequestError
+from pynetbox.core.response import Record
+
+
+def error(status_code):
+    return RequestError(Mock(status_code=status_code, reason="", text="bad row"))
+
+
+class FakeCall:
+    """Answer bulk writes, failing any containing a ``bad`` row."""
+
+    def __init__(self, status_code=400):
+        self.status_code = status_code
+        self.calls = []
+
+    def __call__(self, request, verb="get", data=None, **kwargs):
+        self.calls.append((verb, data))
+        if any(row.get("bad") for row in data):
+            raise error(self.status_code)
+        if verb == "delete":
+            return True
+        return [dict(row, id=row.get("id") or n + 1) for n, row in enumerate(data)]
+
+
+class BulkWriteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api("http://localhost:8000", token="abc123")
+        self.endpoint = self.api.dcim.devices
+
+    def patch(self, call):
+        patcher = patch(
+            "pynetbox.core.query.Request._make_call", autospec=True, side_effect=call
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return call
+
+    def test_create_chunks(self):
+        call = self.patch(FakeCall())
+        rows = [{"name": "dev{}".format(i)} for i in range(10)]
+        result = self.endpoint.create(rows, chunk_size=3, max_workers=2)
+        self.assertTrue(result.ok)
+        self.assertEqual([len(data) for _, data in call.calls], [3, 3, 3, 1])
+        self.assertEqual(
+            [r.name for r in result.records], ["dev{}".format(i) for i in range(10)]
+        )
+        self.assertTrue(all(isinstance(r, Record) for r in result.records))
+        self.assertEqual([c.offset for c in result.chunks], [0, 3, 6, 9])
+        self.assertTrue(all(c.elapsed >= 0 for c in result.chunks))
+
+    def test_create_failed_chunk(self):
+        self.patch(FakeCall())
+        rows = [{"name": "dev{}".format(i)} for i in range(6)]
+        rows[4]["bad"] = True
+        result = self.endpoint.create(rows, chunk_size=3)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.records), 3)
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(result.failures[0].offset, 3)
+        self.assertEqual(result.failures[0].items, rows[3:])
+        self.assertIsInstance(result.failures[0].error, RequestError)
+
+    def test_bisect(self):
+        call = self.patch(FakeCall())
+        rows = [{"name": "dev{}".format(i)} for i in range(8)]
+        rows[5]["bad"] = True
+        result = self.endpoint.create(rows, chunk_size=8, bisect=True)
+        self.assertEqual(len(result.records), 7)
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(result.failures[0].offset, 5)
+        self.assertEqual(result.failures[0].items, [rows[5]])
+        # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1
+        self.assertEqual(len(call.calls), 7)
+        self.assertEqual(len(result.chunks), 7)
+
+    def test_bisect_skips_server_errors(self):
+        call = self.patch(FakeCall(status_code=500))
+        rows = [{"name": "dev0", "bad": True}, {"name": "dev1"}]
+        result = self.endpoint.create(rows, bisect=True)
+        self.assertEqual(len(call.calls), 1)
+        self.assertEqual(result.failures[0].items, rows)
+
+    def test_connection_error_fails_chunk(self):
+        def call(request, verb="get", data=None, **kwargs):
+            if data[0]["name"] == "dev2":
+                raise requests.ConnectionError("refused")
+            return data
+
+        self.patch(call)
+        rows = [{"name": "dev{}".format(i)} for i in range(4)]
+        result = self.endpoint.create(rows, chunk_size=2)
+        self.assertEqual(len(result.records), 2)
+        self.assertEqual(result.failures[0].items, rows[2:])
+        self.assertIsInstance(result.failures[0].error, requests.ConnectionError)
+
+    def test_other_errors_propagate(self):
+        self.patch(Mock(side_effect=TypeError("bug")))
+        with self.assertRaises(TypeError):
+            self.endpoint.create([{"name": "dev0"}, {"name": "dev1"}], chunk_size=1)
+
+    def test_update(self):
+        call = self.patch(FakeCall())
+        rows = [{"id": i, "status": "active"} for i in range(1, 6)]
+        result = self.endpoint.update(rows, chunk_size=2)
+        self.assertEqual([v for v, _ in call.calls], ["patch"] * 3)
+        self.assertEqual([r.id for r in result.records], [1, 2, 3, 4, 5])
+
+    def test_delete(self):
+        call = self.patch(FakeCall())
+        result = self.endpoint.delete([1, 2, 3], chunk_size=2)
+        self.assertEqual(
+            [data for _, data in call.calls], [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        )
+        self.assertEqual(result.records, [1, 2, 3])
+
+    def test_unchunked(self):
+        call = self.patch(FakeCall())
+        records = self.endpoint.create([{"name": "dev0"}, {"name": "dev1"}])
+        self.assertEqual([r.name for r in records], ["dev0", "dev1"])
+        self.assertIs(self.endpoint.delete([1, 2]), True)
+        self.assertEqual(len(call.calls), 2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.endpoint.create(name="dev0", chunk_size=10)
+        with self.assertRaises(ValueError):
+            self.endpoint.delete([1], chunk_size=0)
+
+
+class UpsertTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api("http://localhost:8000", token="abc123")
+        self.existing = [
+            {
+                "id": i,
+                "url": "http://localhost:8000/api/dcim/devices/{}/".format(i),
+                "name": "dev{}".format(i),
+                "site": {"id": 1, "name": "site-1", "slug": "site-1"},
+                "status": {"value": "active", "label": "Active"},
+                "serial": "SN{}".format(i),
+            }
+            for i in (1, 2, 3)
+        ]
+        self.lookups = []
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self._get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.call = FakeCall()
+        patcher = patch(
+            "pynetbox.core.query.Request._make_call",
+            autospec=True,
+            side_effect=self.call,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, request, *args, **kwargs):
+        self.lookups.append(request.filters)
+        if not request.filters:
+            return iter(self.existing[: request.limit])
+        return iter(
+            [
+                values
+                for values in self.existing
+                if values["name"] in request.filters["name"]
+            ]
+        )
+
+    def test_upsert(self):
+        rows = [
+            {"name": "dev1", "site": {"id": 1}, "status": "active", "serial": "SN1"},
+            {"name": "dev2", "site": {"id": 1}, "serial": "changed"},
+            {"name": "dev4", "site": {"id": 1}, "serial": "SN4"},
+        ]
+        result = self.api.dcim.devices.upsert(rows, key=("name", "site"))
+        self.assertEqual(
+            self.lookups, [{"name": ["dev1", "dev2", "dev4"], "site_id": [1]}]
+        )
+        self.assertEqual(
+            result.counts, {"created": 1, "updated": 1, "unchanged": 1, "failed": 0}
+        )
+        self.assertEqual(
+            self.call.calls,
+            [
+                ("post", [rows[2]]),
+                ("patch", [{"serial": "changed", "id": 2}]),
+            ],
+        )
+        self.assertEqual(result.unchanged[0].id, 1)
+        self.assertEqual(result.created[0].name, "dev4")
+        self.assertEqual(result.updated[0].serial, "changed")
+
+    def test_related_key_by_slug(self):
+        rows = [{"name": "dev1", "site": "site-1", "serial": "SN1"}]
+        result = self.api.dcim.devices.upsert(rows, key=("name", "site"))
+        self.assertEqual(self.lookups, [{"name": ["dev1"], "site": ["site-1"]}])
+        self.assertEqual(result.counts["unchanged"], 1)
+        self.assertEqual(self.call.calls, [])
+
+    def test_related_key_by_id(self):
+        rows = [{"name": "dev1", "site": 1, "serial": "changed"}]
+        result = self.api.dcim.devices.upsert(rows, key=("name", "site"))
+        # An object is fetched to tell whether ``site`` holds ids.
+        self.assertEqual(self.lookups[1:], [{"name": ["dev1"], "site_id": [1]}])
+        self.assertEqual(result.counts["updated"], 1)
+        self.assertEqual(self.call.calls, [("patch", [{"serial": "changed", "id": 1}])])
+
+    def test_scalar_int_key(self):
+        for values in self.existing:
+            values["vid"] = values["id"] * 10
+        rows = [{"name": "dev2", "vid": 20}]
+        result = self.api.dcim.devices.upsert(rows, key=("name", "vid"))
+        self.assertEqual(self.lookups[1:], [{"name": ["dev2"], "vid": [20]}])
+        self.assertEqual(result.counts["unchanged"], 1)
+
+    def test_invalid_related_keys(self):
+        with self.assertRaises(ValueError):
+            self.api.dcim.devices.upsert(
+                [{"name": "dev1", "site": {"id": 1}}, {"name": "dev2", "site": "x"}],
+                key=("name", "site"),
+            )
+        self.existing[0]["site"] = {"id": 1, "name": "site-1"}
+        with self.assertRaises(ValueError):
+            self.api.dcim.devices.upsert(
+                [{"name": "dev1", "site": "site-1"}], key=("name", "site")
+            )
+        self.assertEqual(self.call.calls, [])
+
+    def test_scalar_key(self):
+        rows = [{"name": "dev3", "serial": "SN3"}]
+        result = self.api.dcim.devices.upsert(rows, key="name")
+        self.assertEqual(self.lookups, [{"name": ["dev3"]}])
+        self.assertEqual(result.counts["unchanged"], 1)
+        self.assertEqual(self.call.calls, [])
+
+    def test_failure_offsets(self):
+        rows = [
+            {"name": "dev1", "serial": "x"},
+            {"name": "dev5"},
+            {"name": "dev6", "bad": True},
+        ]
+        result = self.api.dcim.devices.upsert(
+            rows, key="name", chunk_size=1, max_workers=1
+        )
+        self.assertFalse(result.ok)
+        self.assertEqual([f.offset for f in result.failures], [2])
+        self.assertEqual(sorted(c.offset for c in result.chunks), [0, 1, 2])
+
+    def test_invalid_rows(self):
+        with self.assertRaises(ValueError):
+            self.api.dcim.devices.upsert([{"serial": "x"}], key="name")
+        with self.assertRaises(ValueError):
+            self.api.dcim.devices.upsert([{"name": "a"}, {"name": "a"}], key="name")
+
+    def test_ambiguous_key(self):
+        self.existing.append(dict(self.existing[0], id=9))
+        with self.assertRaises(ValueError):
+            self.api.dcim.devices.upsert([{"name": "dev1"}], key="name")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import http.server
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+
+import requests
+
+import pynetbox
+from pynetbox.core.cache import BaseCache, CacheEntry, DiskCache, MemoryCache
+from pynetbox.core.transport import PynetboxAdapter
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.path.startswith("/api/plain/"):
+            self._send(200, b'{"id": 2}')
+        elif self.headers.get("If-None-Match") == self.etag:
+            self._send(304, b"")
+        else:
+            self._send(200, b'{"id": 1, "name": "dev1"}', ETag=self.etag)
+
+    def _send(self, status, body, **headers):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CacheTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = "http://127.0.0.1:{}".format(cls.server.server_address[1])
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _Handler.etag = '"v1"'
+        _Handler.requests.clear()
+
+    def _session(self, cache):
+        session = requests.Session()
+        session.mount("http://", PynetboxAdapter(cache=cache))
+        self.addCleanup(session.close)
+        return session
+
+
+class ConditionalRequestTestCase(_CacheTestCase):
+    def _check_revalidation(self, cache):
+        session = self._session(cache)
+        url = self.url + "/api/dcim/devices/1/"
+        first = session.get(url)
+        second = session.get(url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["ETag"], '"v1"')
+        self.assertNotIn("If-None-Match", _Handler.requests[0])
+        self.assertEqual(_Handler.requests[1]["If-None-Match"], '"v1"')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # A changed object is downloaded and stored again.
+        _Handler.etag = '"v2"'
+        session.get(url)
+        session.get(url)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_memory_cache(self):
+        self._check_revalidation(MemoryCache())
+
+    def test_disk_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self._check_revalidation(DiskCache(directory))
+        # Entries survive a new cache instance on the same directory.
+        cache = DiskCache(directory)
+        session = self._session(cache)
+        session.get(self.url + "/api/dcim/devices/1/")
+        self.assertEqual(cache.hits, 1)
+
+    def test_responses_without_validators_not_stored(self):
+        cache = MemoryCache()
+        session = self._session(cache)
+        session.get(self.url + "/api/plain/")
+        self.assertEqual(len(cache), 0)
+
+    def test_keyed_by_token(self):
+        cache = MemoryCache()
+        session = self._session(cache)
+        url = self.url + "/api/dcim/devices/1/"
+        session.get(url, headers={"Authorization": "Token a"})
+        session.get(url, headers={"Authorization": "Token b"})
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_streamed_response_served_from_cache(self):
+        cache = MemoryCache()
+        session = self._session(cache)
+        url = self.url + "/api/dcim/devices/1/"
+        session.get(url)
+        response = session.get(url, stream=True)
+        self.assertEqual(
+            b"".join(response.iter_content(4)), b'{"id": 1, "name": "dev1"}'
+        )
+        self.assertEqual(cache.hits, 1)
+
+    def test_api(self):
+        cache = MemoryCache()
+        nb = pynetbox.api(self.url, http_cache=cache)
+        self.assertIs(nb.http_cache, cache)
+        nb.dcim.devices.get(1)
+        device = nb.dcim.devices.get(1)
+        self.assertEqual(device.name, "dev1")
+        self.assertEqual(cache.hits, 1)
+        self.assertIsInstance(
+            pynetbox.api(self.url, http_cache=True).http_cache, MemoryCache
+        )
+        self.assertIsNone(pynetbox.api(self.url).http_cache)
+
+
+class CacheBackendTestCase(unittest.TestCase):
+    def _entry(self, size):
+        return CacheEntry("http://x/", 200, {"ETag": '"x"'}, b"x" * size)
+
+    def test_memory_eviction(self):
+        cache = MemoryCache(max_bytes=25)
+        cache.set("a", self._entry(10))
+        cache.set("b", self._entry(10))
+        cache.get("a")
+        cache.set("c", self._entry(10))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.size, 20)
+        cache.set("big", self._entry(30))
+        self.assertIsNone(cache.get("big"))
+
+    def test_disk_eviction(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = DiskCache(directory, max_bytes=250)
+        for key in ("a", "b", "c"):
+            cache.set(key, self._entry(60))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c").content, b"x" * 60)
+        self.assertLessEqual(cache.size, 250)
+        cache.clear()
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.size, 0)
+
+    def test_validators(self):
+        entry = CacheEntry(
+            "http://x/", 200, {"etag": '"x"', "Last-Modified": "Mon"}, b""
+        )
+        self.assertEqual(
+            entry.validators(),
+            {"If-None-Match": '"x"', "If-Modified-Since": "Mon"},
+        )
+
+    def test_backends_implement_storage(self):
+        class Incomplete(BaseCache):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_pickle(self):
+        cache = MemoryCache()
+        cache.set("a", self._entry(3))
+        restored = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(restored.get("a").content, b"xxx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib.util
+import json
+import unittest
+from unittest.mock import Mock
+
+import pynetbox
+from pynetbox.core.codec import OrjsonCodec, StdlibCodec, api_codec, get_codec
+from pynetbox.core.query import ContentError, Request
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+
+class GetCodecTestCase(unittest.TestCase):
+    def test_none_keeps_default(self):
+        self.assertIsNone(get_codec(None))
+
+    def test_named_codec(self):
+        self.assertIsInstance(get_codec("json"), StdlibCodec)
+
+    def test_codec_object_used_as_is(self):
+        codec = StdlibCodec()
+        self.assertIs(get_codec(codec), codec)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_api_codec(self):
+        api = pynetbox.api("http://localhost:8000", json_codec="json")
+        self.assertIsInstance(api_codec(api), StdlibCodec)
+        self.assertIsNone(api_codec(pynetbox.api("http://localhost:8000")))
+        self.assertIsNone(api_codec(Mock(json_codec=None)))
+        self.assertIsNone(api_codec(object()))
+
+    def test_api_codec_from_subclass(self):
+        class CodecApi(pynetbox.api):
+            @property
+            def json_codec(self):
+                return StdlibCodec()
+
+            @json_codec.setter
+            def json_codec(self, value):
+                pass
+
+        self.assertIsInstance(api_codec(CodecApi("http://localhost:8000")), StdlibCodec)
+
+    def test_auto_picks_installed_codec(self):
+        codec = get_codec("auto")
+        self.assertEqual(codec.loads(codec.dumps({"a": [1]})), {"a": [1]})
+
+    @unittest.skipUnless(HAS_ORJSON, "orjson is not installed")
+    def test_orjson_round_trip(self):
+        codec = get_codec("orjson")
+        self.assertIsInstance(codec, OrjsonCodec)
+        self.assertEqual(codec.loads(b'{"name":"d\\u00e9v"}'), {"name": "dév"})
+        self.assertEqual(codec.dumps({"id": 1}), b'{"id":1}')
+        with self.assertRaises(ValueError):
+            codec.loads(b"<html>")
+
+
+class RequestCodecTestCase(unittest.TestCase):
+    def _request(self):
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            json_codec=StdlibCodec(),
+        )
+        return test_obj
+
+    def test_decodes_from_content(self):
+        test_obj = self._request()
+        test_obj.http_session.get.return_value.ok = True
+        test_obj.http_session.get.return_value.content = b'{"id": 1}'
+
+        self.assertEqual(test_obj._make_call(), {"id": 1})
+        test_obj.http_session.get.return_value.json.assert_not_called()
+
+    def test_encodes_body(self):
+        test_obj = self._request()
+        test_obj.http_session.patch.return_value.ok = True
+        test_obj.http_session.patch.return_value.content = b"[]"
+
+        test_obj.patch([{"id": 1, "name": "test"}])
+        kwargs = test_obj.http_session.patch.call_args.kwargs
+        self.assertNotIn("json", kwargs)
+        self.assertEqual(json.loads(kwargs["data"]), [{"id": 1, "name": "test"}])
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+
+    def test_invalid_content_raises_content_error(self):
+        test_obj = self._request()
+        test_obj.http_session.get.return_value.ok = True
+        test_obj.http_session.get.return_value.content = b"<html></html>"
+
+        with self.assertRaises(ContentError):
+            test_obj._make_call()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import importlib.util
+import unittest
+from unittest.mock import Mock, patch
+
+from pynetbox.core.columnar import Columns
+from pynetbox.core.response import RecordSet
+
+ROWS = [
+    {
+        "id": 1,
+        "name": "leaf1",
+        "site": {"id": 1, "name": "site-1", "slug": "site-1"},
+        "status": {"value": "active", "label": "Active"},
+        "tags": [],
+        "custom_fields": {"owner": {"value": "x", "label": "X"}},
+    },
+    {
+        "id": 2,
+        "name": "leaf2",
+        "site": None,
+        "status": {"value": "planned", "label": "Planned"},
+        "tags": [],
+        "custom_fields": {},
+        "serial": "abc",
+    },
+]
+
+
+def has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+class ColumnsTestCase(unittest.TestCase):
+    def test_flatten(self):
+        columns = Columns().fill(ROWS)
+        self.assertEqual(columns.rows, 2)
+        self.assertEqual(columns.data["site.name"], ["site-1", None])
+        self.assertEqual(columns.data["status.value"], ["active", "planned"])
+        # A new column is backfilled for the earlier rows.
+        self.assertEqual(columns.data["serial"], [None, "abc"])
+        # The null object doesn't get a column of its own.
+        self.assertNotIn("site", columns.data)
+        self.assertEqual(columns.data["custom_fields"], [None, {}])
+        self.assertEqual(columns.data["custom_fields.owner.value"], ["x", None])
+
+    def test_choices(self):
+        columns = Columns().fill(ROWS)
+        self.assertEqual(columns.choices, {"status.value"})
+
+    def test_subset(self):
+        columns = Columns(["id", "site", "status.value"]).fill(ROWS)
+        self.assertEqual(
+            list(columns.data),
+            ["id", "site.id", "site.name", "site.slug", "status.value"],
+        )
+
+    def test_chunks(self):
+        columns = Columns()
+        with patch.object(Columns, "extend", wraps=columns.extend) as extend:
+            columns.fill(iter(ROWS * 3), chunk_rows=4)
+        self.assertEqual([len(c.args[0]) for c in extend.call_args_list], [4, 2])
+        self.assertEqual(columns.data["id"], [1, 2] * 3)
+
+
+class RecordSetColumnarTestCase(unittest.TestCase):
+    def recordset(self):
+        request = Mock()
+        request.get.return_value = iter(ROWS)
+        request.limit = None
+        return RecordSet(Mock(), request)
+
+    @unittest.skipIf(has_module("pandas"), "pandas is installed")
+    def test_missing_library(self):
+        with self.assertRaisesRegex(ImportError, "to_pandas.*pandas"):
+            self.recordset().to_pandas()
+
+    @unittest.skipUnless(has_module("pyarrow"), "requires pyarrow")
+    def test_to_arrow(self):
+        import pyarrow as pa
+
+        table = self.recordset().to_arrow(["id", "site.name", "status"])
+        # A nested object's name selects all of its columns.
+        self.assertEqual(
+            table.column_names, ["id", "site.name", "status.value", "status.label"]
+        )
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("status.value").type))
+        self.assertEqual(table.column("site.name").to_pylist(), ["site-1", None])
+
+    @unittest.skipUnless(has_module("pandas"), "requires pandas")
+    def test_to_pandas(self):
+        df = self.recordset().to_pandas()
+        self.assertEqual(str(df["status.value"].dtype), "category")
+        self.assertEqual(list(df["id"]), [1, 2])
+
+    @unittest.skipUnless(has_module("numpy"), "requires numpy")
+    def test_to_numpy(self):
+        arrays = self.recordset().to_numpy(["id", "serial"])
+        self.assertEqual(arrays["id"].tolist(), [1, 2])
+        self.assertEqual(arrays["serial"].dtype, object)
+
+
+if __name__ == "__main__":
+    unittest.main()
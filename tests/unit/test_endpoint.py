@@ -1,6 +1,10 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
+from urllib.parse import urlencode
 
+import pynetbox
+from pynetbox.core import batch
 from pynetbox.core.endpoint import Endpoint
 
 
@@ -240,3 +244,181 @@ class EndPointTestCase(unittest.TestCase):
             test = test_obj.update(changes)
             mock.assert_called_with(verb="patch", data=changes)
             self.assertTrue(test)
+
+
+class ProjectionTestCase(unittest.TestCase):
+    def _endpoint(self):
+        api = Mock(
+            base_url="http://localhost:8000/api",
+            strict_filters=False,
+            partial_records="raise",
+        )
+        return Endpoint(api, Mock(name="test"), "test")
+
+    def test_fields_comma_joined(self):
+        test = self._endpoint().filter(site="a", fields=["name", "primary_ip4"])
+        self.assertEqual(
+            test.request.filters, {"site": "a", "fields": "id,url,name,primary_ip4"}
+        )
+        self.assertEqual(test._partial, "raise")
+
+    def test_omit_never_drops_id(self):
+        test = self._endpoint().all(omit="config_context, id,comments")
+        self.assertEqual(test.request.filters, {"omit": "config_context,comments"})
+        self.assertEqual(test._partial, "raise")
+
+    def test_without_projection(self):
+        test = self._endpoint().all()
+        self.assertIsNone(test.request.filters)
+        self.assertIsNone(test._partial)
+
+    def test_get_by_key(self):
+        with patch(
+            "pynetbox.core.query.Request.get",
+            autospec=True,
+            return_value=iter([{"id": 1, "name": "dev1"}]),
+        ) as mock:
+            record = self._endpoint().get(1, fields=["name"])
+        request = mock.call_args.args[0]
+        self.assertEqual(request.key, 1)
+        self.assertEqual(request.filters, {"fields": "id,url,name"})
+        self.assertEqual(record.name, "dev1")
+        with self.assertRaises(AttributeError):
+            record.serial
+
+
+class GetManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api("http://localhost:8000", token="abc123")
+        self.requests = []
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self._get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, request, *args, **kwargs):
+        self.requests.append(request)
+        # Only even ids exist.
+        return iter(
+            [
+                {"id": i, "name": "dev{}".format(i)}
+                for i in request.filters["id"]
+                if i % 2 == 0
+            ]
+        )
+
+    def _url(self, request):
+        query = urlencode(dict(request.filters, limit=request.limit), doseq=True)
+        return "{}?{}".format(request.base, query)
+
+    def test_url_length_chunks(self):
+        ids = list(range(2000, 0, -1))
+        devices = self.api.dcim.devices.get_many(ids)
+        self.assertGreater(len(self.requests), 1)
+        for request in self.requests:
+            self.assertLessEqual(len(self._url(request)), batch.MAX_URL_LENGTH)
+        self.assertEqual(sum(len(r.filters["id"]) for r in self.requests), 2000)
+        self.assertEqual(list(devices), list(range(2000, 0, -2)))
+        self.assertEqual(devices[10].name, "dev10")
+        self.assertEqual(devices.missing, list(range(1999, 0, -2)))
+
+    def test_chunk_size(self):
+        devices = self.api.dcim.devices.get_many([1, 2, 3, 4, 2], chunk_size=2)
+        # Chunks are requested concurrently, in any order.
+        self.assertEqual(
+            sorted(r.filters["id"] for r in self.requests), [[1, 2], [3, 4]]
+        )
+        self.assertEqual(list(devices), [2, 4])
+        self.assertEqual(devices.missing, [1, 3])
+
+    def test_fields(self):
+        devices = self.api.dcim.devices.get_many([2], fields=["name"])
+        self.assertEqual(self.requests[0].filters["fields"], "id,url,name")
+        with self.assertRaises(AttributeError):
+            devices[2].serial
+
+    def test_empty(self):
+        devices = self.api.dcim.devices.get_many([])
+        self.assertEqual((devices, devices.missing), ({}, []))
+        self.assertEqual(self.requests, [])
+
+
+class SplitFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = pynetbox.api("http://localhost:8000", token="abc123")
+        self.requests = []
+        patcher = patch(
+            "pynetbox.core.query.Request.get", autospec=True, side_effect=self._get
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, request, *args, **kwargs):
+        self.requests.append(request)
+        # Device 0 matches every request.
+        names = ["device0"] + list(request.filters.get("name", []))
+        return iter([{"id": int(name[len("device") :])} for name in names])
+
+    def test_split(self):
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        devices = self.api.dcim.devices.filter(name=names, site="site-1", tag="a")
+        ids = [d.id for d in devices]
+        self.assertGreater(len(self.requests), 1)
+        for request in self.requests:
+            query = urlencode(dict(request.filters, limit=10000), doseq=True)
+            self.assertLessEqual(
+                len("{}/?{}".format(request.base, query)), batch.MAX_URL_LENGTH
+            )
+            self.assertEqual(request.filters["site"], "site-1")
+        self.assertEqual(sum(len(r.filters["name"]) for r in self.requests), 1000)
+        self.assertEqual(ids, [0] + list(range(1, 1001)))
+
+    def test_bounded_window(self):
+        submitted = []
+
+        class Executor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(*args, **kwargs)
+
+        self.api.max_workers = 2
+        self.api.thread_pool_executor = Executor
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        devices = iter(self.api.dcim.devices.filter(name=names))
+        next(devices)
+        # Two requests, and one more once the first result was handed out.
+        self.assertEqual(len(submitted), 3)
+        self.assertEqual(len(list(devices)), 1000)
+        self.assertEqual(len(submitted), len(self.requests))
+        self.assertGreater(len(submitted), 3)
+
+    def test_len(self):
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        devices = self.api.dcim.devices.filter(name=names, fields=["name"])
+        self.assertEqual(len(devices), 1001)
+        self.assertTrue(all(r.filters["brief"] == 1 for r in self.requests))
+        self.assertTrue(all("fields" not in r.filters for r in self.requests))
+        # The records are fetched apart from the count.
+        self.assertEqual(len(list(devices)), 1001)
+
+    def test_len_after_iteration(self):
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        devices = self.api.dcim.devices.filter(name=names)
+        list(devices)
+        requests = len(self.requests)
+        self.assertEqual(len(devices), 1001)
+        self.assertEqual(len(self.requests), requests)
+
+    def test_count(self):
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        self.assertEqual(self.api.dcim.devices.count(name=names), 1001)
+        self.assertGreater(len(self.requests), 1)
+
+    def test_no_split(self):
+        names = ["device{}".format(i) for i in range(1, 1001)]
+        [d.id for d in self.api.dcim.devices.filter(name=names[:10])]
+        [d.id for d in self.api.dcim.devices.filter(name__n=names)]
+        [d.id for d in self.api.dcim.devices.filter(tag=names)]
+        [d.id for d in self.api.dcim.devices.filter(name=names, limit=10, offset=0)]
+        self.assertEqual(len(self.requests), 4)
@@ -1,8 +1,16 @@
 import concurrent.futures
+import threading
+import time
 import unittest
 from unittest.mock import Mock
+from urllib.parse import parse_qsl
 
-from pynetbox.core.query import Request, _is_v2_token
+from pynetbox.core.query import (
+    AdaptivePageSize,
+    Request,
+    RequestError,
+    _is_v2_token,
+)
 
 
 class RequestTestCase(unittest.TestCase):
@@ -276,6 +284,38 @@ class ConcurrentGetTestCase(unittest.TestCase):
         self.assertEqual(len(ret), 6)
         self.assertEqual(test_obj._make_call.call_count, 3)
 
+    def test_threaded_get_streams_pages_in_order(self):
+        """Pages are yielded in offset order with a bounded window."""
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=0,
+            threading=True,
+            max_workers=2,
+        )
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def make_call(add_params=None, url_override=None):
+            offset = (add_params or {}).get("offset", 0)
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            # Later pages finish first.
+            time.sleep(0.01 * (10 - offset) if offset else 0)
+            with lock:
+                state["in_flight"] -= 1
+            return {
+                "count": 9,
+                "next": "next" if offset < 8 else None,
+                "results": list(range(offset, min(offset + 2, 9))),
+            }
+
+        test_obj._make_call = Mock(side_effect=make_call)
+
+        self.assertEqual(list(test_obj.get()), list(range(9)))
+        self.assertLessEqual(state["peak"], 2)
+
     def test_none_executor_falls_back_to_default(self):
         """Passing None explicitly resolves to the stdlib default."""
         test_obj = self._request(thread_pool_executor=None)
@@ -284,6 +324,250 @@ class ConcurrentGetTestCase(unittest.TestCase):
         )
 
 
+class ReadAheadTestCase(unittest.TestCase):
+    """Tests for pipelined page fetching with read_ahead."""
+
+    def _request(self, pages, **kwargs):
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=0,
+            **kwargs,
+        )
+        self.requested = []
+
+        def make_call(add_params=None, url_override=None):
+            self.requested.append(url_override or add_params)
+            if url_override:
+                return pages[url_override]
+            return pages[(add_params or {}).get("offset", 0)]
+
+        test_obj._make_call = Mock(side_effect=make_call)
+        return test_obj
+
+    def test_offset_pages_yielded_in_order(self):
+        pages = {
+            offset: {
+                "count": 7,
+                "next": "next" if offset < 6 else None,
+                "results": list(range(offset, min(offset + 2, 7))),
+            }
+            for offset in (0, 2, 4, 6)
+        }
+        test_obj = self._request(pages, read_ahead=2)
+
+        self.assertEqual(list(test_obj.get()), list(range(7)))
+        self.assertEqual(
+            self.requested[1:],
+            [{"offset": o, "limit": 2} for o in (2, 4, 6)],
+        )
+
+    def test_next_page_requested_before_current_is_consumed(self):
+        pages = {
+            0: {"count": 5, "next": "next", "results": [0, 1]},
+            2: {"count": 5, "next": "next", "results": [2, 3]},
+            4: {"count": 5, "next": None, "results": [4]},
+        }
+        test_obj = self._request(pages, read_ahead=1)
+        fetched = threading.Event()
+        make_call = test_obj._make_call.side_effect
+
+        def signal(add_params=None, url_override=None):
+            if add_params and add_params.get("offset") == 2:
+                fetched.set()
+            return make_call(add_params=add_params, url_override=url_override)
+
+        test_obj._make_call.side_effect = signal
+
+        results = test_obj.get()
+        self.assertEqual(next(results), 0)
+        # Page two is in flight while the first page is still being consumed.
+        self.assertTrue(fetched.wait(timeout=5))
+        self.assertEqual(list(results), [1, 2, 3, 4])
+
+    def test_cursor_follows_next_links(self):
+        pages = {
+            0: {"count": None, "next": "page2", "results": [1, 2]},
+            "page2": {"count": None, "next": "page3", "results": [3]},
+            "page3": {"count": None, "next": None, "results": [4]},
+        }
+        test_obj = self._request(pages, read_ahead=1, pagination="cursor")
+        test_obj._make_call.side_effect = lambda add_params=None, url_override=None: (
+            pages[url_override or 0]
+        )
+
+        self.assertEqual(list(test_obj.get()), [1, 2, 3, 4])
+        self.assertEqual(test_obj._make_call.call_count, 3)
+
+
+class ShardedCursorTestCase(unittest.TestCase):
+    """Tests for cursor pagination split into concurrent id ranges."""
+
+    ids = [3, 4, 7, 10, 11, 12, 15, 19, 20, 26]
+
+    def make_call(self, add_params=None, url_override=None):
+        params = dict(add_params or {})
+        if url_override:
+            params = {k: int(v) for k, v in parse_qsl(url_override)}
+        self.calls.append(params)
+        if "ordering" in params:
+            ordered = sorted(self.ids, reverse=params["ordering"] == "-id")
+            return {"count": len(ordered), "results": [{"id": ordered[0]}]}
+        start, stop = params["start"], params["id__lt"]
+        matching = [i for i in self.ids if start <= i < stop][:2]
+        more = [i for i in self.ids if matching[-1] < i < stop] if matching else []
+        next_url = "start={}&id__lt={}".format(more[0], stop) if more else None
+        return {
+            "count": None,
+            "next": next_url,
+            "results": [{"id": i} for i in matching],
+        }
+
+    def _request(self, **kwargs):
+        self.calls = []
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=0,
+            pagination="cursor",
+            **kwargs,
+        )
+        test_obj._make_call = Mock(side_effect=self.make_call)
+        return test_obj
+
+    def test_shards_cover_id_span(self):
+        test_obj = self._request(cursor_shards=3)
+        ids = [r["id"] for r in test_obj.get()]
+        self.assertEqual(sorted(ids), self.ids)
+        self.assertEqual(test_obj.count, len(self.ids))
+        shard_starts = [c for c in self.calls if c.get("limit") == 0]
+        self.assertEqual(
+            [(c["start"], c["id__lt"]) for c in shard_starts],
+            [(3, 11), (11, 19), (19, 27)],
+        )
+
+    def test_ordered_shards_yield_in_id_order(self):
+        test_obj = self._request(cursor_shards=4, cursor_shards_ordered=True)
+        self.assertEqual([r["id"] for r in test_obj.get()], self.ids)
+
+    def test_id_filter_disables_sharding(self):
+        test_obj = self._request(cursor_shards=4, filters={"id__gte": 5})
+        test_obj._make_call = Mock(
+            return_value={"count": None, "next": None, "results": [{"id": 7}]}
+        )
+        self.assertEqual(list(test_obj.get()), [{"id": 7}])
+        test_obj._make_call.assert_called_once_with(add_params={"limit": 0, "start": 0})
+
+    def test_shard_error_is_raised(self):
+        test_obj = self._request(cursor_shards=2)
+
+        def failing(add_params=None, url_override=None):
+            if add_params and "start" in add_params and add_params["start"] > 3:
+                raise RequestError(Mock(status_code=500))
+            return self.make_call(add_params=add_params, url_override=url_override)
+
+        test_obj._make_call.side_effect = failing
+        with self.assertRaises(RequestError):
+            list(test_obj.get())
+
+    def test_empty_result(self):
+        test_obj = self._request(cursor_shards=2)
+        test_obj._make_call = Mock(return_value={"count": 0, "results": []})
+        self.assertEqual(list(test_obj.get()), [])
+        self.assertEqual(test_obj._make_call.call_count, 1)
+
+
+class AdaptivePageSizeTestCase(unittest.TestCase):
+    """Tests for the adaptive page size controller and its use in get()."""
+
+    url = "http://localhost:8001/api/dcim/devices/"
+
+    def test_grows_when_fast(self):
+        controller = AdaptivePageSize(initial=100, max_size=1000)
+        controller.record(self.url, 100, 100, 0.1, 10_000, True)
+        self.assertEqual(controller.size(self.url), 200)
+
+    def test_shrinks_when_slow_or_large(self):
+        controller = AdaptivePageSize(initial=100, target_seconds=1.0)
+        controller.record(self.url, 100, 100, 4.0, 10_000, True)
+        self.assertEqual(controller.size(self.url), 50)
+
+        controller = AdaptivePageSize(initial=100, max_bytes=1000)
+        controller.record(self.url, 100, 100, 0.1, 1600, True)
+        self.assertEqual(controller.size(self.url), 62)
+
+    def test_respects_bounds(self):
+        controller = AdaptivePageSize(initial=100, min_size=80, max_size=150)
+        controller.record(self.url, 100, 100, 0.01, 100, True)
+        self.assertEqual(controller.size(self.url), 150)
+        controller.record(self.url, 150, 150, 100.0, 100, True)
+        self.assertEqual(controller.size(self.url), 80)
+
+    def test_discovers_server_max_page_size(self):
+        controller = AdaptivePageSize(initial=500, max_size=5000)
+        controller.record(self.url, 500, 200, 0.01, 100, True)
+        self.assertEqual(controller.server_max(self.url), 200)
+        self.assertEqual(controller.size(self.url), 200)
+        # The last page being short is not a cap.
+        controller.record("other", 500, 10, 0.01, 100, False)
+        self.assertIsNone(controller.server_max("other"))
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            AdaptivePageSize(initial=10, min_size=20)
+
+    def test_get_sizes_each_page(self):
+        rows = list(range(10))
+        controller = Mock(wraps=AdaptivePageSize(initial=2, min_size=1))
+        controller.size.side_effect = [2, 3, 5]
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=0,
+            page_size_controller=controller,
+        )
+        test_obj.http_session.get.return_value.content = b"x" * 10
+
+        def page(url, params=None, **kwargs):
+            offset, limit = params["offset"], params["limit"]
+            response = test_obj.http_session.get.return_value
+            response.json.return_value = {
+                "count": len(rows),
+                "next": "next" if offset + limit < len(rows) else None,
+                "results": rows[offset : offset + limit],
+            }
+            return response
+
+        test_obj.http_session.get.side_effect = page
+
+        self.assertEqual(list(test_obj.get()), rows)
+        self.assertEqual(test_obj.count, 10)
+        self.assertEqual(
+            [c.kwargs["params"] for c in test_obj.http_session.get.call_args_list],
+            [
+                {"offset": 0, "limit": 2},
+                {"offset": 2, "limit": 3},
+                {"offset": 5, "limit": 5},
+            ],
+        )
+        self.assertEqual(controller.record.call_count, 3)
+        self.assertEqual(controller.record.call_args.args[4], 10)
+
+    def test_explicit_limit_is_not_adapted(self):
+        controller = Mock()
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=50,
+            page_size_controller=controller,
+        )
+        test_obj._make_call = Mock(
+            return_value={"count": 1, "next": None, "results": [1]}
+        )
+        self.assertEqual(list(test_obj.get()), [1])
+        controller.size.assert_not_called()
+
+
 class TokenDetectionTestCase(unittest.TestCase):
     """Tests for v1 vs v2 token detection."""
 
@@ -0,0 +1,154 @@
+import pickle
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import pynetbox
+from pynetbox.core.ratelimit import RateLimiter, TokenBucket
+from pynetbox.core.transport import PynetboxAdapter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("pynetbox.core.ratelimit.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        # Further requests queue behind each other at the refill rate.
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.5, 1.0])
+
+    def test_refills_up_to_burst(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        bucket.reserve(), bucket.reserve()
+        self.clock.now += 60
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 1.0])
+
+    def test_default_burst(self):
+        self.assertEqual(TokenBucket(rate=2.5).burst, 3)
+        self.assertEqual(TokenBucket(rate=0.1).burst, 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    url = "http://localhost:8000/api/dcim/interfaces/"
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("pynetbox.core.ratelimit.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_global_rate(self):
+        limiter = RateLimiter(rate=10, burst=1)
+        for _ in range(3):
+            limiter.acquire("GET", self.url)
+        self.assertEqual(self.clock.sleeps, [0.1, 0.1])
+        self.assertEqual(limiter.throttled, 2)
+        self.assertAlmostEqual(limiter.waited, 0.2)
+
+    def test_endpoint_budget(self):
+        limiter = RateLimiter(budgets={"dcim/interfaces": (1, 1)})
+        limiter.acquire("GET", self.url)
+        limiter.acquire("GET", self.url + "1/")
+        self.assertEqual(self.clock.sleeps, [1.0])
+        # Other endpoints are not affected.
+        limiter.acquire("GET", "http://localhost:8000/api/dcim/devices/")
+        limiter.acquire("GET", "http://localhost:8000/api/dcim/interface-templates/")
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+    def test_verb_budget(self):
+        limiter = RateLimiter(budgets={"POST": (1, 1), "PATCH dcim/interfaces": 1})
+        limiter.acquire("post", self.url)
+        limiter.acquire("GET", self.url)
+        limiter.acquire("PATCH", "http://localhost:8000/api/dcim/devices/")
+        self.assertEqual(self.clock.sleeps, [])
+        limiter.acquire("POST", "http://localhost:8000/api/dcim/devices/")
+        limiter.acquire("PATCH", self.url)
+        limiter.acquire("PATCH", self.url)
+        self.assertEqual(self.clock.sleeps, [1.0, 1.0])
+
+    def test_waits_for_slowest_bucket(self):
+        limiter = RateLimiter(rate=10, burst=1, budgets={"GET": (2, 1)})
+        limiter.acquire("GET", self.url)
+        limiter.acquire("GET", self.url)
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_pickle(self):
+        limiter = RateLimiter(rate=5, budgets={"POST": 1})
+        restored = pickle.loads(pickle.dumps(limiter))
+        self.assertEqual(restored.bucket.rate, 5)
+        self.assertEqual(restored.budgets[("POST", None)].rate, 1)
+
+
+class AdapterRateLimitTestCase(unittest.TestCase):
+    def test_shared_across_threads(self):
+        # A clock that doesn't advance: every request after the first waits.
+        clock = FakeClock()
+        clock.sleep = lambda seconds: None
+        patcher = patch("pynetbox.core.ratelimit.time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        limiter = RateLimiter(rate=1, burst=1)
+        adapter = PynetboxAdapter(rate_limiter=limiter)
+        calls = []
+
+        def send(self, request, **kwargs):
+            calls.append(request.url)
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        with patch.object(requests.adapters.HTTPAdapter, "send", send):
+            threads = [
+                threading.Thread(
+                    target=session.get, args=("http://localhost:8000/api/",)
+                )
+                for _ in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 10)
+        self.assertEqual(limiter.throttled, 9)
+
+    def test_api_rate_limit(self):
+        nb = pynetbox.api("http://localhost:8000")
+        self.assertIsNone(nb.rate_limiter)
+        nb = pynetbox.api("http://localhost:8000", rate_limit=5)
+        self.assertEqual(nb.rate_limiter.bucket.rate, 5)
+        adapter = nb.http_session.get_adapter("https://x/")
+        self.assertIs(adapter.rate_limiter, nb.rate_limiter)
+        limiter = RateLimiter(budgets={"POST": 1})
+        nb = pynetbox.api("http://localhost:8000", rate_limit=limiter)
+        self.assertIs(nb.rate_limiter, limiter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,20 @@
+import copy
+import gc
+import pickle
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
+import pynetbox
 from pynetbox.core.endpoint import Endpoint
-from pynetbox.core.response import Record, RecordSet, flatten_custom
+from pynetbox.core.response import (
+    CompactRecord,
+    FieldTable,
+    Record,
+    RecordSet,
+    flatten_custom,
+)
 
 
 class FlattenCustomTest(unittest.TestCase):
@@ -331,6 +343,7 @@ class RecordTestCase(unittest.TestCase):
         app = Mock()
         app.token = "abc123"
         app.base_url = "http://localhost:8080/api"
+        app.json_codec = None
         endpoint = Mock()
         endpoint.name = "test-endpoint"
         test = Record(
@@ -364,6 +377,7 @@ class RecordTestCase(unittest.TestCase):
         app = Mock()
         app.token = "abc123"
         app.base_url = "http://localhost:8080/testing/api"
+        app.json_codec = None
         endpoint = Mock()
         endpoint.name = "test-endpoint"
         test = Record(
@@ -485,6 +499,7 @@ class RecordTestCase(unittest.TestCase):
         api = Mock()
         api.token = "abc123"
         api.base_url = "http://localhost:8000/api"
+        api.json_codec = None
 
         endpoint = Mock()
         endpoint.url = "http://localhost:8000/api/dcim/interfaces/"
@@ -783,6 +798,124 @@ class RecordTestCase(unittest.TestCase):
         self.assertEqual(record.link_peers[0].id, 99)
 
 
+class PartialRecordTestCase(unittest.TestCase):
+    values = {
+        "id": 1,
+        "url": "http://localhost:8080/api/test/test/1/",
+        "name": "test",
+    }
+
+    def _record(self, policy):
+        api = Mock(base_url="http://localhost:8080/api")
+        record = Record(self.values, api, Mock())
+        record._partial = policy
+        return record
+
+    def test_raise(self):
+        record = self._record("raise")
+        with patch.object(Record, "full_details") as full_details:
+            with self.assertRaises(AttributeError) as cm:
+                record.serial
+            self.assertIsNone(getattr(record, "serial", None))
+            full_details.assert_not_called()
+        self.assertIn("'serial' was not fetched", str(cm.exception))
+        self.assertEqual(dict(record), self.values)
+
+    def test_fetch(self):
+        record = self._record("fetch")
+
+        def load():
+            record._parse_values(dict(self.values, serial="ABC"))
+            record.has_details = True
+            return True
+
+        with patch.object(Record, "full_details", side_effect=load) as full_details:
+            self.assertEqual(record.serial, "ABC")
+            with self.assertRaises(AttributeError):
+                record.asset_tag
+            full_details.assert_called_once_with()
+        self.assertIsNone(record._partial)
+
+    def test_save_only_sends_fetched_changes(self):
+        record = self._record("raise")
+        record.name = "renamed"
+        self.assertEqual(record.updates(), {"name": "renamed"})
+
+
+class LazyRecordTestCase(unittest.TestCase):
+    values = {
+        "id": 1,
+        "name": "test",
+        "site": {"id": 2, "name": "site1", "url": "http://localhost/api/dcim/sites/2/"},
+        "status": {"value": "active", "label": "Active"},
+        "tags": [{"id": 3, "name": "tag1"}, {"id": 4, "name": "tag2"}],
+        "tagged_vlans": [1, 2],
+        "custom_fields": {"cf": {"id": 5, "name": "x"}, "num": 1},
+    }
+
+    def _record(self, lazy=True):
+        api = Mock(base_url="http://localhost/api", lazy_records=lazy)
+        return Record(copy.deepcopy(self.values), api, None)
+
+    def test_nested_values_deferred(self):
+        record = self._record()
+        self.assertEqual(record.name, "test")
+        self.assertEqual(record.tagged_vlans, [1, 2])
+        for field in ("site", "status", "tags", "custom_fields"):
+            self.assertNotIn(field, record.__dict__)
+        site = record.site
+        self.assertIsInstance(site, Record)
+        self.assertIs(record.site, site)
+        self.assertEqual(set(record._lazy), {"status", "tags", "custom_fields"})
+
+    def test_same_state_as_eager(self):
+        lazy, eager = self._record(), self._record(lazy=False)
+        self.assertEqual(lazy.serialize(), eager.serialize())
+        self.assertEqual(lazy.serialize(init=True), eager.serialize(init=True))
+        self.assertEqual(dict(self._record()), dict(eager))
+        self.assertEqual(list(dict(self._record())), list(self.values))
+
+    def test_no_updates_when_untouched(self):
+        record = self._record()
+        record.site
+        self.assertEqual(record.updates(), {})
+
+    def test_copy(self):
+        record = self._record()
+        copied = copy.copy(record)
+        self.assertEqual(copied.site.id, 2)
+        self.assertIn("site", record._lazy)
+        with patch.object(Record, "full_details") as full_details:
+            self.assertEqual(record.site.id, 2)
+        full_details.assert_not_called()
+        self.assertEqual(record.updates(), {})
+        self.assertEqual(copied.updates(), {})
+
+    def test_pickle(self):
+        api = pynetbox.api("http://localhost", lazy_records=True)
+        record = Record(copy.deepcopy(self.values), api, api.dcim.devices)
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertIn("site", restored._lazy)
+        self.assertEqual(restored.site.id, 2)
+        self.assertEqual(restored.updates(), {})
+        self.assertEqual(restored.serialize(init=True), record.serialize(init=True))
+
+    def test_updates_for_unread_fields(self):
+        record = self._record()
+        record.tags = [4]
+        record.custom_fields["num"] = 2
+        self.assertEqual(
+            record.updates(), {"tags": [4], "custom_fields": {"cf": 5, "num": 2}}
+        )
+        self.assertEqual(record.serialize(init=True)["tags"], [3, 4])
+
+    def test_eager_with_mock_api(self):
+        # Only an explicit True enables lazy parsing.
+        api = Mock(base_url="http://localhost/api")
+        record = Record(copy.deepcopy(self.values), api, None)
+        self.assertIn("site", record.__dict__)
+
+
 class RecordSetTestCase(unittest.TestCase):
     ids = [1, 3, 5]
 
@@ -815,6 +948,56 @@ class RecordSetTestCase(unittest.TestCase):
             )
             self.assertTrue(test)
 
+    def test_raw(self):
+        test_obj = RecordSetTestCase.init_recordset()
+        test_obj.endpoint.return_obj = Mock()
+        test = list(test_obj.raw())
+        test_obj.endpoint.return_obj.assert_not_called()
+        self.assertEqual(test[0], {"id": 1, "name": "dummy1", "status": "active"})
+        self.assertEqual(len(test), 3)
+
+    def test_values(self):
+        test_obj = RecordSetTestCase.init_recordset()
+        self.assertEqual(
+            list(test_obj.values("id", "site.name")),
+            [{"id": i, "site.name": None} for i in RecordSetTestCase.ids],
+        )
+
+    def test_values_list(self):
+        self.assertEqual(
+            list(RecordSetTestCase.init_recordset().values_list("id", "name"))[0],
+            (1, "dummy1"),
+        )
+        self.assertEqual(
+            list(RecordSetTestCase.init_recordset().values_list("id", flat=True)),
+            RecordSetTestCase.ids,
+        )
+        with self.assertRaises(TypeError):
+            next(
+                RecordSetTestCase.init_recordset().values_list("id", "name", flat=True)
+            )
+
+    def test_raw_stopped_partway(self):
+        test_obj = RecordSetTestCase.init_recordset()
+        # A generator, like Request.get(): it can be closed.
+        test_obj.response = (values for values in list(test_obj.response))
+        raw = test_obj.raw()
+        next(raw)
+        raw.close()
+        values = test_obj.values_list("id", flat=True)
+        self.assertEqual(next(values), 3)
+        del values
+        self.assertEqual([r.id for r in test_obj], [5])
+
+    def test_raw_after_len(self):
+        test_obj = RecordSetTestCase.init_recordset()
+        data = [{"id": 1, "site": {"name": "site1"}}, {"id": 2, "site": None}]
+        test_obj.response = iter(data)
+        test_obj._response_cache.append(next(test_obj.response))
+        self.assertEqual(
+            list(test_obj.values_list("site.name", flat=True)), ["site1", None]
+        )
+
     def test_len_fetches_count_in_cursor_mode(self):
         """len() falls back to get_count() when count is None (cursor mode)."""
         from pynetbox.core.query import Request
@@ -850,3 +1033,223 @@ class RecordSetTestCase(unittest.TestCase):
                 data=[{"id": i, "status": "offline"} for i in RecordSetTestCase.ids],
             )
             self.assertTrue(test)
+
+
+class CompactRecordTestCase(unittest.TestCase):
+    values = {
+        "id": 1,
+        "address": "10.0.0.1/24",
+        "vrf": None,
+        "status": {"value": "active", "label": "Active"},
+        "tags": [{"id": 3, "name": "tag1"}],
+        "tagged_vlans": [1, 2],
+        "custom_fields": {"cf": {"id": 5}},
+    }
+
+    def _endpoint(self):
+        api = Mock(base_url="http://localhost:8000/api", token="abc")
+        endpoint = Endpoint(api, Mock(name="ipam"), "ip_addresses")
+        return endpoint
+
+    def test_attributes_and_dict(self):
+        record = FieldTable().pack(copy.deepcopy(self.values))
+        self.assertIsInstance(record, CompactRecord)
+        self.assertEqual(record.address, "10.0.0.1/24")
+        self.assertIsNone(record.vrf)
+        self.assertEqual(record.status.label, "Active")
+        self.assertEqual(record.tags[0].name, "tag1")
+        self.assertEqual(record["tagged_vlans"], (1, 2))
+        self.assertEqual(record.custom_fields, {"cf": {"id": 5}})
+        self.assertEqual(dict(record), dict(self.values, tagged_vlans=[1, 2]))
+        self.assertEqual(str(record.tags[0]), "tag1")
+        with self.assertRaises(AttributeError):
+            record.address = "10.0.0.2/24"
+
+    def test_shared_table_with_different_shapes(self):
+        table = FieldTable()
+        first = table.pack({"id": 1, "address": "10.0.0.1/24"})
+        second = table.pack({"id": 2, "dns_name": "a.example.com"})
+        self.assertEqual(table.names, ["id", "address", "dns_name"])
+        self.assertIs(first._table, second._table)
+        self.assertEqual(dict(first), {"id": 1, "address": "10.0.0.1/24"})
+        with self.assertRaises(AttributeError):
+            first.dns_name
+        with self.assertRaises(AttributeError):
+            second.address
+        self.assertNotIn("address", second)
+        self.assertIsNone(getattr(second, "address", None))
+
+    def test_shared_table_across_threads(self):
+        class SlowList(list):
+            # Switch threads while a new field is being added.
+            def append(self, item):
+                time.sleep(0.001)
+                super().append(item)
+
+        table = FieldTable()
+        table.names = SlowList()
+        rows = [
+            {"id": i, "f{}".format(i): i, "g{}".format(i % 4): i} for i in range(40)
+        ]
+        with ThreadPoolExecutor(8) as pool:
+            records = list(pool.map(table.pack, rows))
+        self.assertEqual(sorted(table.index.values()), list(range(45)))
+        self.assertEqual([dict(r) for r in records], rows)
+
+    def test_recordset_compact(self):
+        endpoint = self._endpoint()
+        rows = [dict(self.values, id=i) for i in range(3)]
+        request = Mock()
+        request.get.return_value = iter(rows)
+        records = list(RecordSet(endpoint, request).compact())
+        self.assertTrue(all(isinstance(r, CompactRecord) for r in records))
+        self.assertIs(records[0]._table, endpoint._field_table())
+        self.assertEqual([r.id for r in records], [0, 1, 2])
+        self.assertEqual(len({r for r in records}), 3)
+
+    def test_endpoint_compact_records(self):
+        endpoint = self._endpoint()
+        endpoint.compact_records = True
+        request = Mock()
+        request.get.return_value = iter([self.values])
+        record = next(RecordSet(endpoint, request))
+        self.assertIsInstance(record, CompactRecord)
+        full = record.to_record()
+        self.assertIsInstance(full, Record)
+        self.assertEqual(full.status.value, "active")
+
+    def test_nested_endpoint(self):
+        api = pynetbox.api("http://localhost:8000", token="abc123")
+        table = FieldTable(api.dcim.devices)
+        device = table.pack(
+            {
+                "id": 1,
+                "url": "http://localhost:8000/api/dcim/devices/1/",
+                "site": {
+                    "id": 1,
+                    "url": "http://localhost:8000/api/dcim/sites/1/",
+                    "slug": "site-1",
+                },
+                "status": {"value": "active", "label": "Active"},
+            }
+        )
+        self.assertNotEqual(device.site, device)
+        self.assertEqual(device.site, table.pack({"site": dict(device.site)}).site)
+        site = device.site.to_record()
+        self.assertIs(type(site), api.dcim.sites.return_obj)
+        self.assertIs(site.endpoint, api.dcim.sites)
+        self.assertEqual(type(device.to_record()).__name__, "Devices")
+        # Without a url, the endpoint of a nested object is unknown.
+        self.assertNotEqual(device.status, table.pack(dict(device)).status)
+        self.assertEqual(device.status, device.status)
+        with self.assertRaises(ValueError):
+            device.status.to_record()
+
+    def test_pickle(self):
+        record = FieldTable().pack(copy.deepcopy(self.values))
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertEqual(dict(restored), dict(record))
+
+
+class IdentityMapTestCase(unittest.TestCase):
+    site_url = "http://localhost:8000/api/dcim/sites/2/"
+
+    def setUp(self):
+        self.api = pynetbox.api("http://localhost:8000", token="abc123")
+
+    def _devices(self, count=2, api=None):
+        api = api or self.api
+        return [
+            Record(
+                {
+                    "id": i,
+                    "name": "dev{}".format(i),
+                    "site": {"id": 2, "name": "site1", "url": self.site_url},
+                    "tags": [
+                        {
+                            "id": 3,
+                            "name": "tag1",
+                            "url": "http://localhost:8000/api/extras/tags/3/",
+                        }
+                    ],
+                },
+                api,
+                api.dcim.devices,
+            )
+            for i in range(count)
+        ]
+
+    def test_not_shared_by_default(self):
+        first, second = self._devices()
+        self.assertIsNot(first.site, second.site)
+        first.site.name = "changed"
+
+    def test_context_manager(self):
+        with pynetbox.identity_map() as imap:
+            first, second = self._devices()
+        self.assertIs(first.site, second.site)
+        self.assertIs(first.tags[0], second.tags[0])
+        self.assertIsInstance(first.site, Record)
+        self.assertEqual(len(imap), 2)
+        self.assertEqual((imap.hits, imap.misses), (2, 2))
+        # The parent records are unaffected.
+        self.assertEqual(first.serialize()["site"], 2)
+        self.assertEqual(first.serialize()["tags"], [3])
+
+    def test_read_only(self):
+        with pynetbox.identity_map():
+            device = self._devices(1)[0]
+        with self.assertRaises(AttributeError):
+            device.site.name = "changed"
+        with self.assertRaises(AttributeError):
+            del device.site.name
+        editable = copy.copy(device.site)
+        self.assertIs(type(editable), Record)
+        editable.name = "changed"
+        self.assertEqual(device.site.name, "site1")
+        restored = pickle.loads(pickle.dumps(device))
+        self.assertIs(type(restored.site), Record)
+        self.assertEqual(restored.site.name, "site1")
+
+    @patch("pynetbox.core.query.Request.get")
+    def test_full_details_upgrades_all(self, get):
+        get.side_effect = lambda: iter(
+            [{"id": 2, "name": "site1", "url": self.site_url, "facility": "DC1"}]
+        )
+        with pynetbox.identity_map():
+            first, second = self._devices()
+        self.assertEqual(first.site.facility, "DC1")
+        self.assertEqual(second.site.facility, "DC1")
+        self.assertEqual(get.call_count, 1)
+        with self.assertRaises(AttributeError):
+            second.site.facility = "DC2"
+
+    def test_api_scope(self):
+        api = pynetbox.api("http://localhost:8000", identity_map=True)
+        first, second = self._devices(api=api)
+        self.assertIs(first.site, second.site)
+        self.assertEqual(len(api.identity_map), 2)
+        del first, second
+        gc.collect()
+        self.assertEqual(len(api.identity_map), 0)
+
+    def test_lazy_records(self):
+        api = pynetbox.api("http://localhost:8000", lazy_records=True)
+        with pynetbox.identity_map():
+            first, second = self._devices(api=api)
+        # Parsed after the block, through the map captured by the records.
+        self.assertIs(first.site, second.site)
+
+    def test_recordset(self):
+        request = Mock()
+        request.get.return_value = iter(
+            [
+                {"id": i, "site": {"id": 2, "name": "site1", "url": self.site_url}}
+                for i in range(3)
+            ]
+        )
+        endpoint = self.api.dcim.devices
+        devices = list(RecordSet(endpoint, request).share_nested())
+        self.assertIs(devices[0].site, devices[2].site)
+        # Not shared outside of the RecordSet.
+        self.assertIsNot(self._devices(1)[0].site, devices[0].site)
@@ -0,0 +1,118 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from pynetbox.core.query import ContentError, Request
+from pynetbox.core.streaming import StreamedPage
+
+
+def chunked(body, size):
+    raw = json.dumps(body).encode("utf-8")
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+class StreamedPageTestCase(unittest.TestCase):
+    page = {
+        "count": 3,
+        "next": "http://localhost:8001/api/dcim/devices/?limit=3&offset=3",
+        "previous": None,
+        "results": [
+            {"id": 1, "name": "dév1", "weight": 12345, "tags": []},
+            {"id": 2, "name": "dev2", "weight": 1.25, "tags": [True, None]},
+            {"id": 3, "name": "dev3", "weight": -7, "tags": [{"x": "]}"}]},
+        ],
+    }
+
+    def test_results_across_chunk_boundaries(self):
+        # Single-byte chunks split numbers, strings and multi-byte characters.
+        for size in (1, 3, 16, 4096):
+            page = StreamedPage(chunked(self.page, size))
+            self.assertTrue(page.paginated)
+            self.assertEqual(page.meta["count"], 3)
+            self.assertEqual(page.meta["next"], self.page["next"])
+            self.assertEqual(list(page.results()), self.page["results"])
+            self.assertEqual(page.received, 3)
+
+    def test_first_item_before_body_is_read(self):
+        chunks = iter(chunked(self.page, 8))
+        page = StreamedPage(chunks)
+        results = page.results()
+        self.assertEqual(next(results)["id"], 1)
+        self.assertTrue(list(chunks))
+
+    def test_members_after_results(self):
+        body = {"results": [{"id": 1}], "count": 1, "next": None}
+        page = StreamedPage(chunked(body, 5))
+        self.assertNotIn("count", page.meta)
+        self.assertEqual(list(page.results()), [{"id": 1}])
+        self.assertEqual(page.meta, {"count": 1, "next": None})
+
+    def test_top_level_list_and_object(self):
+        page = StreamedPage(chunked([{"id": 1}, {"id": 2}], 4))
+        self.assertTrue(page.is_list)
+        self.assertEqual(list(page.results()), [{"id": 1}, {"id": 2}])
+
+        page = StreamedPage(chunked({"id": 10, "name": "dev"}, 4))
+        self.assertFalse(page.paginated)
+        self.assertEqual(page.meta, {"id": 10, "name": "dev"})
+
+    def test_closes_when_abandoned(self):
+        close = Mock()
+        page = StreamedPage(chunked(self.page, 8), close=close)
+        results = page.results()
+        next(results)
+        results.close()
+        close.assert_called_once_with()
+
+    def test_invalid_json(self):
+        with self.assertRaises(ValueError):
+            StreamedPage([b"<html>", b"</html>"])
+        page = StreamedPage([b'{"count": 1, "results": [{"id": 1}, {"id"'])
+        with self.assertRaises(ValueError):
+            list(page.results())
+
+
+class StreamingRequestTestCase(unittest.TestCase):
+    def _request(self, pages, **kwargs):
+        test_obj = Request(
+            http_session=Mock(),
+            base="http://localhost:8001/api/dcim/devices",
+            limit=0,
+            streaming=True,
+            **kwargs,
+        )
+
+        def get(url, params=None, stream=False, **kw):
+            self.assertTrue(stream)
+            response = Mock(ok=True, status_code=200)
+            response.iter_content.return_value = chunked(pages.pop(0), 7)
+            return response
+
+        test_obj.http_session.get.side_effect = get
+        return test_obj
+
+    def test_follows_pages(self):
+        pages = [
+            {"count": 3, "next": "next", "results": [{"id": 1}, {"id": 2}]},
+            {"count": 3, "next": None, "results": [{"id": 3}]},
+        ]
+        test_obj = self._request(pages)
+        results = test_obj.get()
+        self.assertEqual(next(results), {"id": 1})
+        self.assertEqual(test_obj.count, 3)
+        self.assertEqual(list(results), [{"id": 2}, {"id": 3}])
+        params = test_obj.http_session.get.call_args.kwargs["params"]
+        self.assertEqual(params, {"limit": 3, "offset": 2})
+
+    def test_invalid_json_raises_content_error(self):
+        test_obj = self._request([])
+        response = Mock(ok=True, status_code=200)
+        response.iter_content.return_value = [b"<html>"]
+        test_obj.http_session.get.side_effect = None
+        test_obj.http_session.get.return_value = response
+        with self.assertRaises(ContentError):
+            list(test_obj.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
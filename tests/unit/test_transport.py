@@ -0,0 +1,422 @@
+import http.server
+import pickle
+import socket
+import threading
+import time
+import unittest
+import warnings
+from unittest.mock import Mock, patch
+
+import requests
+from urllib3.util.retry import RequestHistory
+
+import pynetbox
+from pynetbox.core.query import RequestError
+from pynetbox.core.ratelimit import RateLimiter
+from pynetbox.core.transport import (
+    PoolStats,
+    PynetboxAdapter,
+    RetryPolicy,
+    RetryStats,
+    SingleFlight,
+    tcp_keepalive_options,
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Statuses to answer with before succeeding, shared by all requests.
+    failures = []
+    # Event successful responses wait for, when set by a test.
+    gate = None
+
+    def do_GET(self):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failures:
+            self._fail(self.failures.pop(0))
+            return
+        body = b'{"count": 0, "next": null, "previous": null, "results": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.do_GET()
+
+    def _fail(self, status):
+        body = b'{"detail": "unavailable"}'
+        self.send_response(status)
+        self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = "http://127.0.0.1:{}".format(cls.server.server_address[1])
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _Handler.failures.clear()
+        _Handler.gate = None
+
+
+class PynetboxAdapterTestCase(_ServerTestCase):
+    def _session(self, adapter):
+        session = requests.Session()
+        session.mount("http://", adapter)
+        self.addCleanup(session.close)
+        return session
+
+    def test_connections_are_reused(self):
+        adapter = PynetboxAdapter()
+        session = self._session(adapter)
+        for _ in range(5):
+            session.get(self.url).raise_for_status()
+        self.assertEqual(
+            adapter.stats.as_dict(), {"created": 1, "reused": 4, "discarded": 0}
+        )
+
+    def test_full_pool_discards(self):
+        adapter = PynetboxAdapter(pool_maxsize=1)
+        session = self._session(adapter)
+        first = session.get(self.url, stream=True)
+        second = session.get(self.url, stream=True)
+        first.content, second.content
+        self.assertEqual(adapter.stats.created, 2)
+        self.assertEqual(adapter.stats.discarded, 1)
+
+    def test_tcp_keepalive_socket_options(self):
+        adapter = PynetboxAdapter(tcp_keepalive=True)
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options
+        )
+        self.assertEqual(
+            adapter.poolmanager.connection_pool_kw["socket_options"],
+            adapter.socket_options,
+        )
+        self.assertTrue(set(tcp_keepalive_options()) <= set(adapter.socket_options))
+
+    def test_pickle(self):
+        adapter = PynetboxAdapter(pool_maxsize=3, tcp_keepalive=True)
+        adapter.stats._incr("created")
+        restored = pickle.loads(pickle.dumps(adapter))
+        self.assertEqual(restored.stats.created, 1)
+        self.assertEqual(restored._pool_maxsize, 3)
+        self.assertEqual(restored.socket_options, adapter.socket_options)
+
+    def test_reset(self):
+        stats = PoolStats()
+        stats._incr("reused")
+        stats.reset()
+        self.assertEqual(stats.as_dict(), {"created": 0, "reused": 0, "discarded": 0})
+
+
+class ApiPoolTestCase(unittest.TestCase):
+    def test_pool_follows_max_workers(self):
+        nb = pynetbox.api("http://localhost:8000", max_workers=32)
+        adapter = nb.http_session.get_adapter("http://localhost:8000/api/")
+        self.assertIsInstance(adapter, PynetboxAdapter)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertIs(nb.pool_stats, adapter.stats)
+
+    def test_pool_defaults_and_overrides(self):
+        nb = pynetbox.api("http://localhost:8000")
+        self.assertEqual(nb.http_session.get_adapter("https://x/")._pool_maxsize, 10)
+        nb = pynetbox.api("http://localhost:8000", pool_maxsize=4, pool_block=True)
+        adapter = nb.http_session.get_adapter("http://x/")
+        self.assertEqual((adapter._pool_maxsize, adapter._pool_block), (4, True))
+
+    def test_pool_stats_with_custom_session(self):
+        nb = pynetbox.api("http://localhost:8000")
+        nb.http_session = requests.Session()
+        self.assertIsNone(nb.pool_stats)
+
+    def test_custom_session_dropping_options_warns(self):
+        nb = pynetbox.api(
+            "http://localhost:8000",
+            retries=3,
+            rate_limit=10,
+            http_cache=True,
+            single_flight=True,
+        )
+        with self.assertWarnsRegex(
+            UserWarning, "retries, rate_limit, http_cache, single_flight"
+        ):
+            nb.http_session = requests.Session()
+
+    def test_custom_session_keeping_options(self):
+        nb = pynetbox.api(
+            "http://localhost:8000", retries=3, rate_limit=10, single_flight=True
+        )
+        session = requests.Session()
+        session.mount(
+            "http://",
+            PynetboxAdapter(
+                max_retries=RetryPolicy(total=5),
+                rate_limiter=nb.rate_limiter,
+                single_flight=SingleFlight(),
+            ),
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            nb.http_session = session
+            # Nothing to keep.
+            pynetbox.api("http://localhost:8000").http_session = requests.Session()
+        self.assertIs(nb.http_session, session)
+        with self.assertWarnsRegex(UserWarning, "http_cache"):
+            pynetbox.api(
+                "http://localhost:8000", http_cache=True
+            ).http_session = session
+
+
+class RetryPolicyTestCase(_ServerTestCase):
+    def _session(self, policy):
+        session = requests.Session()
+        session.mount("http://", PynetboxAdapter(max_retries=policy))
+        self.addCleanup(session.close)
+        return session
+
+    def test_retries_until_success(self):
+        _Handler.failures.extend([503, 429, 502])
+        policy = RetryPolicy(total=5, backoff_factor=0)
+        response = self._session(policy).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            policy.stats.as_dict(),
+            {
+                "retries": 3,
+                "by_status": {503: 1, 429: 1, 502: 1},
+                "connect_errors": 0,
+                "read_errors": 0,
+                "exhausted": 0,
+            },
+        )
+
+    def test_exhausted_returns_last_response(self):
+        _Handler.failures.extend([503, 503, 503])
+        policy = RetryPolicy(total=2, backoff_factor=0)
+        response = self._session(policy).get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(policy.stats.retries, 2)
+        self.assertEqual(policy.stats.exhausted, 1)
+
+    def test_post_not_retried(self):
+        _Handler.failures.append(503)
+        policy = RetryPolicy(total=5, backoff_factor=0, retry_writes=True)
+        response = self._session(policy).post(self.url, json={})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(policy.stats.retries, 0)
+
+    def test_connect_errors(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = "http://127.0.0.1:{}".format(sock.getsockname()[1])
+        policy = RetryPolicy(total=2, backoff_factor=0)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self._session(policy).get(url)
+        self.assertEqual(policy.stats.connect_errors, 2)
+        self.assertEqual(policy.stats.exhausted, 1)
+
+    def test_retries_wait_on_rate_limiter(self):
+        # A clock that doesn't advance: every request after the first waits.
+        clock = Mock(**{"monotonic.return_value": 0.0})
+        patcher = patch("pynetbox.core.ratelimit.time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        limiter = RateLimiter(rate=1, burst=1)
+        policy = RetryPolicy(total=5, backoff_factor=0)
+        adapter = PynetboxAdapter(max_retries=policy, rate_limiter=limiter)
+        self.assertIsNone(policy.rate_limiter)
+        self.assertIs(adapter.max_retries.stats, policy.stats)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        self.addCleanup(session.close)
+        _Handler.failures.extend([503, 429])
+        self.assertEqual(session.get(self.url).status_code, 200)
+        self.assertEqual(policy.stats.retries, 2)
+        self.assertEqual(limiter.throttled, 2)
+
+    def test_allowed_methods(self):
+        self.assertNotIn("PUT", RetryPolicy().allowed_methods)
+        self.assertIn("DELETE", RetryPolicy(retry_writes=True).allowed_methods)
+
+    def test_jitter_bounds_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=0.5)
+        failure = RequestHistory("GET", "/", None, 503, None)
+        policy = policy.new(history=(failure,) * 3)
+        self.assertEqual(policy.jitter, 0.5)
+        for _ in range(20):
+            self.assertTrue(2 <= policy.get_backoff_time() <= 4)
+        policy.jitter = 0
+        self.assertEqual(policy.get_backoff_time(), 4)
+
+    def test_stats_shared_across_attempts(self):
+        policy = RetryPolicy()
+        self.assertIs(policy.new(total=1).stats, policy.stats)
+
+    def test_pickle(self):
+        stats = RetryStats()
+        stats._record(status=503)
+        self.assertEqual(pickle.loads(pickle.dumps(stats)).by_status, {503: 1})
+
+
+class ApiRetryTestCase(_ServerTestCase):
+    def test_failed_page_is_retried(self):
+        nb = pynetbox.api(self.url, retries=RetryPolicy(total=3, backoff_factor=0))
+        _Handler.failures.extend([503, 504])
+        self.assertEqual(list(nb.dcim.devices.all()), [])
+        self.assertEqual(nb.retry_stats.by_status, {503: 1, 504: 1})
+
+    def test_exhausted_raises_request_error(self):
+        nb = pynetbox.api(self.url, retries=1)
+        nb.http_session.get_adapter(self.url).max_retries.backoff_factor = 0
+        _Handler.failures.extend([503, 503])
+        with self.assertRaises(RequestError):
+            list(nb.dcim.devices.all())
+        self.assertEqual(nb.retry_stats.exhausted, 1)
+
+    def test_retries_disabled_by_default(self):
+        nb = pynetbox.api("http://localhost:8000")
+        self.assertIsNone(nb.retry_stats)
+        nb = pynetbox.api("http://localhost:8000", retries=4)
+        self.assertIsInstance(nb.retry_stats, RetryStats)
+        self.assertEqual(nb.http_session.get_adapter("http://x/").max_retries.total, 4)
+        with self.assertRaises(ValueError):
+            pynetbox.api("http://localhost:8000", retries=-1)
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def _run(self, flight, send, key="key", callers=5):
+        results = []
+
+        def call():
+            try:
+                results.append(flight.do(key, send))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_calls_share_one_request(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        sent = []
+
+        def send():
+            sent.append(1)
+            release.wait()
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"id": 1}'
+            return response
+
+        threads, results = self._run(flight, send)
+        self._wait_for(lambda: flight.hits == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sent), 1)
+        self.assertEqual((flight.hits, flight.misses), (4, 1))
+        self.assertEqual(len({id(r) for r in results}), 5)
+        self.assertEqual([r.json() for r in results], [{"id": 1}] * 5)
+        # Nothing stays in flight; the next call is sent again.
+        flight.do("key", send)
+        self.assertEqual(len(sent), 2)
+
+    def test_error_raised_in_every_caller(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def send():
+            release.wait()
+            raise requests.exceptions.ConnectionError("down")
+
+        threads, results = self._run(flight, send, callers=3)
+        self._wait_for(lambda: flight.hits == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, requests.exceptions.ConnectionError)
+
+    def test_adapter_only_coalesces_gets(self):
+        adapter = PynetboxAdapter(single_flight=SingleFlight())
+        session = requests.Session()
+        session.mount("http://", adapter)
+
+        def send(self, request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        with patch.object(requests.adapters.HTTPAdapter, "send", send):
+            session.get("http://localhost:8000/api/")
+            session.post("http://localhost:8000/api/")
+            session.get("http://localhost:8000/api/", stream=True)
+        self.assertEqual(adapter.single_flight.misses, 1)
+
+    def test_api_single_flight(self):
+        self.assertIsNone(pynetbox.api("http://localhost:8000").single_flight)
+        nb = pynetbox.api("http://localhost:8000", single_flight=True)
+        adapter = nb.http_session.get_adapter("http://x/")
+        self.assertIs(nb.single_flight, adapter.single_flight)
+        self.assertIsInstance(nb.single_flight, SingleFlight)
+
+
+class SingleFlightServerTestCase(_ServerTestCase):
+    def test_coalesced_responses_have_body(self):
+        # Calls the adapter directly: Session.send reads the body only
+        # after the adapter returns, too late for the waiting callers.
+        adapter = PynetboxAdapter(single_flight=SingleFlight())
+        self.addCleanup(adapter.close)
+        request = requests.Request("GET", self.url).prepare()
+        _Handler.gate = threading.Event()
+        results = []
+
+        def call():
+            results.append(adapter.send(request, timeout=5))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while adapter.single_flight.hits < 4:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        _Handler.gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(adapter.single_flight.misses, 1)
+        self.assertEqual([r.json()["count"] for r in results], [0] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()